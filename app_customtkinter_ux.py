@@ -12,14 +12,14 @@ import sqlite3
 import os
 import threading
 import queue
-import time
-import csv
 import shutil
+from collections import deque
 from datetime import datetime
-from deep_translator import GoogleTranslator
 import json
 from pathlib import Path
 from tkinter import filedialog, messagebox
+from motor import ExecucaoTraducao, CAMINHO_MEMORIA_PADRAO, ler_csv_em_lotes, EscritorSQLite, exportar_csv_para_xlsx, formatar_progresso
+from motor import citar_identificador
 
 class TradutorCustomTkinterUX:
     def __init__(self):
@@ -54,16 +54,38 @@ class TradutorCustomTkinterUX:
         self.colunas_traduzidas = []
         self.traducao_ativa = False
         self.thread_traducao = None
+        self.thread_exportacao = None
         self.progress_queue = queue.Queue()
+        self.monitorando = False  # Há um ciclo de monitorar_progresso agendado
+        self.log_queue = queue.Queue()  # Mensagens de log de qualquer thread, descarregadas no widget pela thread da interface
+        self.linhas_log = 0  # Linhas atualmente no textbox_log
         self.arquivo_saida = None  # Caminho do arquivo de saída traduzido
+        self.execucao = None  # Execução atual do motor de tradução (motor.ExecucaoTraducao)
+        self.saida_sqlite = None  # Saída direta no banco SQLite de origem ('coluna' ou 'tabela'); None = CSV
         
         # Configurações
         self.config = {
             'idioma_origem': 'en',
             'idioma_destino': 'pt',
-            'tamanho_lote': 15,  # Lotes menores para economizar RAM
-            'delay_traducao': 0.3  # Delay menor para melhor responsividade
+            'tamanho_lote': 200,  # Linhas por lote: lotes maiores enchem melhor cada chamada à API
+            'delay_traducao': 0.3,  # Delay menor para melhor responsividade
+            'traducoes_simultaneas': 4,  # Chamadas à API em paralelo (execução limitada por latência)
+            'backend': 'google',  # Backend de tradução ('google' ou 'stub' para testes sem rede)
+            'opcoes_backend': {},  # Parâmetros extras do backend (ex.: latencia/taxa_falha do stub)
+            'arquivo_memoria': CAMINHO_MEMORIA_PADRAO,  # Banco da memória de tradução persistente
+            'fsync_linhas': 5000,  # Forçar gravação em disco a cada N linhas (None = só no final)
+            'fsync_segundos': 5.0,  # Forçar gravação em disco a cada T segundos (None = só no final)
+            'modo_saida_sqlite': 'coluna',  # Saída direta em SQLite: 'coluna' (<col>_traduzido na tabela) ou 'tabela' (<tabela>_traduzida)
+            'arquivo_metricas_json': None,  # Métricas por etapa exportadas periodicamente em JSON (None = desativado)
+            'arquivo_metricas_prometheus': None,  # Idem, no formato do textfile collector do Prometheus (.prom)
+            'intervalo_metricas': 15.0,  # Segundos entre exportações das métricas
+            'perfil': False,  # Perfil de desempenho da tradução (<saída>.perfil.pstats/.folded/.txt)
+            'filtrar_intraduziveis': True,  # Não enviar à API números, datas, códigos, URLs e e-mails
+            'detectar_idioma': False,  # Também manter textos já no idioma de destino (requer langdetect)
+            'max_linhas_log': 1000,  # Linhas mantidas no log de atividades (as mais antigas são descartadas)
+            'arquivo_log': None  # Arquivo que recebe o log completo (None = apenas na tela)
         }
+        self.carregar_configuracoes()
         
         # Cores e estilos para efeitos visuais - Tema Dark Elegante com Cores Vibrantes
         self.cores = {
@@ -92,8 +114,8 @@ class TradutorCustomTkinterUX:
         # Configurar estado inicial da tabela SQLite
         self.atualizar_visibilidade_tabela_sqlite()
         
-        # Iniciar monitoramento de progresso
-        self.monitorar_progresso()
+        # Iniciar descarga periódica do log
+        self.descarregar_log()
     
     def centralizar_janela(self):
         """Centraliza a janela na tela"""
@@ -282,7 +304,7 @@ class TradutorCustomTkinterUX:
             button_hover_color=self.cores['primary_hover'],
             text_color=self.cores['text_primary']
         )
-        self.combo_idioma_origem.set(idiomas['en'])
+        self.combo_idioma_origem.set(idiomas.get(self.config['idioma_origem'], idiomas['en']))
         self.combo_idioma_origem.pack(fill="x")
         self.combo_idioma_origem.bind("<<ComboboxSelected>>", self.atualizar_idioma_origem)
         
@@ -308,7 +330,7 @@ class TradutorCustomTkinterUX:
             button_hover_color=self.cores['primary_hover'],
             text_color=self.cores['text_primary']
         )
-        self.combo_idioma_destino.set(idiomas['pt'])
+        self.combo_idioma_destino.set(idiomas.get(self.config['idioma_destino'], idiomas['pt']))
         self.combo_idioma_destino.pack(fill="x")
         self.combo_idioma_destino.bind("<<ComboboxSelected>>", self.atualizar_idioma_destino)
     
@@ -347,7 +369,7 @@ class TradutorCustomTkinterUX:
         
         self.label_lote = ctk.CTkLabel(
             lote_header,
-            text="15",
+            text=str(self.config['tamanho_lote']),
             font=ctk.CTkFont(size=10, weight="bold"),  # Reduzir de 13 para 10
             text_color=self.cores['primary']
         )
@@ -356,9 +378,9 @@ class TradutorCustomTkinterUX:
         # Slider com melhor aparência - mais compacto
         self.slider_lote = ctk.CTkSlider(
             lote_frame,
-            from_=5,
-            to=50,
-            number_of_steps=45,
+            from_=10,
+            to=1000,
+            number_of_steps=99,
             height=14,  # Reduzir de 18 para 14
             corner_radius=6,  # Reduzir de 8 para 6
             fg_color=self.cores['glass'],
@@ -366,7 +388,7 @@ class TradutorCustomTkinterUX:
             button_color=self.cores['primary'],
             button_hover_color=self.cores['primary_hover']
         )
-        self.slider_lote.set(15)
+        self.slider_lote.set(self.config['tamanho_lote'])
         self.slider_lote.pack(fill="x", pady=(6, 0))  # Reduzir espaçamento
         self.slider_lote.configure(command=self.atualizar_label_lote)
         
@@ -386,7 +408,7 @@ class TradutorCustomTkinterUX:
         
         self.label_delay = ctk.CTkLabel(
             delay_header,
-            text="0.3s",
+            text=f"{self.config['delay_traducao']:.1f}s",
             font=ctk.CTkFont(size=10, weight="bold"),  # Reduzir de 13 para 10
             text_color=self.cores['primary']
         )
@@ -405,9 +427,64 @@ class TradutorCustomTkinterUX:
             button_color=self.cores['primary'],
             button_hover_color=self.cores['primary_hover']
         )
-        self.slider_delay.set(300)
+        self.slider_delay.set(self.config['delay_traducao'] * 1000)
         self.slider_delay.pack(fill="x", pady=(6, 0))  # Reduzir espaçamento
         self.slider_delay.configure(command=self.atualizar_label_delay)
+        
+        # Chamadas simultâneas - mais compacto
+        simultaneas_frame = ctk.CTkFrame(config_container, fg_color="transparent")
+        simultaneas_frame.pack(fill="x", pady=(10, 0))
+        
+        # Label e valor em linha - mais compacto
+        simultaneas_header = ctk.CTkFrame(simultaneas_frame, fg_color="transparent")
+        simultaneas_header.pack(fill="x")
+        
+        ctk.CTkLabel(
+            simultaneas_header,
+            text="Chamadas Simultâneas:",
+            font=ctk.CTkFont(size=10),
+            text_color=self.cores['text_primary']
+        ).pack(side="left")
+        
+        self.label_simultaneas = ctk.CTkLabel(
+            simultaneas_header,
+            text=str(self.config['traducoes_simultaneas']),
+            font=ctk.CTkFont(size=10, weight="bold"),
+            text_color=self.cores['primary']
+        )
+        self.label_simultaneas.pack(side="right")
+        
+        # Slider com melhor aparência - mais compacto
+        self.slider_simultaneas = ctk.CTkSlider(
+            simultaneas_frame,
+            from_=1,
+            to=16,
+            number_of_steps=15,
+            height=14,
+            corner_radius=6,
+            fg_color=self.cores['glass'],
+            progress_color=self.cores['primary'],
+            button_color=self.cores['primary'],
+            button_hover_color=self.cores['primary_hover']
+        )
+        self.slider_simultaneas.set(self.config['traducoes_simultaneas'])
+        self.slider_simultaneas.pack(fill="x", pady=(6, 0))
+        self.slider_simultaneas.configure(command=self.atualizar_label_simultaneas)
+        
+        # Perfil de desempenho (cProfile, pilhas para flamegraph e latência por lote)
+        self.switch_perfil = ctk.CTkSwitch(
+            config_container,
+            text="Perfil de desempenho",
+            font=ctk.CTkFont(size=10),
+            text_color=self.cores['text_primary'],
+            progress_color=self.cores['primary'],
+            switch_height=14,
+            switch_width=28,
+            command=self.atualizar_perfil
+        )
+        if self.config['perfil']:
+            self.switch_perfil.select()
+        self.switch_perfil.pack(anchor="w", pady=(12, 0))
     
     def criar_botoes_acao(self, parent):
         """Cria os botões de ação com layout organizado - versão compacta"""
@@ -748,7 +825,21 @@ class TradutorCustomTkinterUX:
             text_color=self.cores['text_primary'],
             command=lambda: self.exportar_resultado('Excel')
         )
-        btn_excel.pack(fill="x", pady=(0, 0))
+        btn_excel.pack(fill="x", pady=(0, 4))
+        
+        # Botão exportar SQLite - design mais sutil
+        btn_sqlite = ctk.CTkButton(
+            log_frame,
+            text="Exportar SQLite",
+            font=ctk.CTkFont(size=9),
+            height=26,
+            corner_radius=5,
+            fg_color=self.cores['primary'],
+            hover_color=self.cores['primary_hover'],
+            text_color=self.cores['text_primary'],
+            command=lambda: self.exportar_resultado('SQLite')
+        )
+        btn_sqlite.pack(fill="x", pady=(0, 0))
     
     def criar_barra_status(self):
         """Cria a barra de status inferior organizada e responsiva - versão compacta com progresso"""
@@ -866,6 +957,18 @@ class TradutorCustomTkinterUX:
         delay_s = delay_ms / 1000.0
         self.label_delay.configure(text=f"{delay_s:.1f}s")
     
+    def atualizar_label_simultaneas(self, value):
+        """Atualiza o label do slider de chamadas simultâneas"""
+        self.label_simultaneas.configure(text=str(int(value)))
+    
+    def atualizar_perfil(self):
+        """Ativa ou desativa o perfil de desempenho das próximas traduções"""
+        self.config['perfil'] = bool(self.switch_perfil.get())
+        if self.config['perfil']:
+            self.log_atividade("Perfil de desempenho ativado: arquivos <saída>.perfil.pstats/.folded/.txt ao fim da tradução")
+        else:
+            self.log_atividade("Perfil de desempenho desativado")
+    
     def atualizar_idioma_origem(self, event=None):
         """Atualiza o idioma de origem"""
         idiomas = {
@@ -1032,7 +1135,7 @@ class TradutorCustomTkinterUX:
                 conn = sqlite3.connect(filename)
                 try:
                     # Ler apenas as primeiras linhas para preview
-                    self.df_preview = pd.read_sql_query(f"SELECT * FROM {tabela} LIMIT 18", conn)
+                    self.df_preview = pd.read_sql_query(f"SELECT * FROM {citar_identificador(tabela)} LIMIT 18", conn)
                     self.df_full_path = filename
                     self.df_tipo = "SQLite"
                     self.df_tabela = tabela
@@ -1270,24 +1373,51 @@ class TradutorCustomTkinterUX:
         
         if not resposta:
             return
-            
-        # Selecionar pasta para salvar o arquivo traduzido
-        pasta_destino = self.selecionar_pasta_destino()
-        if not pasta_destino:
-            return
-            
-        # Definir caminho do arquivo de saída
-        nome_arquivo_original = os.path.splitext(os.path.basename(self.df_full_path))[0]
-        self.arquivo_saida = os.path.join(pasta_destino, f"{nome_arquivo_original}_traduzido.csv")
         
-        # Log da seleção
-        self.log_atividade(f"Arquivo de saída selecionado: {self.arquivo_saida}")
+        # Para SQLite, oferecer gravar as traduções direto no banco, sem CSV intermediário
+        self.saida_sqlite = None
+        if self.df_tipo == "SQLite":
+            if self.config['modo_saida_sqlite'] == 'tabela':
+                destino = f"a tabela {self.df_tabela}_traduzida"
+            else:
+                destino = f"colunas <coluna>_traduzido na tabela {self.df_tabela}"
+            mensagem_sqlite = f"Gravar as traduções direto no banco?\n\nSim: {destino}\nNão: arquivo CSV"
+            if self.mostrar_confirmacao_personalizada("Saída SQLite", mensagem_sqlite):
+                self.saida_sqlite = self.config['modo_saida_sqlite']
+        
+        if self.saida_sqlite:
+            self.arquivo_saida = None
+        else:
+            # Selecionar pasta para salvar o arquivo traduzido
+            pasta_destino = self.selecionar_pasta_destino()
+            if not pasta_destino:
+                return
+                
+            # Definir caminho do arquivo de saída
+            nome_arquivo_original = os.path.splitext(os.path.basename(self.df_full_path))[0]
+            self.arquivo_saida = os.path.join(pasta_destino, f"{nome_arquivo_original}_traduzido.csv")
+            
+            # Log da seleção
+            self.log_atividade(f"Arquivo de saída selecionado: {self.arquivo_saida}")
+        
+        self.execucao = self._criar_execucao(colunas_selecionadas)
+        if self.saida_sqlite:
+            self.log_atividade(f"Saída direta no banco: {self.df_full_path} ({self.execucao.tabela_saida_sqlite()})")
+        
+        # Oferecer retomada se uma execução anterior da mesma origem foi interrompida
+        retomada = self.execucao.procurar_retomada()
+        if retomada:
+            mensagem_retomada = f"Tradução interrompida encontrada:\n{retomada['linhas_processadas']:,} linhas já salvas.\n\nRetomar de onde parou?"
+            if self.mostrar_confirmacao_personalizada("Retomar Tradução", mensagem_retomada):
+                self.log_atividade(f"Retomando tradução após {retomada['linhas_processadas']:,} linhas")
+            else:
+                retomada = None
             
         # Iniciar tradução em thread separada
         self.traducao_ativa = True
         self.thread_traducao = threading.Thread(
             target=self._executar_traducao,
-            args=(colunas_selecionadas,)
+            args=(retomada,)
         )
         self.thread_traducao.daemon = True
         self.thread_traducao.start()
@@ -1298,282 +1428,37 @@ class TradutorCustomTkinterUX:
         self.label_status_bar.configure(text="🔄 Traduzindo...")
         self.log_atividade("Tradução iniciada")
         
-        # Iniciar monitoramento de progresso
-        self.monitorar_progresso()
+        # Acompanhar a fila de progresso enquanto a tradução estiver em andamento
+        self.iniciar_monitoramento()
+    
+    def _criar_execucao(self, colunas_selecionadas):
+        """Cria a execução do motor de tradução com o estado atual da interface"""
+        return ExecucaoTraducao(
+            self.df_full_path, self.df_tipo, colunas_selecionadas,
+            config=self.config,
+            tabela=self.df_tabela if self.df_tipo == "SQLite" else None,
+            arquivo_saida=self.arquivo_saida,
+            saida_sqlite=self.saida_sqlite,
+            colunas_originais=self.colunas_originais,
+            ao_log=self.log_atividade,
+            ao_progresso=lambda instantaneo: self.progress_queue.put(("progresso", instantaneo))
+        )
     
-    def _executar_traducao(self, colunas_selecionadas):
-        """Executa a tradução em lotes para economizar memória"""
+    def _executar_traducao(self, retomada=None):
+        """Executa a tradução em lotes (thread separada) e informa o resultado pela fila"""
         try:
-            # Configurar tradutor
-            idioma_origem = self.config['idioma_origem']
-            idioma_destino = self.config['idioma_destino']
-            tamanho_lote = min(self.config['tamanho_lote'], 20)  # Máximo 20 linhas por lote para economizar RAM
-            delay = self.config['delay_traducao']
-            
-            tradutor = GoogleTranslator(source=idioma_origem, target=idioma_destino)
-            
-            # Verificar se deve parar antes de começar
-            if not self.traducao_ativa:
-                return
-            
-            # Carregar arquivo completo em lotes
-            if self.df_tipo == "CSV":
-                # Para CSV, usar pandas em lotes
-                self._traduzir_csv_lotes(colunas_selecionadas, tradutor, tamanho_lote, delay)
-            elif self.df_tipo == "Excel":
-                # Para Excel, usar pandas em lotes
-                self._traduzir_excel_lotes(colunas_selecionadas, tradutor, tamanho_lote, delay)
-            elif self.df_tipo == "SQLite":
-                # Para SQLite, usar queries em lotes
-                self._traduzir_sqlite_lotes(colunas_selecionadas, tradutor, tamanho_lote, delay)
-                
+            self.execucao.executar(retomada)
         except Exception as e:
             self.progress_queue.put(("erro", f"Erro na tradução: {str(e)}"))
-        finally:
+        else:
             # Só marcar como concluída se não foi parada pelo usuário
             if self.traducao_ativa:
                 self.progress_queue.put(("concluido", "Tradução concluída"))
             else:
                 self.progress_queue.put(("parada", "Tradução interrompida pelo usuário"))
-            
+        finally:
             self.traducao_ativa = False
     
-    def _traduzir_csv_lotes(self, colunas_selecionadas, tradutor, tamanho_lote, delay):
-        """Traduz CSV em lotes para economizar memória e salva incrementalmente"""
-        try:
-            # Verificar se deve parar antes de começar
-            if not self.traducao_ativa:
-                self.log_atividade("Tradução interrompida pelo usuário")
-                return
-                
-            # Contar total de linhas
-            total_linhas = sum(1 for _ in open(self.df_full_path, 'r', encoding='utf-8')) - 1  # -1 para header
-            
-            # Processar em lotes
-            for i in range(0, total_linhas, tamanho_lote):
-                # Verificar se deve parar a cada lote
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return  # Retornar imediatamente, não apenas break
-                    
-                # Ler lote
-                df_lote = pd.read_csv(self.df_full_path, skiprows=i+1, nrows=tamanho_lote, header=None)
-                df_lote.columns = self.colunas_originais
-                
-                # Verificar se deve parar ANTES de traduzir
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return
-                
-                # Traduzir colunas selecionadas
-                for col in colunas_selecionadas:
-                    if col in df_lote.columns:
-                        df_lote[f"{col}_traduzido"] = df_lote[col].apply(
-                            lambda x: tradutor.translate(str(x)) if pd.notna(x) else x
-                        )
-                
-                # Verificar se deve parar ANTES de salvar
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return
-                
-                # Salvar lote traduzido incrementalmente
-                self._salvar_lote_csv(df_lote, i == 0)  # i == 0 significa primeiro lote
-                
-                # Atualizar progresso
-                progresso = min(100, (i + tamanho_lote) / total_linhas * 100)
-                self.progress_queue.put(("progresso", progresso))
-                
-                # Log de progresso
-                self.log_atividade(f"Lote processado e salvo: {i+1}-{min(i+tamanho_lote, total_linhas)} de {total_linhas} linhas")
-                
-                # Delay para não sobrecarregar API
-                time.sleep(delay)
-                
-                # Liberar memória do lote
-                del df_lote
-                
-        except Exception as e:
-            self.progress_queue.put(("erro", f"Erro ao traduzir CSV: {str(e)}"))
-    
-    def _criar_arquivo_saida_csv(self, colunas_selecionadas):
-        """Cria o arquivo de saída CSV com cabeçalho"""
-        try:
-            # Ler primeira linha para obter cabeçalho original
-            df_header = pd.read_csv(self.df_full_path, nrows=0)
-            colunas_originais = df_header.columns.tolist()
-            
-            # Criar lista de colunas para o arquivo de saída
-            colunas_saida = []
-            for col in colunas_originais:
-                colunas_saida.append(col)  # Coluna original
-                if col in colunas_selecionadas:
-                    colunas_saida.append(f"{col}_traduzido")  # Coluna traduzida
-            
-            # Criar arquivo com cabeçalho
-            with open(self.arquivo_saida, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(colunas_saida)
-            
-            self.log_atividade(f"Arquivo de saída criado: {self.arquivo_saida}")
-            
-        except Exception as e:
-            self.log_atividade(f"Erro ao criar arquivo de saída: {str(e)}")
-            raise
-    
-    def _salvar_lote_csv(self, df_lote, primeiro_lote=False):
-        """Salva um lote de dados traduzidos no arquivo CSV"""
-        try:
-            # Preparar dados para salvar
-            dados_para_salvar = []
-            for _, row in df_lote.iterrows():
-                linha = []
-                for col in self.colunas_originais:
-                    linha.append(row[col])  # Valor original
-                    if col in [col for col in self.colunas_originais if f"{col}_traduzido" in df_lote.columns]:
-                        linha.append(row[f"{col}_traduzido"])  # Valor traduzido
-                dados_para_salvar.append(linha)
-            
-            # Salvar no arquivo (append se não for primeiro lote)
-            mode = 'a' if not primeiro_lote else 'w'
-            with open(self.arquivo_saida, mode, newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if primeiro_lote:
-                    # Escrever cabeçalho no primeiro lote
-                    colunas_saida = []
-                    for col in self.colunas_originais:
-                        colunas_saida.append(col)
-                        if col in [col for col in self.colunas_originais if f"{col}_traduzido" in df_lote.columns]:
-                            colunas_saida.append(f"{col}_traduzido")
-                    writer.writerow(colunas_saida)
-                    
-                    self.log_atividade(f"Arquivo de saída criado: {self.arquivo_saida}")
-                
-                # Escrever dados
-                writer.writerows(dados_para_salvar)
-            
-        except Exception as e:
-            self.log_atividade(f"Erro ao salvar lote: {str(e)}")
-            raise
-    
-    def _traduzir_excel_lotes(self, colunas_selecionadas, tradutor, tamanho_lote, delay):
-        """Traduz Excel em lotes para economizar memória"""
-        try:
-            # Verificar se deve parar antes de começar
-            if not self.traducao_ativa:
-                self.log_atividade("Tradução interrompida pelo usuário")
-                return
-                
-            # Para Excel, usar openpyxl para leitura em lotes
-            from openpyxl import load_workbook
-            
-            wb = load_workbook(self.df_full_path, read_only=True)
-            ws = wb.active
-            
-            # Contar linhas
-            total_linhas = ws.max_row - 1  # -1 para header
-            
-            # Processar em lotes
-            for i in range(0, total_linhas, tamanho_lote):
-                # Verificar se deve parar a cada lote
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return  # Retornar imediatamente
-                    
-                # Ler lote
-                dados_lote = []
-                for row_idx in range(i + 2, min(i + 2 + tamanho_lote, total_linhas + 2)):  # +2 para pular header
-                    row_data = [ws.cell(row=row_idx, column=col_idx).value for col_idx in range(1, len(self.colunas_originais) + 1)]
-                    dados_lote.append(row_data)
-                
-                df_lote = pd.DataFrame(dados_lote, columns=self.colunas_originais)
-                
-                # Verificar se deve parar ANTES de traduzir
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return
-                
-                # Traduzir colunas selecionadas
-                for col in colunas_selecionadas:
-                    if col in df_lote.columns:
-                        df_lote[f"{col}_traduzido"] = df_lote[col].apply(
-                            lambda x: tradutor.translate(str(x)) if pd.notna(x) else x
-                        )
-                
-                # Atualizar progresso
-                progresso = min(100, (i + tamanho_lote) / total_linhas * 100)
-                self.progress_queue.put(("progresso", progresso))
-                
-                # Log de progresso
-                self.log_atividade(f"Lote processado: {i+1}-{min(i+tamanho_lote, total_linhas)} de {total_linhas} linhas")
-                
-                # Delay para não sobrecarregar API
-                time.sleep(delay)
-                
-                # Liberar memória do lote
-                del df_lote, dados_lote
-            
-            wb.close()
-            
-        except Exception as e:
-            self.progress_queue.put(("erro", f"Erro ao traduzir Excel: {str(e)}"))
-    
-    def _traduzir_sqlite_lotes(self, colunas_selecionadas, tradutor, tamanho_lote, delay):
-        """Traduz SQLite em lotes para economizar memória"""
-        try:
-            # Verificar se deve parar antes de começar
-            if not self.traducao_ativa:
-                self.log_atividade("Tradução interrompida pelo usuário")
-                return
-                
-            conn = sqlite3.connect(self.df_full_path)
-            
-            # Contar total de linhas
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {self.df_tabela}")
-            total_linhas = cursor.fetchone()[0]
-            
-            # Processar em lotes
-            for i in range(0, total_linhas, tamanho_lote):
-                # Verificar se deve parar a cada lote
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return  # Retornar imediatamente
-                    
-                # Ler lote
-                query = f"SELECT * FROM {self.df_tabela} LIMIT {tamanho_lote} OFFSET {i}"
-                df_lote = pd.read_sql_query(query, conn)
-                
-                # Verificar se deve parar ANTES de traduzir
-                if not self.traducao_ativa:
-                    self.log_atividade("Tradução interrompida pelo usuário")
-                    return
-                
-                # Traduzir colunas selecionadas
-                for col in colunas_selecionadas:
-                    if col in df_lote.columns:
-                        df_lote[f"{col}_traduzido"] = df_lote[col].apply(
-                            lambda x: tradutor.translate(str(x)) if pd.notna(x) else x
-                        )
-                
-                # Atualizar progresso
-                progresso = min(100, (i + tamanho_lote) / total_linhas * 100)
-                self.progress_queue.put(("progresso", progresso))
-                
-                # Log de progresso
-                self.log_atividade(f"Lote processado: {i+1}-{min(i+tamanho_lote, total_linhas)} de {tamanho_lote} linhas")
-                
-                # Delay para não sobrecarregar API
-                time.sleep(delay)
-                
-                # Liberar memória do lote
-                del df_lote
-            
-            conn.close()
-            
-        except Exception as e:
-            self.progress_queue.put(("erro", f"Erro ao traduzir SQLite: {str(e)}"))
-    
     def parar_traducao(self):
         """Para a tradução em andamento"""
         if not self.traducao_ativa:
@@ -1585,6 +1470,8 @@ class TradutorCustomTkinterUX:
         if resposta:
             # Sinalizar para parar a thread
             self.traducao_ativa = False
+            if self.execucao is not None:
+                self.execucao.parar()
             
             # Enviar mensagem de parada para a fila de progresso
             self.progress_queue.put(("parada", "Tradução interrompida pelo usuário"))
@@ -1605,12 +1492,19 @@ class TradutorCustomTkinterUX:
     def exportar_resultado(self, formato):
         """Exporta o resultado da tradução"""
         if not hasattr(self, 'arquivo_saida') or not self.arquivo_saida:
+            if self.saida_sqlite:
+                self.mostrar_dialogo_personalizado("Info", f"As traduções foram gravadas direto no banco:\n{os.path.basename(self.df_full_path)} ({self.execucao.tabela_saida_sqlite()})", "info")
+                return
             self.mostrar_dialogo_personalizado("Aviso", "Nenhum arquivo traduzido disponível para exportar.\n\nExecute uma tradução primeiro.", "warning")
             return
             
         if not os.path.exists(self.arquivo_saida):
             self.mostrar_dialogo_personalizado("Aviso", "Arquivo traduzido não encontrado.\n\nExecute uma tradução primeiro.", "warning")
             return
+        
+        if self.traducao_ativa:
+            self.mostrar_dialogo_personalizado("Aviso", "Aguarde o fim da tradução antes de exportar o resultado.", "warning")
+            return
             
         # Solicitar local de salvamento
         filename = filedialog.asksaveasfilename(
@@ -1634,10 +1528,26 @@ class TradutorCustomTkinterUX:
                 mensagem = f"Arquivo CSV traduzido copiado para:\n{filename}"
                 
             elif formato == "Excel":
-                # Converter CSV para Excel
-                df_traduzido = pd.read_csv(self.arquivo_saida)
-                df_traduzido.to_excel(filename, index=False)
-                mensagem = f"Arquivo convertido para Excel:\n{filename}"
+                # Converter em fluxo numa thread separada; o resultado chega pela fila de progresso
+                self.log_atividade(f"Exportando para Excel: {filename}")
+                self.label_status_bar.configure(text="📤 Exportando para Excel...")
+                self.progress_bar.set(0)
+                self.label_progress.configure(text="0%")
+                self.thread_exportacao = threading.Thread(target=self._exportar_excel, args=(filename,), daemon=True)
+                self.thread_exportacao.start()
+                self.iniciar_monitoramento()
+                return
+                
+            elif formato == "SQLite":
+                # Transferir em lotes numa thread separada; o resultado chega pela fila de progresso
+                self.log_atividade(f"Exportando para SQLite: {filename}")
+                self.label_status_bar.configure(text="📤 Exportando para SQLite...")
+                self.progress_bar.set(0)
+                self.label_progress.configure(text="0%")
+                self.thread_exportacao = threading.Thread(target=self._exportar_sqlite, args=(filename,), daemon=True)
+                self.thread_exportacao.start()
+                self.iniciar_monitoramento()
+                return
                 
             else:
                 mensagem = f"Formato {formato} não suportado ainda"
@@ -1649,6 +1559,60 @@ class TradutorCustomTkinterUX:
             self.mostrar_dialogo_personalizado("Erro", f"Erro ao exportar: {str(e)}", "error")
             self.log_atividade(f"ERRO na exportação: {str(e)}")
     
+    def _exportar_excel(self, filename):
+        """Converte o CSV traduzido em .xlsx (executado fora da thread da interface)"""
+        try:
+            linhas, planilhas = exportar_csv_para_xlsx(
+                self.arquivo_saida, filename,
+                ao_progresso=lambda percentual: self.progress_queue.put(("progresso", {'percentual': percentual}))
+            )
+            mensagem = f"Arquivo convertido para Excel:\n{filename}\n\n{linhas} linhas"
+            if planilhas > 1:
+                mensagem += f" em {planilhas} planilhas (limite de linhas do Excel)"
+            self.progress_queue.put(("exportado", (mensagem, f"Excel -> {filename}")))
+        except Exception as e:
+            self.progress_queue.put(("erro_exportacao", str(e)))
+    
+    def _exportar_sqlite(self, filename):
+        """Transfere o CSV traduzido em lotes para uma tabela nova (executado fora da thread da interface)"""
+        escritor = None
+        try:
+            tabela = os.path.splitext(os.path.basename(self.arquivo_saida))[0]
+            if os.path.exists(filename):
+                os.remove(filename)  # O diálogo já confirmou a substituição
+            linhas = 0
+            for df_lote, posicao, bytes_total in ler_csv_em_lotes(self.arquivo_saida, 10000):
+                if escritor is None:
+                    escritor = EscritorSQLite(filename, tabela, list(df_lote.columns), fsync_linhas=50000, fsync_segundos=None)
+                escritor.escrever(list(df_lote.itertuples(index=False, name=None)))
+                linhas += len(df_lote)
+                if bytes_total:
+                    self.progress_queue.put(("progresso", {'percentual': posicao / bytes_total * 100}))
+            if escritor is not None:
+                escritor.fechar()
+                escritor = None
+            mensagem = f"Arquivo convertido para SQLite (tabela {tabela}):\n{filename}\n\n{linhas} linhas"
+            self.progress_queue.put(("exportado", (mensagem, f"SQLite -> {filename}")))
+        except Exception as e:
+            if escritor is not None:
+                try:
+                    escritor.fechar()
+                except Exception:
+                    pass
+            self.progress_queue.put(("erro_exportacao", str(e)))
+    
+    def carregar_configuracoes(self):
+        """Carrega as configurações salvas em settings.json, se existirem"""
+        config_file = Path("settings.json")
+        if not config_file.exists():
+            return
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                salvas = json.load(f)
+            self.config.update({chave: valor for chave, valor in salvas.items() if chave in self.config})
+        except (OSError, ValueError):
+            pass  # Manter configurações padrão se o arquivo estiver ilegível
+    
     def salvar_configuracoes(self):
         """Salva as configurações atuais"""
         try:
@@ -1656,6 +1620,7 @@ class TradutorCustomTkinterUX:
             self.config['tamanho_lote'] = int(self.slider_lote.get())
             # Converter delay de milissegundos para segundos
             self.config['delay_traducao'] = float(self.slider_delay.get()) / 1000.0
+            self.config['traducoes_simultaneas'] = int(self.slider_simultaneas.get())
             
             # Salvar em arquivo
             config_file = Path("settings.json")
@@ -1672,29 +1637,94 @@ class TradutorCustomTkinterUX:
     def limpar_log(self):
         """Limpa o log de atividades"""
         self.textbox_log.delete("0.0", "end")
+        self.linhas_log = 0
         self.log_atividade("Log limpo")
     
     def log_atividade(self, mensagem):
-        """Adiciona mensagem ao log de atividades"""
+        """Enfileira uma mensagem para o log de atividades (seguro para chamar de qualquer thread)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {mensagem}\n"
-        
-        self.textbox_log.insert("end", log_entry)
-        self.textbox_log.see("end")
+        self.log_queue.put(f"[{timestamp}] {mensagem}\n")
+    
+    def descarregar_log(self):
+        """Grava no textbox_log, de uma só vez, as mensagens acumuladas na fila (executa na thread da interface)"""
+        max_linhas = max(int(self.config.get('max_linhas_log') or 1000), 1)
+        pendentes = deque(maxlen=max_linhas)  # Só as últimas max_linhas chegariam a ficar visíveis
+        descartadas = []
+        try:
+            while True:
+                entrada = self.log_queue.get_nowait()
+                if len(pendentes) == max_linhas:
+                    descartadas.append(pendentes[0])
+                pendentes.append(entrada)
+        except queue.Empty:
+            pass
+        
+        if pendentes:
+            self._gravar_arquivo_log(descartadas + list(pendentes))
+            try:
+                self.textbox_log.insert("end", "".join(pendentes))
+                self.linhas_log += sum(entrada.count("\n") for entrada in pendentes)
+                # Buffer circular: remover do topo as linhas que excedem o limite
+                excesso = self.linhas_log - max_linhas
+                if excesso > 0:
+                    self.textbox_log.delete("1.0", f"{excesso + 1}.0")
+                    self.linhas_log = max_linhas
+                self.textbox_log.see("end")
+            except Exception:
+                pass  # A janela pode estar sendo destruída; o log não deve derrubar a interface
+        
+        self.root.after(100, self.descarregar_log)
+    
+    def _gravar_arquivo_log(self, entradas):
+        """Acrescenta as entradas ao arquivo_log configurado, se houver"""
+        arquivo_log = self.config.get('arquivo_log')
+        if not arquivo_log:
+            return
+        try:
+            with open(arquivo_log, 'a', encoding='utf-8') as f:
+                f.writelines(entradas)
+        except OSError as e:
+            # Desativar para não repetir a falha a cada descarga
+            self.config['arquivo_log'] = None
+            self.log_queue.put(f"[{datetime.now().strftime('%H:%M:%S')}] AVISO: log em arquivo desativado ({e})\n")
+    
+    def iniciar_monitoramento(self):
+        """Agenda o ciclo de monitorar_progresso, se ainda não estiver em andamento"""
+        if not self.monitorando:
+            self.monitorando = True
+            self.root.after(100, self.monitorar_progresso)
+    
+    def _tarefa_em_andamento(self):
+        """Indica se ainda há uma tradução ou exportação que pode enviar mensagens"""
+        return any(thread is not None and thread.is_alive() for thread in (self.thread_traducao, self.thread_exportacao))
+    
+    def atualizar_progresso(self, instantaneo):
+        """Atualiza barra, percentual e vazão/ETA a partir de um instantâneo de progresso"""
+        percentual = instantaneo.get('percentual')
+        if percentual is not None:
+            self.progress_bar.set(percentual / 100)
+            self.label_progress.configure(text=f"{percentual:.1f}%")
+        if 'linhas' in instantaneo:
+            total = f"/{instantaneo['total']:,}" if instantaneo['total'] else ""
+            self.label_status_traducao.configure(text=f"{instantaneo['linhas']:,}{total} linhas | {formatar_progresso(instantaneo)}")
     
     def monitorar_progresso(self):
-        """Monitora o progresso da tradução através da fila de mensagens"""
+        """Processa a fila de mensagens; só se reagenda enquanto houver tarefa em andamento"""
         try:
-            # Verificar se há mensagens na fila
+            ultimo_progresso = None
             while not self.progress_queue.empty():
                 tipo, mensagem = self.progress_queue.get_nowait()
                 
                 if tipo == "progresso":
-                    # Atualizar barra de progresso
-                    self.progress_bar.set(mensagem / 100)
-                    self.label_progress.configure(text=f"{mensagem:.1f}%")
+                    # Vários instantâneos acumulados viram um único redesenho
+                    ultimo_progresso = mensagem
+                    continue
+                
+                if ultimo_progresso is not None:
+                    self.atualizar_progresso(ultimo_progresso)
+                    ultimo_progresso = None
                     
-                elif tipo == "erro":
+                if tipo == "erro":
                     # Mostrar erro
                     self.mostrar_dialogo_personalizado("Erro na Tradução", mensagem, "error")
                     self.log_atividade(f"ERRO: {mensagem}")
@@ -1715,24 +1745,46 @@ class TradutorCustomTkinterUX:
                     
                 elif tipo == "concluido":
                     # Tradução concluída
-                    mensagem_sucesso = f"Tradução concluída!\n\nArquivo: {os.path.basename(self.arquivo_saida)}"
+                    if self.arquivo_saida:
+                        destino = os.path.basename(self.arquivo_saida)
+                    else:
+                        destino = f"{os.path.basename(self.df_full_path)} ({self.execucao.tabela_saida_sqlite()})"
+                    mensagem_sucesso = f"Tradução concluída!\n\nArquivo: {destino}"
                     self.mostrar_dialogo_personalizado("Sucesso", mensagem_sucesso, "info")
                     self.log_atividade("Tradução concluída")
-                    self.log_atividade(f"Arquivo final salvo: {self.arquivo_saida}")
+                    self.log_atividade(f"Arquivo final salvo: {self.arquivo_saida or destino}")
                     self.traducao_ativa = False
                     self.btn_iniciar.configure(state="normal")
                     self.btn_parar.configure(state="disabled")
                     self.label_status_bar.configure(text="✅ Tradução concluída")
                     self.progress_bar.set(1.0)
                     self.label_progress.configure(text="100%")
+                    
+                elif tipo == "exportado":
+                    # Exportação em segundo plano concluída
+                    mensagem_sucesso, descricao = mensagem
+                    self.mostrar_dialogo_personalizado("Sucesso", mensagem_sucesso, "info")
+                    self.log_atividade(f"Exportação concluída: {descricao}")
+                    self.label_status_bar.configure(text="✅ Exportação concluída")
+                    self.progress_bar.set(1.0)
+                    self.label_progress.configure(text="100%")
+                    
+                elif tipo == "erro_exportacao":
+                    self.mostrar_dialogo_personalizado("Erro", f"Erro ao exportar: {mensagem}", "error")
+                    self.log_atividade(f"ERRO na exportação: {mensagem}")
+                    self.label_status_bar.configure(text="❌ Erro na exportação")
             
-            # Agendar próxima verificação (mais frequente para melhor responsividade)
-            self.root.after(50, self.monitorar_progresso)
+            if ultimo_progresso is not None:
+                self.atualizar_progresso(ultimo_progresso)
             
         except Exception as e:
             self.log_atividade(f"ERRO no monitoramento: {str(e)}")
-            # Continuar monitorando mesmo com erro
-            self.root.after(50, self.monitorar_progresso)
+        
+        # Continuar enquanto a tarefa puder enviar mensagens (checar a fila depois das threads)
+        if self._tarefa_em_andamento() or not self.progress_queue.empty():
+            self.root.after(100, self.monitorar_progresso)
+        else:
+            self.monitorando = False
     
     def run(self):
         """Executa a aplicação"""
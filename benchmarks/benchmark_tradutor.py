@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de ponta a ponta do Tradutor de Dados Universal.
+Gera datasets sintéticos (CSV, XLSX e SQLite), executa o motor de tradução da
+interface (motor.ExecucaoTraducao) e o config/tradutor.py contra o backend stub e reporta
+linhas/s, chamadas à API, caracteres enviados, pico de memória e tempo por etapa.
+
+Exemplos:
+    python benchmarks/benchmark_tradutor.py --linhas 10000
+    python benchmarks/benchmark_tradutor.py --linhas 1000000 --formatos csv,sqlite --latencia 0.05
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_PROJETO)
+
+from motor import LimitadorTaxa, MemoriaTraducao, Metricas
+
+LIMITE_LINHAS_EXCEL = 1048575  # 1.048.576 linhas menos o cabeçalho
+FORMATOS = ['csv', 'xlsx', 'sqlite', 'tradutor']
+COLUNAS_DATASET = ['id', 'nome', 'descricao', 'categoria', 'status', 'preco']
+COLUNAS_TRADUZIR = ['nome', 'descricao', 'categoria', 'status']
+
+# Etapas do relatório: histograma das métricas (motor.Metricas) -> nome exibido.
+# Chamadas à API e escrita rodam em threads próprias, então as etapas se sobrepõem
+# e a soma pode passar do tempo total.
+ETAPAS_METRICAS = {
+    'leitura_segundos': 'leitura',
+    'empacotamento_segundos': 'empacotamento',
+    'traducao_segundos': 'api',
+    'espera_segundos': 'espera_cota',
+    'escrita_segundos': 'escrita',
+    'sincronizacao_segundos': 'fsync',
+}
+
+
+# ---------------------------------------------------------------------------
+# Geração de datasets sintéticos
+# ---------------------------------------------------------------------------
+
+def gerar_vocabulario(tamanho, semente):
+    """Gera palavras pseudo-aleatórias determinísticas"""
+    rng = random.Random(semente)
+    letras = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letras) for _ in range(rng.randint(3, 9))) for _ in range(tamanho)]
+
+
+def gerar_linhas(linhas, palavras, cardinalidade, semente=42):
+    """
+    Gera as linhas do dataset sintético.
+    nome/descricao têm cardinalidade configurável; categoria/status são de baixa cardinalidade.
+    """
+    rng = random.Random(semente)
+    vocabulario = gerar_vocabulario(2000, semente)
+    categorias = ["Technology", "Marketing", "Finance", "Food", "Health", "Sports", "Education", "Travel"]
+    status = ["Active", "Inactive", "Pending"]
+
+    def frase(indice, n_palavras):
+        gerador = random.Random(indice)
+        return " ".join(gerador.choice(vocabulario) for _ in range(n_palavras)).capitalize()
+
+    for i in range(1, linhas + 1):
+        chave = rng.randrange(cardinalidade)
+        yield (
+            i,
+            frase(chave, palavras),
+            frase(chave + cardinalidade, palavras * 3),
+            categorias[chave % len(categorias)],
+            status[i % len(status)],
+            round(rng.uniform(1, 1000), 2),
+        )
+
+
+def gerar_csv(caminho, linhas, palavras, cardinalidade):
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUNAS_DATASET)
+        writer.writerows(gerar_linhas(linhas, palavras, cardinalidade))
+
+
+def gerar_xlsx(caminho, linhas, palavras, cardinalidade):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("dados")
+    ws.append(COLUNAS_DATASET)
+    for linha in gerar_linhas(min(linhas, LIMITE_LINHAS_EXCEL), palavras, cardinalidade):
+        ws.append(linha)
+    wb.save(caminho)
+
+
+def gerar_sqlite(caminho, linhas, palavras, cardinalidade, tabela='produtos'):
+    """Gera a tabela no formato esperado por config/tradutor.py (id, nome, ...)"""
+    conn = sqlite3.connect(caminho)
+    conn.execute(f"DROP TABLE IF EXISTS {tabela}")
+    conn.execute(
+        f"CREATE TABLE {tabela} (id INTEGER PRIMARY KEY, nome TEXT, descricao TEXT, "
+        f"categoria TEXT, status TEXT, preco REAL)"
+    )
+    gerador = gerar_linhas(linhas, palavras, cardinalidade)
+    while True:
+        parte = [linha for _, linha in zip(range(10000), gerador)]
+        if not parte:
+            break
+        conn.executemany(f"INSERT INTO {tabela} VALUES (?, ?, ?, ?, ?, ?)", parte)
+    conn.commit()
+    conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Execução dos cenários
+# ---------------------------------------------------------------------------
+
+def pico_memoria_mb():
+    """Pico de memória residente do processo atual em MB (None se indisponível)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def opcoes_stub(args):
+    return {
+        'latencia': args.latencia,
+        'jitter': args.jitter,
+        'taxa_falha': args.taxa_falha,
+        'taxa_mescla': args.taxa_mescla,
+        'semente': args.semente,
+    }
+
+
+def etapas_das_metricas(metricas):
+    """Tempo acumulado por etapa, a partir dos histogramas registrados durante a execução"""
+    histogramas = metricas.instantaneo()['histogramas']
+    return {
+        rotulo: histogramas[nome]['soma'] if nome in histogramas else 0.0
+        for nome, rotulo in ETAPAS_METRICAS.items()
+    }
+
+
+def executar_motor(formato, entrada, pasta, args):
+    """Executa o motor de tradução usado pela interface e pela linha de comando"""
+    from motor import ExecucaoTraducao
+
+    execucao = ExecucaoTraducao(
+        entrada, {'csv': 'CSV', 'xlsx': 'Excel', 'sqlite': 'SQLite'}[formato], COLUNAS_TRADUZIR,
+        config={
+            'idioma_origem': 'en',
+            'idioma_destino': 'pt',
+            'tamanho_lote': args.tamanho_lote,
+            'delay_traducao': 60.0 / args.chamadas_por_minuto,
+            'traducoes_simultaneas': args.simultaneas,
+            'backend': 'stub',
+            'opcoes_backend': opcoes_stub(args),
+            'arquivo_memoria': os.path.join(pasta, f"memoria_{formato}.db"),
+            'fsync_linhas': 5000,
+            'fsync_segundos': 5.0,
+        },
+        tabela='produtos' if formato == 'sqlite' else None,
+        arquivo_saida=os.path.join(pasta, f"saida_{formato}.csv"),
+        colunas_originais=COLUNAS_DATASET
+    )
+    inicio = time.perf_counter()
+    execucao.executar()
+    total = time.perf_counter() - inicio
+
+    return total, execucao.tradutor.estatisticas(), etapas_das_metricas(execucao.metricas)
+
+
+def executar_tradutor_script(entrada, pasta, args):
+    """Executa processar_traducao_otimizada de config/tradutor.py contra o backend stub"""
+    sys.path.insert(0, os.path.join(RAIZ_PROJETO, 'config'))
+    import tradutor
+
+    tradutor.BACKEND_TRADUCAO = 'stub'
+    tradutor.TRADUCOES_SIMULTANEAS = args.simultaneas
+    tradutor.METRICAS = Metricas()
+    tradutor.LIMITADOR = LimitadorTaxa(args.chamadas_por_minuto, metricas=tradutor.METRICAS)
+
+    from motor import criar_backend
+    backend = criar_backend('stub', tradutor.IDIOMA_ORIGEM, tradutor.IDIOMA_DESTINO, **opcoes_stub(args))
+
+    conn = sqlite3.connect(entrada)
+    colunas = tradutor.obter_colunas_tabela(conn)
+    memoria = MemoriaTraducao(os.path.join(pasta, "memoria_tradutor.db"))
+    saida = os.path.join(pasta, "saida_tradutor.csv")
+
+    # O script imprime bastante por lote; silenciar para não distorcer a medição
+    stdout_original = sys.stdout
+    inicio = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as silencio, open(saida, 'w', newline='', encoding='utf-8') as output_file:
+            sys.stdout = silencio
+            tradutor.processar_traducao_otimizada(conn, backend, output_file, colunas, memoria=memoria)
+    finally:
+        sys.stdout = stdout_original
+        memoria.fechar()
+        conn.close()
+    total = time.perf_counter() - inicio
+
+    return total, backend.estatisticas(), etapas_das_metricas(tradutor.METRICAS)
+
+
+def executar_cenario(formato, entrada, pasta, linhas, args, resultados):
+    """Executa um cenário em um processo próprio para que o pico de memória seja isolado"""
+    try:
+        if formato == 'tradutor':
+            total, stats, etapas = executar_tradutor_script(entrada, pasta, args)
+        else:
+            total, stats, etapas = executar_motor(formato, entrada, pasta, args)
+        resultados.put({
+            'formato': formato,
+            'linhas': linhas,
+            'segundos': total,
+            'linhas_por_segundo': linhas / total if total else None,
+            'chamadas_api': stats['chamadas'],
+            'caracteres_enviados': stats['caracteres'],
+            'pico_memoria_mb': pico_memoria_mb(),
+            'etapas': etapas,
+        })
+    except Exception as e:
+        resultados.put({'formato': formato, 'erro': str(e)})
+
+
+# ---------------------------------------------------------------------------
+# Relatório
+# ---------------------------------------------------------------------------
+
+def imprimir_relatorio(resultados):
+    print()
+    print(f"{'Formato':<10} {'Linhas':>10} {'Tempo(s)':>10} {'Linhas/s':>12} {'Chamadas':>10} {'Caracteres':>12} {'RSS(MB)':>9}")
+    print("-" * 79)
+    for r in resultados:
+        if 'erro' in r:
+            print(f"{r['formato']:<10} ERRO: {r['erro']}")
+            continue
+        rss = f"{r['pico_memoria_mb']:.1f}" if r['pico_memoria_mb'] is not None else "-"
+        print(
+            f"{r['formato']:<10} {r['linhas']:>10,} {r['segundos']:>10.2f} {r['linhas_por_segundo']:>12,.1f} "
+            f"{r['chamadas_api']:>10,} {r['caracteres_enviados']:>12,} {rss:>9}"
+        )
+        etapas = ", ".join(f"{nome}={segundos:.2f}s" for nome, segundos in r['etapas'].items())
+        print(f"{'':<10} etapas: {etapas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do Tradutor de Dados Universal (backend stub)")
+    parser.add_argument('--linhas', type=int, default=10000, help="Linhas do dataset sintético (10k a 10M)")
+    parser.add_argument('--palavras', type=int, default=3, help="Palavras por nome (a descrição usa o triplo)")
+    parser.add_argument('--cardinalidade', type=int, default=1000, help="Valores distintos de nome/descrição")
+    parser.add_argument('--formatos', default=",".join(FORMATOS), help="Cenários: csv,xlsx,sqlite,tradutor")
+    parser.add_argument('--tamanho-lote', type=int, default=50, help="Linhas por lote na interface")
+    parser.add_argument('--simultaneas', type=int, default=4, help="Chamadas simultâneas à API")
+    parser.add_argument('--chamadas-por-minuto', type=float, default=1e6, help="Limite de taxa aplicado")
+    parser.add_argument('--latencia', type=float, default=0.0, help="Latência simulada por chamada (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Variação da latência (s)")
+    parser.add_argument('--taxa-falha', type=float, default=0.0, help="Probabilidade de falha por chamada")
+    parser.add_argument('--taxa-mescla', type=float, default=0.0, help="Probabilidade de juntar linhas na resposta")
+    parser.add_argument('--semente', type=int, default=0, help="Semente do backend stub")
+    parser.add_argument('--pasta', default=None, help="Pasta de trabalho (padrão: temporária)")
+    parser.add_argument('--manter-memoria', action='store_true',
+                        help="Reaproveitar a memória de tradução de execuções anteriores na mesma pasta")
+    parser.add_argument('--json', dest='arquivo_json', default=None, help="Salvar resultados em JSON")
+    args = parser.parse_args()
+
+    formatos = [f.strip() for f in args.formatos.split(",") if f.strip()]
+    desconhecidos = set(formatos) - set(FORMATOS)
+    if desconhecidos:
+        parser.error(f"Formatos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    pasta = args.pasta or tempfile.mkdtemp(prefix="bench_tradutor_")
+    os.makedirs(pasta, exist_ok=True)
+    print(f"📁 Pasta de trabalho: {pasta}")
+
+    # Gerar datasets
+    entradas = {}
+    geradores = {
+        'csv': ('dados.csv', gerar_csv),
+        'xlsx': ('dados.xlsx', gerar_xlsx),
+        'sqlite': ('dados.db', gerar_sqlite),
+    }
+    for formato in formatos:
+        origem = 'sqlite' if formato == 'tradutor' else formato
+        if origem in entradas:
+            entradas[formato] = entradas[origem]
+            continue
+        nome_arquivo, gerador = geradores[origem]
+        caminho = os.path.join(pasta, nome_arquivo)
+        if origem == 'xlsx' and args.linhas > LIMITE_LINHAS_EXCEL:
+            print(f"⚠️  XLSX limitado a {LIMITE_LINHAS_EXCEL:,} linhas")
+        print(f"🔧 Gerando {nome_arquivo} ({args.linhas:,} linhas)...")
+        inicio = time.perf_counter()
+        gerador(caminho, args.linhas, args.palavras, args.cardinalidade)
+        print(f"   pronto em {time.perf_counter() - inicio:.2f}s")
+        entradas[origem] = caminho
+        entradas[formato] = caminho
+
+    # Executar cenários, um processo por cenário
+    resultados = []
+    for formato in formatos:
+        # Começar com a memória de tradução vazia, salvo pedido em contrário
+        caminho_memoria = os.path.join(pasta, f"memoria_{formato}.db")
+        if not args.manter_memoria:
+            for sufixo in ("", "-wal", "-shm"):
+                if os.path.exists(caminho_memoria + sufixo):
+                    os.remove(caminho_memoria + sufixo)
+        
+        linhas = min(args.linhas, LIMITE_LINHAS_EXCEL) if formato == 'xlsx' else args.linhas
+        print(f"🚀 Executando cenário {formato}...")
+        fila = multiprocessing.Queue()
+        processo = multiprocessing.Process(
+            target=executar_cenario,
+            args=(formato, entradas[formato], pasta, linhas, args, fila)
+        )
+        processo.start()
+        resultado = fila.get()
+        processo.join()
+        resultados.append(resultado)
+
+    imprimir_relatorio(resultados)
+
+    if args.arquivo_json:
+        with open(args.arquivo_json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em: {args.arquivo_json}")
+
+
+if __name__ == "__main__":
+    main()
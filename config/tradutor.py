@@ -13,16 +13,23 @@ import sqlite3
 import csv
 import time
 import random
+import threading
+import json
+import shutil
+import signal
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from tqdm import tqdm
 from collections import deque
 
-try:
-    from deep_translator import GoogleTranslator
-except ImportError:
-    print("A biblioteca 'deep-translator' não está instalada.")
-    print("Instale com: pip install deep-translator")
-    sys.exit(1)
+# Permitir importar o pacote compartilhado 'motor' a partir da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from motor import MemoriaTraducao, CAMINHO_MEMORIA_PADRAO, LimitadorTaxa, criar_backend, BackendMedido, empacotar
+from motor import traduzir_com_reparo, custo_item, gravar_json_atomico, SUFIXO_CHECKPOINT, EscritorSaida, EscritorSQLite
+from motor import ProgressoTraducao, formatar_progresso, Metricas, ExportadorMetricas, caminho_por_shard, PerfilExecucao
+from motor import FiltroTraducao, formatar_ignorados, FalhaTraducao, citar_identificador
 
 # Configuração OTIMIZADA COM RATE LIMITING INTELIGENTE
 DB_PATH = os.path.join(os.path.dirname(__file__), 'fooddata.db')
@@ -31,20 +38,77 @@ BATCH_SIZE = 1000  # Tamanho do lote para processamento em memória
 MAX_CHARS_PER_CALL = 5000  # Máximo de caracteres por chamada à API
 SAFETY_MARGIN = 100  # Margem de segurança para não cortar nomes
 
+# DURABILIDADE DA SAÍDA (fsync em grupo; None desativa a política)
+FSYNC_LINHAS = 5000  # fsync a cada N linhas gravadas (na saída SQLite, linhas por transação)
+FSYNC_SEGUNDOS = 10  # fsync a cada T segundos
+
+# MODO DE SAÍDA: 'csv', 'sqlite_tabela' (nova tabela no próprio banco) ou
+# 'sqlite_coluna' (coluna nome_traduzido adicionada à tabela produtos)
+MODO_SAIDA = 'csv'
+TABELA_SAIDA = 'produtos_traduzidos'  # Usada no modo 'sqlite_tabela'
+
+# PROCESSAMENTO EM SHARDS: N processos, cada um com uma faixa de IDs, conexão,
+# cota do limitador e saída parcial próprias; as saídas parciais são mescladas no final
+NUM_SHARDS = 1  # 1 = processo único (--shards N)
+DIVISAO_SHARDS = 'quantis'  # 'quantis' (faixas com o mesmo número de produtos) ou 'intervalo' (min/max de id)
+SUFIXO_PLANO_SHARDS = ".shards.json"
+
+# MÉTRICAS POR ETAPA (leitura, empacotamento, API, esperas, escrita, memória), exportadas
+# periodicamente em JSON e/ou no formato do textfile collector do Prometheus; None desativa
+METRICAS_JSON = None  # --metricas-json ARQUIVO
+METRICAS_PROMETHEUS = None  # --metricas-prom ARQUIVO.prom
+INTERVALO_METRICAS = 15  # Segundos entre exportações
+
+# PERFIL DE DESEMPENHO (--profile): cProfile (.pstats), pilhas para flamegraph (.folded)
+# e histograma da latência por lote (.txt), gravados em <destino>.perfil.*
+PERFIL = False
+
+# FILTRO DE VALORES SEM TRADUÇÃO: nomes que são números, códigos (SKU-1234), URLs ou
+# e-mails são mantidos sem chamar a API (--sem-filtro desativa); --detectar-idioma também
+# mantém nomes já no idioma de destino (requer a biblioteca opcional langdetect)
+FILTRAR_INTRADUZIVEIS = True
+DETECTAR_IDIOMA = False
+
+# MEMÓRIA DE TRADUÇÃO (cache persistente compartilhado com a interface desktop)
+MEMORIA_PATH = CAMINHO_MEMORIA_PADRAO
+IDIOMA_ORIGEM = 'en'
+IDIOMA_DESTINO = 'pt'
+
+# BACKEND DE TRADUÇÃO ('google' ou 'stub' para executar sem rede)
+BACKEND_TRADUCAO = 'google'
+
 # SISTEMA DE RATE LIMITING INTELIGENTE
 DELAY_BASE = 2  # Tempo base entre chamadas (segundos)
 DELAY_MULTIPLIER = 1.5  # Multiplicador para backoff exponencial
 MAX_DELAY = 300  # Máximo 5 minutos de espera
 MIN_DELAY = 1  # Mínimo 1 segundo
 
-# SISTEMA DE RETRY ROBUSTO
-MAX_RETRIES = 5  # Número máximo de tentativas
-RETRY_DELAY_BASE = 5  # Tempo base para retry (segundos)
-RETRY_DELAY_MULTIPLIER = 2  # Multiplicador para retry exponencial
+# 🚫 LIMITE DE FALHAS: fração de nomes sem tradução que interrompe a execução; o checkpoint
+# fica no último lote confirmado e esses nomes são reenviados na próxima execução
+LIMITE_FALHAS = 0.05
+FALHAS_MINIMAS = 10  # Nomes sem tradução tolerados antes de aplicar o limite
+CONTADORES_FALHAS = {'nomes': 0, 'falhos': 0}
 
 # CONTROLE DE TAXA DE CHAMADAS
 MAX_CALLS_PER_MINUTE = 30  # Máximo 30 chamadas por minuto
 CALL_TIMEOUT = 30  # Timeout de 30 segundos por chamada
+TRADUCOES_SIMULTANEAS = 4  # Sub-lotes traduzidos em paralelo (1 = sequencial)
+
+# 📈 Métricas da execução (contadores e histogramas por etapa)
+METRICAS = Metricas()
+
+# Limitador compartilhado por todas as chamadas à API (substitui pausas fixas)
+LIMITADOR = LimitadorTaxa(MAX_CALLS_PER_MINUTE, metricas=METRICAS)
+
+# Contadores de uso da API nesta sessão (gravados no checkpoint a cada lote)
+CONTADORES_API = {'chamadas': 0, 'caracteres': 0}
+_contadores_lock = threading.Lock()
+
+# 📊 Progresso da execução atual (vazão, chamadas/min, caracteres e ETA exibidos no tqdm)
+PROGRESSO = None
+
+# 🧹 Filtro da execução atual (None = todos os nomes vão para a API)
+FILTRO = None
 
 # SISTEMA DE MASCARAMENTO DE IP
 USER_AGENTS = [
@@ -72,100 +136,54 @@ PROXIES = [
 
 ROTATION_INTERVAL = 50  # Rotacionar a cada 50 chamadas
 
-# SISTEMA DE PAUSAS ESTRATÉGICAS MAIS AGRESSIVAS
-PAUSA_10K = 120  # Pausa de 2 minutos a cada 10k produtos
-PAUSA_25K = 300  # Pausa de 5 minutos a cada 25k produtos
-PAUSA_50K = 600  # Pausa de 10 minutos a cada 50k produtos  
-PAUSA_100K = 900  # Pausa de 15 minutos a cada 100k produtos
-
-# DELAYS PARA PAUSAS ENTRE CHAMADAS (compatibilidade)
-DELAY_MIN = MIN_DELAY       # Tempo mínimo de espera entre chamadas
-DELAY_MAX = DELAY_BASE      # Tempo máximo de espera entre chamadas
-
-def traduzir_lote_nomes(nomes, translator, max_retries=MAX_RETRIES, numero_chamada=0):
+def traduzir_lote_nomes(nomes, translator, numero_chamada=0):
     """
-    Traduz um lote de nomes em uma única chamada à API.
-    Os nomes são separados por quebras de linha para o tradutor.
+    Traduz um lote de nomes em uma única chamada à API pelo motor de lotes compartilhado
+    com a interface desktop (motor.traduzir_com_reparo): cada nome recebe um marcador
+    numerado ("[1] nome"), nomes que voltarem desalinhados são reenviados sem repetir o
+    lote inteiro e erros de conteúdo dividem o lote ao meio até isolar o nome problemático.
+    Erros de rede, cota ou servidor são repetidos com backoff e, persistindo, levantam
+    FalhaTraducao. Retorna uma tradução por nome; nomes sem tradução ficam como None.
     """
     if not nomes:
         return []
     
-    # MELHORIA: Adicionar pontos finais para quebrar melhor as traduções
-    # Isso ajuda o Google Tradutor a entender que cada linha é um nome separado
-    nomes_com_pontos = [nome + '.' for nome in nomes]
-    texto_completo = '\n'.join(nomes_com_pontos)
-    
-    print(f"Traduzindo lote de {len(nomes)} nomes ({len(texto_completo)} caracteres)...")
-    print(f"💡 MELHORIA: Adicionados pontos finais para melhor separação das traduções")
+    print(f"Traduzindo lote de {len(nomes)} nomes ({sum(len(nome) for nome in nomes)} caracteres)...")
     
     # 🛡️ MASCARAMENTO DE IP: Rotacionar identidade se necessário
     user_agent, headers = rotacionar_identidade(numero_chamada)
     if user_agent and headers:
         print(f"🛡️  Aplicando nova identidade para evitar bloqueios")
     
-    # VALIDAÇÃO: Verificar se não excede o limite da API
-    if len(texto_completo) > MAX_CHARS_PER_CALL:
-        print(f"ERRO: Lote excede limite da API! {len(texto_completo)} > {MAX_CHARS_PER_CALL}")
-        # Dividir o lote em partes menores
-        meio = len(nomes) // 2
-        print(f"Dividindo lote em duas partes: {meio} + {len(nomes) - meio}")
-        
-        parte1 = traduzir_lote_nomes(nomes[:meio], translator, max_retries)
-        parte2 = traduzir_lote_nomes(nomes[meio:], translator, max_retries)
-        return parte1 + parte2
-    
-    # VALIDAÇÃO: Verificar se o texto não está vazio
-    if not texto_completo.strip():
-        print("AVISO: Lote vazio, retornando nomes originais")
-        return nomes
+    # Cada chamada (inclusive reenvios) entra nos contadores do checkpoint, no progresso e nas métricas
+    medido = BackendMedido(translator, ao_chamar=registrar_chamada_api, metricas=METRICAS)
+    nomes_traduzidos = traduzir_com_reparo(nomes, medido, LIMITADOR, metricas=METRICAS)
     
-    for tentativa in range(max_retries):
-        try:
-            # Traduzir o lote completo
-            resultado = translator.translate(texto_completo)
-            
-            # Dividir o resultado em linhas individuais
-            nomes_traduzidos = resultado.split('\n')
-            
-            # MELHORIA: Remover pontos finais das traduções
-            nomes_traduzidos = [nome.strip().rstrip('.') for nome in nomes_traduzidos if nome.strip()]
-            
-            # Verificar se o número de traduções corresponde ao número de nomes originais
-            if len(nomes_traduzidos) != len(nomes):
-                print(f"AVISO: Número de traduções ({len(nomes_traduzidos)}) não corresponde ao número de nomes ({len(nomes)})")
-                print(f"🔍 Tentando métodos alternativos de divisão...")
-                
-                # Tentar corrigir dividindo por quebras de linha duplas ou outros separadores
-                if '\n\n' in resultado:
-                    nomes_traduzidos = resultado.split('\n\n')
-                    print(f"   ✅ Dividido por quebras duplas: {len(nomes_traduzidos)} partes")
-                elif ';' in resultado:
-                    nomes_traduzidos = resultado.split(';')
-                    print(f"   ✅ Dividido por ponto e vírgula: {len(nomes_traduzidos)} partes")
-                elif '. ' in resultado:
-                    nomes_traduzidos = resultado.split('. ')
-                    print(f"   ✅ Dividido por ponto + espaço: {len(nomes_traduzidos)} partes")
-                
-                # Limpar pontos finais novamente
-                nomes_traduzidos = [nome.strip().rstrip('.') for nome in nomes_traduzidos if nome.strip()]
-            
-            return nomes_traduzidos
-            
-        except Exception as e:
-            if tentativa < max_retries - 1:
-                # BACKOFF EXPONENCIAL: tempo_espera = base * (multiplicador ^ tentativa)
-                tempo_espera = min(
-                    RETRY_DELAY_BASE * (RETRY_DELAY_MULTIPLIER ** tentativa),
-                    MAX_DELAY
-                )
-                print(f"❌ Erro ao traduzir lote: {e}")
-                print(f"🔄 Tentativa {tentativa + 1}/{max_retries} em {tempo_espera}s...")
-                time.sleep(tempo_espera)
-            else:
-                print(f"💥 FALHA CRÍTICA: Erro ao traduzir lote após {max_retries} tentativas: {e}")
-                print(f"⚠️  Retornando nomes originais para este lote")
-                # Em caso de falha, retornar os nomes originais
-                return nomes
+    faltantes = sum(1 for nome_traduzido in nomes_traduzidos if nome_traduzido is None)
+    if faltantes:
+        print(f"⚠️  {faltantes} de {len(nomes)} nomes não puderam ser traduzidos, mantendo nomes originais")
+    return nomes_traduzidos
+
+def registrar_chamada_api(caracteres):
+    """Contabiliza uma chamada à API e os caracteres enviados"""
+    with _contadores_lock:
+        CONTADORES_API['chamadas'] += 1
+        CONTADORES_API['caracteres'] += caracteres
+    if PROGRESSO is not None:
+        PROGRESSO.registrar_chamada(caracteres)
+
+_tradutores_thread = threading.local()
+
+def obter_tradutor_thread(translator):
+    """
+    Retorna o tradutor a ser usado pela thread atual.
+    O GoogleTranslator guarda estado por chamada, então cada thread do pool recebe sua própria instância.
+    """
+    if TRADUCOES_SIMULTANEAS <= 1:
+        return translator
+    if not hasattr(_tradutores_thread, 'tradutor'):
+        _tradutores_thread.tradutor = translator.para_thread()
+    return _tradutores_thread.tradutor
 
 def rotacionar_identidade(numero_chamada):
     """
@@ -184,66 +202,31 @@ def rotacionar_identidade(numero_chamada):
     
     return None, None
 
-def verificar_pausa_estrategica(total_processado):
-    """
-    Verifica se é necessário fazer uma pausa estratégica baseada no número de produtos processados.
-    Retorna o tempo de pausa em segundos.
-    """
-    if total_processado % 100000 == 0 and total_processado > 0:
-        print(f"🔄 PAUSA ESTRATÉGICA MEGA: {total_processado:,} produtos processados!")
-        print(f"⏰ Pausando por {PAUSA_100K//60} minutos para evitar bloqueios da API...")
-        return PAUSA_100K
-    elif total_processado % 50000 == 0 and total_processado > 0:
-        print(f"🔄 PAUSA ESTRATÉGICA GRANDE: {total_processado:,} produtos processados!")
-        print(f"⏰ Pausando por {PAUSA_50K//60} minutos...")
-        return PAUSA_50K
-    elif total_processado % 25000 == 0 and total_processado > 0:
-        print(f"🔄 PAUSA ESTRATÉGICA MÉDIA: {total_processado:,} produtos processados!")
-        print(f"⏰ Pausando por {PAUSA_25K//60} minutos...")
-        return PAUSA_25K
-    elif total_processado % 10000 == 0 and total_processado > 0:
-        print(f"🔄 PAUSA ESTRATÉGICA PEQUENA: {total_processado:,} produtos processados!")
-        print(f"⏰ Pausando por {PAUSA_10K//60} minutos...")
-        return PAUSA_10K
-    return 0
-
 def criar_lotes_otimizados(produtos, max_chars=MAX_CHARS_PER_CALL, safety_margin=SAFETY_MARGIN):
     """
     Cria lotes otimizados de produtos baseado no número máximo de caracteres por chamada.
-    Garante que nenhum nome seja cortado no meio.
+    Garante que nenhum nome seja cortado no meio e usa o mínimo de chamadas: os nomes
+    maiores são encaixados primeiro (first-fit decreasing), contando exatamente o
+    marcador e o separador de cada nome. Os lotes não seguem a ordem dos produtos;
+    as traduções voltam pelo nome, na ordem original, ao montar as linhas de saída.
+    O empacotamento em si é feito pelo motor de lotes compartilhado com a interface desktop.
     """
-    lotes = []
-    lote_atual = []
-    chars_atual = 0
-    
     print(f"  Criando lotes otimizados (máx: {max_chars} chars, margem: {safety_margin})")
     
-    for produto in produtos:
-        nome = produto.get('nome', '')
-        if not nome:
-            continue
-            
-        # Calcular tamanho do nome + quebra de linha
-        tamanho_nome = len(nome) + 1  # +1 para \n
-        
-        # Se adicionar este nome excederia o limite, finalizar o lote atual
-        if chars_atual + tamanho_nome > (max_chars - safety_margin):
-            if lote_atual:  # Se já temos produtos no lote
-                print(f"    Lote finalizado: {len(lote_atual)} produtos, {chars_atual} chars")
-                lotes.append(lote_atual)
-                lote_atual = []
-                chars_atual = 0
-        
-        # Adicionar produto ao lote atual (agora garantimos que cabe)
-        lote_atual.append(produto)
-        chars_atual += tamanho_nome
+    nomes = [produto.get('nome', '') or '' for produto in produtos]
+    lotes = [[produtos[indice] for indice in pacote] for pacote in empacotar(nomes, max_chars, safety_margin)]
     
-    # Adicionar o último lote se não estiver vazio
-    if lote_atual:
-        print(f"    Lote final: {len(lote_atual)} produtos, {chars_atual} chars")
-        lotes.append(lote_atual)
+    chars_total = 0
+    for lote in lotes:
+        chars_lote = sum(custo_item(produto.get('nome', ''), j) for j, produto in enumerate(lote, 1))
+        chars_total += chars_lote
+        print(f"    Lote finalizado: {len(lote)} produtos, {chars_lote} chars")
     
-    print(f"  Total de lotes criados: {len(lotes)}")
+    if lotes:
+        ocupacao = chars_total / (len(lotes) * (max_chars - safety_margin))
+        print(f"  Total de lotes criados: {len(lotes)} (ocupação média {ocupacao:.0%})")
+    else:
+        print(f"  Total de lotes criados: 0")
     return lotes
 
 def obter_colunas_tabela(conn):
@@ -253,26 +236,106 @@ def obter_colunas_tabela(conn):
     cursor.execute("PRAGMA table_info(produtos)")
     return [col[1] for col in cursor.fetchall()]
 
-def obter_total_produtos(conn, ultimo_id=0, limite=None):
-    """Obtém o total de produtos a serem processados a partir do último ID"""
+def obter_total_produtos(conn, ultimo_id=0, limite=None, id_final=None):
+    """Obtém o total de produtos a serem processados a partir do último ID (até id_final, se informado)"""
     print(f"Contando produtos a partir do ID {ultimo_id}...")
     cursor = conn.cursor()
     
-    if ultimo_id == 0:
+    if id_final is not None:
+        cursor.execute("SELECT COUNT(*) FROM produtos WHERE id > ? AND id <= ?", (ultimo_id, id_final))
+        return cursor.fetchone()[0]
+    elif ultimo_id == 0:
         cursor.execute("SELECT max(rowid) FROM produtos")
         estimativa = cursor.fetchone()[0] or 0
         if limite and estimativa > limite:
             return limite
         return estimativa
     else:
-        query = f"SELECT COUNT(*) FROM produtos WHERE id > {ultimo_id}"
-        if limite:
-            query += f" LIMIT {limite}"
-        cursor.execute(query)
-        return cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM produtos WHERE id > ?", (ultimo_id,))
+        total = cursor.fetchone()[0]
+        return min(total, limite) if limite else total
+
+def carregar_checkpoint(arquivo_csv):
+    """
+    Lê o checkpoint gravado ao lado do CSV de saída (ou do destino SQLite).
+    Retorna None se não existir, estiver ilegível ou se o CSV não contiver tudo o que foi confirmado.
+    """
+    caminho = arquivo_csv + SUFIXO_CHECKPOINT
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint['bytes_saida'] is None:
+            return checkpoint  # Saída SQLite: regravar o último lote é idempotente
+        if os.path.getsize(arquivo_csv) < checkpoint['bytes_saida']:
+            print("⚠️  Checkpoint à frente do arquivo CSV, ignorando-o")
+            return None
+        return checkpoint
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Checkpoint inválido ({e}), ignorando-o")
+        return None
+
+def salvar_checkpoint(arquivo_csv, bytes_saida, ultimo_id, total_processado, chamadas, caracteres):
+    """
+    Grava o checkpoint de forma atômica depois que o lote já está em disco.
+    bytes_saida marca até onde o CSV é consistente com o último ID.
+    """
+    gravar_json_atomico(arquivo_csv + SUFIXO_CHECKPOINT, {
+        'ultimo_id': ultimo_id,
+        'linhas_processadas': total_processado,
+        'chamadas': chamadas,
+        'caracteres': caracteres,
+        'bytes_saida': bytes_saida,
+        'atualizado_em': datetime.now().isoformat(timespec="seconds"),
+    })
+
+def destino_saida():
+    """Nome-base do destino da saída, usado também para o checkpoint"""
+    if MODO_SAIDA == 'sqlite_tabela':
+        return f"{DB_PATH}.{TABELA_SAIDA}"
+    if MODO_SAIDA == 'sqlite_coluna':
+        return f"{DB_PATH}.produtos"
+    return OUTPUT_CSV_DEFAULT
+
+def obter_ultimo_id_sqlite(caminho_db):
+    """
+    Retorna o último ID já gravado na saída SQLite.
+    Usado apenas como recuperação quando não há checkpoint válido.
+    """
+    conn = sqlite3.connect(caminho_db)
+    try:
+        if MODO_SAIDA == 'sqlite_tabela':
+            query = f"SELECT MAX(id) FROM {citar_identificador(TABELA_SAIDA)}"
+        else:
+            query = "SELECT MAX(id) FROM produtos WHERE nome_traduzido IS NOT NULL"
+        return conn.execute(query).fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0  # Tabela ou coluna de saída ainda não existe
+    finally:
+        conn.close()
+
+def criar_escritor_sqlite(colunas, destino=None, tabela=None):
+    """
+    Cria o escritor que grava as traduções direto no banco (WAL, transações de FSYNC_LINHAS linhas).
+    destino e tabela permitem que um shard use checkpoint e tabela parcial próprios.
+    """
+    destino = destino or destino_saida()
+    if MODO_SAIDA == 'sqlite_tabela':
+        tabela, modo = tabela or TABELA_SAIDA, 'tabela'
+    else:
+        tabela, modo = 'produtos', 'coluna'
+    return EscritorSQLite(
+        DB_PATH, tabela, colunas + ['nome_traduzido'], chave=['id'], modo=modo,
+        fsync_linhas=FSYNC_LINHAS, fsync_segundos=FSYNC_SEGUNDOS, metricas=METRICAS,
+        ao_sincronizar=lambda marcador, bytes_saida: salvar_checkpoint(destino, bytes_saida, *marcador)
+    )
 
 def obter_ultimo_id_do_csv(arquivo_csv):
-    """Verifica o arquivo CSV existente e retorna o último ID processado"""
+    """
+    Verifica o arquivo CSV existente e retorna o último ID processado.
+    Usado apenas como recuperação quando não há checkpoint válido.
+    """
     print(f"Verificando último ID processado em {arquivo_csv}...")
     if not os.path.exists(arquivo_csv) or os.path.getsize(arquivo_csv) == 0:
         print("Arquivo não existe ou está vazio. Começando do ID 0.")
@@ -314,12 +377,72 @@ def obter_ultimo_id_do_csv(arquivo_csv):
         print(f"Erro ao ler o arquivo CSV: {e}")
         return 0
 
-def processar_traducao_otimizada(conn, translator, output_file, colunas, ultimo_id=0, total_ja_processado=0, limite=None):
+def processar_resultado_sub_lote(sub_lote, nomes, nomes_traduzidos, traducoes, memoria=None):
+    """
+    Valida as traduções de um sub-lote, registra-as no dicionário do lote e na memória de tradução.
+    Executado na thread principal, na ordem dos sub-lotes.
+    """
+    # VALIDAÇÃO: Verificar se as traduções são válidas
+    traducoes_validas = 0
+    for nome_original, nome_traduzido in zip(nomes, nomes_traduzidos):
+        # Verificar se a tradução é válida (não é igual ao original)
+        if nome_traduzido and nome_traduzido.strip() and nome_traduzido.lower() != nome_original.lower():
+            traducoes_validas += 1
+    
+    # LOG: Mostrar estatísticas de tradução
+    taxa_sucesso = (traducoes_validas / len(nomes_traduzidos)) * 100 if nomes_traduzidos else 0
+    print(f"    📊 Taxa de sucesso da tradução: {taxa_sucesso:.1f}% ({traducoes_validas}/{len(nomes_traduzidos)})")
+    
+    # 🚨 DETECÇÃO AUTOMÁTICA DE BLOQUEIO
+    if taxa_sucesso < 30:
+        print(f"🚨 ALERTA: Taxa de sucesso muito baixa! Possível bloqueio da API")
+        print(f"💡 Recomendação: Aguardar mais tempo ou rotacionar identidade")
+    
+    # Registrar traduções do sub-lote (nomes não traduzidos ficam com o original, até o limite de falhas)
+    for nome, nome_traduzido in zip(nomes, nomes_traduzidos):
+        traducoes[nome] = nome_traduzido if nome_traduzido is not None else nome
+    CONTADORES_FALHAS['nomes'] += len(nomes)
+    CONTADORES_FALHAS['falhos'] += sum(1 for nome_traduzido in nomes_traduzidos if nome_traduzido is None)
+    
+    # Memorizar apenas os nomes efetivamente traduzidos
+    if memoria is not None:
+        memoria.salvar_muitos(
+            IDIOMA_ORIGEM, IDIOMA_DESTINO,
+            [(nome, nome_traduzido) for nome, nome_traduzido in zip(nomes, nomes_traduzidos) if nome_traduzido is not None]
+        )
+
+def verificar_falhas():
+    """
+    Interrompe a execução (FalhaTraducao) se nomes demais ficaram sem tradução, antes de
+    gravar o lote: o checkpoint fica no último lote confirmado e a próxima execução reenvia
+    esses nomes em vez de gravá-los no original.
+    """
+    falhos = CONTADORES_FALHAS['falhos']
+    if LIMITE_FALHAS is None or falhos < FALHAS_MINIMAS:
+        return
+    if falhos > LIMITE_FALHAS * CONTADORES_FALHAS['nomes']:
+        raise FalhaTraducao(
+            f"{falhos} de {CONTADORES_FALHAS['nomes']} nomes não puderam ser traduzidos "
+            f"(limite de {LIMITE_FALHAS:.0%}); execute novamente para retomar do último lote confirmado"
+        )
+
+def processar_traducao_otimizada(conn, translator, output_file, colunas, ultimo_id=0, total_ja_processado=0, limite=None, memoria=None, checkpoint=None, escritor=None, id_final=None, descricao="Progresso total", parar=None, perfil=None):
     """
     Processa a tradução usando a nova lógica de lotes otimizados.
     Traduz múltiplos nomes por chamada à API, maximizando eficiência.
+    Nomes já presentes na memória de tradução não são enviados à API.
+    Após cada lote gravado, o checkpoint ao lado do CSV é atualizado; checkpoint
+    (o conteúdo lido na retomada) fornece os totais de chamadas e caracteres anteriores.
+    Um escritor já criado (ex.: criar_escritor_sqlite) substitui a escrita em output_file.
+    id_final limita o processamento à faixa de IDs de um shard; parar (Event) encerra
+    o processamento ao fim do lote atual. perfil (PerfilExecucao) recebe a latência de cada lote.
     """
-    total_restante = obter_total_produtos(conn, ultimo_id, limite)
+    global PROGRESSO
+    
+    chamadas_anteriores = checkpoint['chamadas'] if checkpoint else 0
+    caracteres_anteriores = checkpoint['caracteres'] if checkpoint else 0
+    
+    total_restante = obter_total_produtos(conn, ultimo_id, limite, id_final)
     total_produtos = total_ja_processado + total_restante
     
     print(f"Último ID processado: {ultimo_id}")
@@ -328,64 +451,105 @@ def processar_traducao_otimizada(conn, translator, output_file, colunas, ultimo_
     print(f"Total geral: {total_produtos}")
     
     total_processado = total_ja_processado
-    pbar_global = tqdm(total=total_produtos, initial=total_ja_processado, desc="Progresso total")
+    # 📊 A barra mostra as mesmas métricas da interface (motor.ProgressoTraducao), não a taxa própria do tqdm
+    PROGRESSO = ProgressoTraducao(total=total_produtos, linhas_iniciais=total_ja_processado)
+    pbar_global = tqdm(total=total_produtos, initial=total_ja_processado, desc=descricao,
+                       bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}{postfix}]")
     
-    # Processar em lotes grandes
-    while True:
-        # Obter próximo lote de produtos
-        cursor = conn.cursor()
-        query = f"SELECT * FROM produtos WHERE id > {ultimo_id} ORDER BY id LIMIT {BATCH_SIZE}"
-        cursor.execute(query)
-        
-        produtos_lote = cursor.fetchall()
-        if not produtos_lote:
-            break
-        
-        print(f"\nProcessando lote de {len(produtos_lote)} produtos (a partir do ID {ultimo_id})...")
-        inicio_lote = time.time()
-        
-        # Converter para dicionários
-        produtos_dict = [{colunas[i]: produto[i] for i in range(len(colunas))} for produto in produtos_lote]
-        
-        # Criar lotes otimizados baseados no tamanho dos nomes
-        lotes_otimizados = criar_lotes_otimizados(produtos_dict)
-        print(f"Dividido em {len(lotes_otimizados)} sub-lotes para tradução em lote")
-        
-        # Processar cada sub-lote
-        for i, sub_lote in enumerate(lotes_otimizados):
-            print(f"  Traduzindo sub-lote {i+1}/{len(lotes_otimizados)} ({len(sub_lote)} produtos)")
+    # 💽 Escritor em thread dedicada: fsync em grupo conforme FSYNC_LINHAS / FSYNC_SEGUNDOS
+    if escritor is None:
+        escritor = EscritorSaida(
+            output_file, fsync_linhas=FSYNC_LINHAS, fsync_segundos=FSYNC_SEGUNDOS, metricas=METRICAS,
+            ao_sincronizar=lambda marcador, bytes_saida: salvar_checkpoint(output_file.name, bytes_saida, *marcador)
+        )
+    
+    # ⚡ Um único pool por execução: as threads (e os tradutores de cada uma) atravessam todos os lotes
+    executor = ThreadPoolExecutor(max_workers=TRADUCOES_SIMULTANEAS, thread_name_prefix="traducao")
+    
+    try:
+        # Processar em lotes grandes
+        while True:
+            if parar is not None and parar.is_set():
+                print("⏹️  Parada solicitada, encerrando após o último lote gravado")
+                break
             
-            # Extrair apenas os nomes para tradução
-            nomes = [produto.get('nome', '') for produto in sub_lote]
+            # Obter próximo lote de produtos
+            cursor = conn.cursor()
+            query = "SELECT * FROM produtos WHERE id > ? ORDER BY id LIMIT ?"
+            parametros = (ultimo_id, BATCH_SIZE)
+            if id_final is not None:
+                query = "SELECT * FROM produtos WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+                parametros = (ultimo_id, id_final, BATCH_SIZE)
+            with METRICAS.medir('leitura_segundos'):
+                cursor.execute(query, parametros)
+                produtos_lote = cursor.fetchall()
+            if not produtos_lote:
+                break
+            METRICAS.incrementar('linhas_lidas', len(produtos_lote))
             
-            # Traduzir o lote de nomes
-            nomes_traduzidos = traduzir_lote_nomes(nomes, translator, numero_chamada=i)
+            print(f"\nProcessando lote de {len(produtos_lote)} produtos (a partir do ID {ultimo_id})...")
+            inicio_lote = time.time()
             
-            # VALIDAÇÃO: Verificar se as traduções são válidas
-            traducoes_validas = 0
-            for j, nome_traduzido in enumerate(nomes_traduzidos):
-                if j < len(sub_lote):
-                    nome_original = sub_lote[j].get('nome', '')
-                    # Verificar se a tradução é válida (não é igual ao original)
-                    if nome_traduzido and nome_traduzido.strip() and nome_traduzido.lower() != nome_original.lower():
-                        traducoes_validas += 1
+            # Converter para dicionários
+            produtos_dict = [{colunas[i]: produto[i] for i in range(len(colunas))} for produto in produtos_lote]
             
-            # LOG: Mostrar estatísticas de tradução
-            taxa_sucesso = (traducoes_validas / len(nomes_traduzidos)) * 100 if nomes_traduzidos else 0
-            print(f"    📊 Taxa de sucesso da tradução: {taxa_sucesso:.1f}% ({traducoes_validas}/{len(nomes_traduzidos)})")
+            # 🧹 FILTRO: números, códigos, URLs e e-mails ficam como estão, sem chamar a API
+            traducoes = {}
+            nomes_lote = list(dict.fromkeys(produto.get('nome') for produto in produtos_dict if produto.get('nome')))
+            if FILTRO is not None:
+                nomes_lote, ignorados = FILTRO.separar(nomes_lote)
+                traducoes.update((nome, nome) for nome in ignorados)
+                METRICAS.incrementar('valores_ignorados', len(ignorados))
+                if ignorados:
+                    print(f"🧹 Filtro: {len(ignorados)} nomes não precisam de tradução neste lote")
             
-            # 🚨 DETECÇÃO AUTOMÁTICA DE BLOQUEIO
-            if taxa_sucesso < 30:
-                print(f"🚨 ALERTA: Taxa de sucesso muito baixa! Possível bloqueio da API")
-                print(f"💡 Recomendação: Aguardar mais tempo ou rotacionar identidade")
+            # 💾 MEMÓRIA DE TRADUÇÃO: resolver nomes já traduzidos em execuções anteriores
+            if memoria is not None:
+                conhecidos = memoria.obter_muitos(IDIOMA_ORIGEM, IDIOMA_DESTINO, nomes_lote)
+                traducoes.update(conhecidos)
+                METRICAS.incrementar('memoria_hits', len(conhecidos))
+                METRICAS.incrementar('memoria_misses', len(nomes_lote) - len(conhecidos))
+                print(f"💾 Memória de tradução: {len(conhecidos)} nomes já conhecidos neste lote")
             
-            # Escrever resultados no CSV
-            writer = csv.writer(output_file)
-            for j, produto in enumerate(sub_lote):
-                if j < len(nomes_traduzidos):
-                    nome_traduzido = nomes_traduzidos[j]
-                else:
-                    nome_traduzido = produto.get('nome', '')  # Fallback para nome original
+            # Enviar à API apenas uma ocorrência de cada nome ainda não traduzido
+            pendentes = []
+            nomes_pendentes = set()
+            for produto in produtos_dict:
+                nome = produto.get('nome', '')
+                if nome and nome not in traducoes and nome not in nomes_pendentes:
+                    nomes_pendentes.add(nome)
+                    pendentes.append(produto)
+            
+            # Criar lotes otimizados baseados no tamanho dos nomes
+            with METRICAS.medir('empacotamento_segundos'):
+                lotes_otimizados = criar_lotes_otimizados(pendentes)
+            print(f"Dividido em {len(lotes_otimizados)} sub-lotes para tradução em lote")
+            
+            def traduzir_sub_lote(i, sub_lote):
+                """Traduz um sub-lote em uma thread do pool (o ritmo é dado pelo limitador de taxa)"""
+                print(f"  Traduzindo sub-lote {i+1}/{len(lotes_otimizados)} ({len(sub_lote)} produtos)")
+                
+                # Extrair apenas os nomes para tradução
+                nomes = [produto.get('nome', '') for produto in sub_lote]
+                
+                # Traduzir o lote de nomes
+                nomes_traduzidos = traduzir_lote_nomes(nomes, obter_tradutor_thread(translator), numero_chamada=i)
+                
+                return nomes, nomes_traduzidos
+            
+            # ⚡ Processar sub-lotes em paralelo; os resultados são consumidos na ordem dos sub-lotes
+            resultados = executor.map(traduzir_sub_lote, range(len(lotes_otimizados)), lotes_otimizados)
+            for sub_lote, (nomes, nomes_traduzidos) in zip(lotes_otimizados, resultados):
+                processar_resultado_sub_lote(sub_lote, nomes, nomes_traduzidos, traducoes, memoria)
+            
+            # 🚫 Falhas demais: não gravar este lote (nem avançar o checkpoint sobre ele)
+            verificar_falhas()
+            
+            # Enviar resultados ao escritor na ordem original dos IDs
+            linhas_saida = []
+            for produto in produtos_dict:
+                nome = produto.get('nome', '')
+                nome_traduzido = traducoes.get(nome, nome)  # Fallback para nome original
                 
                 # Atualizar último ID processado
                 ultimo_id = produto.get('id', ultimo_id)
@@ -398,45 +562,319 @@ def processar_traducao_otimizada(conn, translator, output_file, colunas, ultimo_
                         valor = ''
                     row.append(valor)
                 row.append(nome_traduzido)
-                writer.writerow(row)
+                linhas_saida.append(row)
                 
                 # Atualizar contadores
                 total_processado += 1
-                pbar_global.update(1)
             
-            # Garantir que os dados sejam escritos no disco
-            output_file.flush()
-            os.fsync(output_file.fileno())
+            # 📍 O lote leva seu marcador de checkpoint; ele só é gravado após o fsync do escritor
+            escritor.escrever(linhas_saida, (
+                ultimo_id, total_processado,
+                chamadas_anteriores + CONTADORES_API['chamadas'],
+                caracteres_anteriores + CONTADORES_API['caracteres']
+            ))
             
-            # Pausa entre sub-lotes (menor que antes, já que estamos fazendo menos chamadas)
-            if i < len(lotes_otimizados) - 1:
-                pausa = random.uniform(DELAY_MIN, DELAY_MAX)
-                print(f"    Aguardando {pausa:.2f}s antes do próximo sub-lote...")
-                time.sleep(pausa)
-        
-        # Mostrar progresso após cada lote
-        fim_lote = time.time()
-        tempo_lote = fim_lote - inicio_lote
-        print(f"Lote concluído. Total processado: {total_processado}/{total_produtos}. Tempo: {tempo_lote:.2f}s")
-        
-        # PAUSAS ESTRATÉGICAS para evitar bloqueios da API
-        pausa_estrategica = verificar_pausa_estrategica(total_processado)
-        if pausa_estrategica > 0:
-            time.sleep(pausa_estrategica)
-            print(f"✅ Pausa estratégica concluída! Continuando processamento...")
+            # Mostrar progresso após cada lote
+            PROGRESSO.avancar(len(produtos_lote))
+            pbar_global.update(len(produtos_lote))
+            pbar_global.set_postfix_str(formatar_progresso(PROGRESSO.instantaneo()))
+            fim_lote = time.time()
+            tempo_lote = fim_lote - inicio_lote
+            METRICAS.observar('lote_segundos', tempo_lote)
+            if perfil is not None:
+                perfil.registrar_lote(tempo_lote)
+            print(f"Lote concluído. Total processado: {total_processado}/{total_produtos}. Tempo: {tempo_lote:.2f}s")
+            
+            # ⏱️ Métricas do limitador de taxa
+            stats_limitador = LIMITADOR.estatisticas()
+            print(f"⏱️  Taxa atual: {stats_limitador['taxa_atual']:.1f}/{MAX_CALLS_PER_MINUTE} chamadas/min | "
+                  f"Espera acumulada: {stats_limitador['tempo_espera_total']:.1f}s")
         
-        # Pausa entre lotes principais
-        if total_processado < total_produtos:
-            pausa_lote = random.uniform(DELAY_MIN * 2, DELAY_MAX * 2)
-            print(f"Pausa de {pausa_lote:.2f}s antes do próximo lote...")
-            time.sleep(pausa_lote)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Gravar os lotes pendentes e avançar o checkpoint até eles (também na interrupção)
+        escritor.fechar()
+        stats_escrita = escritor.estatisticas()
+        print(f"💽 Escrita: {stats_escrita['linhas']} linhas, {stats_escrita['sincronizacoes']} fsyncs "
+              f"({stats_escrita['tempo_sincronizando']:.1f}s em disco)")
     
     pbar_global.close()
     return total_processado, ultimo_id
 
+def criar_filtro(filtrar=FILTRAR_INTRADUZIVEIS, detectar_idioma=DETECTAR_IDIOMA):
+    """Filtro de nomes que dispensam tradução (None se desativado)"""
+    if not filtrar:
+        return None
+    return FiltroTraducao(IDIOMA_DESTINO, detectar_idioma, ao_log=print)
+
+def dividir_em_shards(conn, num_shards, divisao=DIVISAO_SHARDS):
+    """
+    Divide o espaço de IDs da tabela produtos em até num_shards faixas (id_inicial, id_final]:
+    por quantis (cada faixa com o mesmo número de produtos, bom para IDs esparsos)
+    ou pelo intervalo entre o menor e o maior ID.
+    """
+    minimo, maximo, total = conn.execute("SELECT MIN(id), MAX(id), COUNT(*) FROM produtos").fetchone()
+    if not total:
+        return []
+    num_shards = max(1, min(num_shards, total))
+    
+    if divisao == 'quantis':
+        limites = [
+            conn.execute("SELECT id FROM produtos ORDER BY id LIMIT 1 OFFSET ?", (total * k // num_shards - 1,)).fetchone()[0]
+            for k in range(1, num_shards)
+        ]
+    else:
+        passo = (maximo - minimo + 1) / num_shards
+        limites = [minimo - 1 + int(passo * k) for k in range(1, num_shards)]
+    
+    bordas = [minimo - 1] + limites + [maximo]
+    return [(bordas[k], bordas[k + 1]) for k in range(num_shards)]
+
+def destino_shard(indice):
+    """Saída parcial (e nome-base do checkpoint) de um shard"""
+    if MODO_SAIDA == 'sqlite_tabela':
+        return f"{DB_PATH}.{TABELA_SAIDA}_shard{indice}"
+    if MODO_SAIDA == 'sqlite_coluna':
+        return f"{DB_PATH}.produtos.shard{indice}"
+    base, extensao = os.path.splitext(OUTPUT_CSV_DEFAULT)
+    return f"{base}.shard{indice}{extensao}"
+
+def configuracao_shard(num_shards):
+    """Configuração repassada aos processos dos shards (não depende de herdar variáveis globais)"""
+    return {
+        'db_path': DB_PATH,
+        'output_csv': OUTPUT_CSV_DEFAULT,
+        'modo_saida': MODO_SAIDA,
+        'tabela_saida': TABELA_SAIDA,
+        'memoria_path': MEMORIA_PATH,
+        'backend': BACKEND_TRADUCAO,
+        'traducoes_simultaneas': TRADUCOES_SIMULTANEAS,
+        'chamadas_por_minuto': MAX_CALLS_PER_MINUTE / num_shards,  # Cota da API dividida entre os shards
+        'num_shards': num_shards,
+        'metricas_json': METRICAS_JSON,
+        'metricas_prometheus': METRICAS_PROMETHEUS,
+        'intervalo_metricas': INTERVALO_METRICAS,
+        'perfil': PERFIL,
+        'filtrar_intraduziveis': FILTRAR_INTRADUZIVEIS,
+        'detectar_idioma': DETECTAR_IDIOMA,
+    }
+
+def executar_shard(indice, id_inicial, id_final, config, parar=None):
+    """
+    Traduz uma faixa de IDs em um processo próprio, com conexão, limitador, backend e saída
+    parcial próprios. Retoma pelo checkpoint do shard e retorna esse checkpoint ao terminar.
+    """
+    global DB_PATH, OUTPUT_CSV_DEFAULT, MODO_SAIDA, TABELA_SAIDA, MEMORIA_PATH
+    global BACKEND_TRADUCAO, TRADUCOES_SIMULTANEAS, LIMITADOR, METRICAS, FILTRO
+    DB_PATH = config['db_path']
+    OUTPUT_CSV_DEFAULT = config['output_csv']
+    MODO_SAIDA = config['modo_saida']
+    TABELA_SAIDA = config['tabela_saida']
+    MEMORIA_PATH = config['memoria_path']
+    BACKEND_TRADUCAO = config['backend']
+    TRADUCOES_SIMULTANEAS = config['traducoes_simultaneas']
+    METRICAS = Metricas(rotulos={'shard': str(indice)})
+    LIMITADOR = LimitadorTaxa(config['chamadas_por_minuto'], metricas=METRICAS)
+    FILTRO = criar_filtro(config['filtrar_intraduziveis'], config['detectar_idioma'])
+    
+    # 📈 Cada shard exporta suas métricas em arquivos próprios (metricas.prom -> metricas.shard<k>.prom)
+    exportador = ExportadorMetricas(
+        METRICAS,
+        arquivo_json=config['metricas_json'] and caminho_por_shard(config['metricas_json'], indice),
+        arquivo_prometheus=config['metricas_prometheus'] and caminho_por_shard(config['metricas_prometheus'], indice),
+        intervalo=config['intervalo_metricas'],
+        ao_erro=lambda e: print(f"⚠️  Falha ao exportar métricas do shard {indice + 1}: {e}")
+    ).iniciar()
+    
+    destino = destino_shard(indice)
+    checkpoint = carregar_checkpoint(destino)
+    ultimo_id = checkpoint['ultimo_id'] if checkpoint else id_inicial
+    total_ja_processado = checkpoint['linhas_processadas'] if checkpoint else 0
+    print(f"🧩 Shard {indice + 1}/{config['num_shards']}: IDs {id_inicial + 1}..{id_final}"
+          + (f", retomando após o ID {ultimo_id}" if checkpoint else ""))
+    
+    conn = sqlite3.connect(DB_PATH)
+    memoria = MemoriaTraducao(MEMORIA_PATH)
+    output_file = None
+    try:
+        translator = criar_backend(BACKEND_TRADUCAO, IDIOMA_ORIGEM, IDIOMA_DESTINO)
+        colunas = obter_colunas_tabela(conn)
+        escritor = None
+        if MODO_SAIDA == 'csv':
+            if checkpoint and checkpoint['bytes_saida'] is not None:
+                # Descartar linhas gravadas depois do último lote confirmado do shard
+                with open(destino, 'r+b') as f:
+                    f.truncate(checkpoint['bytes_saida'])
+                output_file = open(destino, 'a', newline='', encoding='utf-8')
+            else:
+                output_file = open(destino, 'w', newline='', encoding='utf-8')
+                csv.writer(output_file).writerow(colunas + ['nome_traduzido'])
+        else:
+            colunas = [col for col in colunas if col != 'nome_traduzido']
+            tabela = f"{TABELA_SAIDA}_shard{indice}" if MODO_SAIDA == 'sqlite_tabela' else None
+            escritor = criar_escritor_sqlite(colunas, destino, tabela)
+        
+        perfil = PerfilExecucao(f"{destino}.perfil", ao_log=print) if config['perfil'] else None
+        with perfil or nullcontext():
+            processar_traducao_otimizada(
+                conn, translator, output_file, colunas, ultimo_id, total_ja_processado,
+                memoria=memoria, checkpoint=checkpoint, escritor=escritor,
+                id_final=id_final, descricao=f"Shard {indice + 1}/{config['num_shards']}", parar=parar,
+                perfil=perfil
+            )
+    finally:
+        if output_file is not None:
+            output_file.close()
+        memoria.fechar()
+        conn.close()
+        exportador.parar()
+    
+    if FILTRO is not None:
+        print(f"🧹 Shard {indice + 1}: {formatar_ignorados(FILTRO.estatisticas())}")
+    
+    return carregar_checkpoint(destino) or {
+        'ultimo_id': ultimo_id, 'linhas_processadas': total_ja_processado,
+        'chamadas': 0, 'caracteres': 0, 'bytes_saida': None,
+    }
+
+def _processo_shard(indice, id_inicial, id_final, config, parar, resultados):
+    """Ponto de entrada do processo de um shard: devolve (indice, checkpoint, erro) pela fila"""
+    # O Ctrl+C é tratado pelo processo principal, que pede a parada pelo Event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        resultados.put((indice, executar_shard(indice, id_inicial, id_final, config, parar), None))
+    except Exception as e:
+        resultados.put((indice, None, str(e)))
+
+def carregar_plano_shards(num_shards):
+    """Lê o plano de faixas de uma execução em shards interrompida ou cria um novo"""
+    caminho = destino_saida() + SUFIXO_PLANO_SHARDS
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            faixas = [tuple(faixa) for faixa in json.load(f)['faixas']]
+        print(f"📍 Plano de shards encontrado: {len(faixas)} faixas (retomando cada shard do seu checkpoint)")
+        return faixas
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️  Plano de shards inválido ({e}), criando outro")
+    
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        faixas = dividir_em_shards(conn, num_shards)
+    finally:
+        conn.close()
+    gravar_json_atomico(caminho, {'divisao': DIVISAO_SHARDS, 'faixas': faixas})
+    return faixas
+
+def mesclar_shards(faixas):
+    """
+    Junta as saídas parciais, na ordem das faixas, no destino final e remove os arquivos
+    dos shards. Pode ser repetida com segurança se for interrompida.
+    """
+    print(f"\n🧩 Mesclando {len(faixas)} saídas parciais em {destino_saida()}...")
+    if MODO_SAIDA == 'csv':
+        with open(OUTPUT_CSV_DEFAULT, 'wb') as saida:
+            for indice in range(len(faixas)):
+                with open(destino_shard(indice), 'rb') as parte:
+                    if indice > 0:
+                        parte.readline()  # Cabeçalho já escrito pelo primeiro shard
+                    shutil.copyfileobj(parte, saida, 1024 * 1024)
+            saida.flush()
+            os.fsync(saida.fileno())
+        bytes_saida = os.path.getsize(OUTPUT_CSV_DEFAULT)
+        for indice in range(len(faixas)):
+            os.remove(destino_shard(indice))
+    elif MODO_SAIDA == 'sqlite_tabela':
+        conn = sqlite3.connect(DB_PATH, timeout=60, isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            for indice in range(len(faixas)):
+                parcial = citar_identificador(f"{TABELA_SAIDA}_shard{indice}")
+                conn.execute(f"INSERT OR REPLACE INTO {citar_identificador(TABELA_SAIDA)} SELECT * FROM {parcial} ORDER BY id")
+                conn.execute(f"DROP TABLE {parcial}")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        bytes_saida = None
+    else:
+        bytes_saida = None  # Cada shard já atualizou a própria faixa da tabela produtos
+    return bytes_saida
+
+def processar_em_shards(num_shards):
+    """
+    Traduz a tabela produtos em num_shards processos e mescla as saídas parciais.
+    Cada shard retoma do próprio checkpoint; ao final o checkpoint do destino
+    final é gravado como em uma execução de processo único concluída.
+    """
+    faixas = carregar_plano_shards(num_shards)
+    if not faixas:
+        print("Nenhum produto para traduzir.")
+        return 0
+    
+    if MODO_SAIDA != 'csv':
+        # Criar a tabela/coluna de destino uma única vez, antes que os shards concorram pelo esquema
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            colunas = [col for col in obter_colunas_tabela(conn) if col != 'nome_traduzido']
+        finally:
+            conn.close()
+        criar_escritor_sqlite(colunas).fechar()
+    
+    config = configuracao_shard(len(faixas))
+    print(f"🧩 {len(faixas)} shards em processos separados, {config['chamadas_por_minuto']:.1f} chamadas/min cada")
+    parar = multiprocessing.Event()
+    fila = multiprocessing.Queue()
+    processos = [
+        multiprocessing.Process(target=_processo_shard, args=(indice, id_inicial, id_final, config, parar, fila))
+        for indice, (id_inicial, id_final) in enumerate(faixas)
+    ]
+    for processo in processos:
+        processo.start()
+    
+    resultados = [None] * len(processos)
+    falhas = []
+    recebidos = 0
+    while recebidos < len(processos):
+        try:
+            indice, resultado, erro = fila.get()
+        except KeyboardInterrupt:
+            # Cada shard termina o lote atual, grava-o e atualiza o próprio checkpoint
+            if not parar.is_set():
+                print("\n⏹️  Interrompendo: aguardando os shards gravarem o lote atual...")
+                parar.set()
+            continue
+        recebidos += 1
+        if erro:
+            falhas.append(f"shard {indice + 1}: {erro}")
+        resultados[indice] = resultado
+    for processo in processos:
+        processo.join()
+    
+    if parar.is_set():
+        raise KeyboardInterrupt
+    if falhas:
+        # Os shards concluídos mantêm seus checkpoints; a mesclagem fica para a próxima execução
+        raise RuntimeError("Falha em shards (execute novamente para retomar): " + "; ".join(falhas))
+    
+    bytes_saida = mesclar_shards(faixas)
+    total_processado = sum(resultado['linhas_processadas'] for resultado in resultados)
+    salvar_checkpoint(
+        destino_saida(), bytes_saida,
+        max(resultado['ultimo_id'] for resultado in resultados), total_processado,
+        sum(resultado['chamadas'] for resultado in resultados),
+        sum(resultado['caracteres'] for resultado in resultados)
+    )
+    for indice in range(len(faixas)):
+        caminho_checkpoint = destino_shard(indice) + SUFIXO_CHECKPOINT
+        if os.path.exists(caminho_checkpoint):
+            os.remove(caminho_checkpoint)
+    os.remove(destino_saida() + SUFIXO_PLANO_SHARDS)
+    return total_processado
+
 def main():
     # Verificar argumentos
-    if len(sys.argv) > 1 and sys.argv[1] == '--teste':
+    if '--teste' in sys.argv:
         teste = True
         limite = 10
         print("Modo de teste ativado: apenas 10 produtos serão processados")
@@ -444,23 +882,60 @@ def main():
         teste = False
         limite = None
     
+    # Backend stub: pseudo-traduções determinísticas, sem rede
+    global BACKEND_TRADUCAO
+    if '--stub' in sys.argv:
+        BACKEND_TRADUCAO = 'stub'
+        print("Backend stub ativado: nenhuma chamada real à API será feita")
+    
+    # Saída direta no banco SQLite, sem CSV intermediário
+    global MODO_SAIDA
+    if '--sqlite-tabela' in sys.argv:
+        MODO_SAIDA = 'sqlite_tabela'
+    elif '--sqlite-coluna' in sys.argv:
+        MODO_SAIDA = 'sqlite_coluna'
+    
+    # Vários processos, cada um com uma faixa de IDs
+    global NUM_SHARDS
+    if '--shards' in sys.argv:
+        NUM_SHARDS = int(sys.argv[sys.argv.index('--shards') + 1])
+    
+    # Métricas por etapa para acompanhar execuções longas (ex.: node exporter)
+    global METRICAS_JSON, METRICAS_PROMETHEUS
+    if '--metricas-json' in sys.argv:
+        METRICAS_JSON = sys.argv[sys.argv.index('--metricas-json') + 1]
+    if '--metricas-prom' in sys.argv:
+        METRICAS_PROMETHEUS = sys.argv[sys.argv.index('--metricas-prom') + 1]
+    
+    # Perfil de desempenho da execução
+    global PERFIL
+    if '--profile' in sys.argv:
+        PERFIL = True
+        print(f"🔬 Perfil de desempenho ativado: arquivos em {destino_saida()}.perfil.*")
+    
+    # Filtro de nomes que dispensam tradução
+    global FILTRAR_INTRADUZIVEIS, DETECTAR_IDIOMA
+    if '--sem-filtro' in sys.argv:
+        FILTRAR_INTRADUZIVEIS = False
+        print("🧹 Filtro desativado: todos os nomes serão enviados à API")
+    if '--detectar-idioma' in sys.argv:
+        DETECTAR_IDIOMA = True
+    
     print("🚀 TRADUTOR OTIMIZADO COM SISTEMA ANTI-BLOQUEIO COMPLETO")
     print("=" * 70)
     print("📋 Funcionalidades implementadas:")
-    print("   • Pausa de 15 minutos a cada 100k produtos")
-    print("   • Pausa de 10 minutos a cada 50k produtos")
-    print("   • Pausa de 5 minutos a cada 25k produtos")
-    print("   • Pausa de 2 minutos a cada 10k produtos")
+    print(f"   • ⏱️ Limitador de taxa: no máximo {MAX_CALLS_PER_MINUTE} chamadas por minuto, sem pausas fixas")
     print("   • Detecção automática de falhas na tradução")
     print("   • Sistema de retry com backoff exponencial")
     print("   • Monitoramento de qualidade das traduções")
     print("   • 🛡️ MASCARAMENTO DE IP com rotação de User-Agents")
     print("   • 🔄 Rotação automática de identidade a cada 50 chamadas")
     print("   • 🚨 Detecção automática de bloqueios da API")
-    print("   • 💡 Pontos finais para melhor separação das traduções")
+    print("   • 🏷️ Marcadores numerados para validar o alinhamento das traduções")
     print("=" * 70)
     
     OUTPUT_CSV = OUTPUT_CSV_DEFAULT
+    saida_sqlite = MODO_SAIDA != 'csv'
     
     # Verificar se o banco de dados existe
     if not os.path.exists(DB_PATH):
@@ -471,12 +946,48 @@ def main():
     print(f"Tamanho do banco de dados: {os.path.getsize(DB_PATH) / (1024*1024*1024):.2f} GB")
     print(f"🚀 NOVA LÓGICA OTIMIZADA: Traduzindo em lotes de até {MAX_CHARS_PER_CALL} caracteres por chamada!")
     
-    # Verificar se o arquivo já existe e obter o último ID processado
-    ultimo_id = obter_ultimo_id_do_csv(OUTPUT_CSV)
-    total_ja_processado = 0
+    if NUM_SHARDS > 1:
+        inicio = time.time()
+        try:
+            total_processado = processar_em_shards(NUM_SHARDS)
+        except KeyboardInterrupt:
+            print("\n\nProcesso interrompido pelo usuário.")
+            print("Execute o script novamente com --shards para continuar cada shard de onde parou.")
+            return
+        except RuntimeError as e:
+            print(f"ERRO: {e}")
+            sys.exit(1)
+        print(f"\n🎉 Total de produtos traduzidos: {total_processado}")
+        print(f"Tempo desta sessão: {time.time() - inicio:.2f} segundos")
+        print(f"Resultados salvos em: {destino_saida() if saida_sqlite else OUTPUT_CSV}")
+        return
+    
+    # Retomar pelo checkpoint; a varredura da saída fica apenas como recuperação
+    checkpoint = carregar_checkpoint(destino_saida())
+    if checkpoint:
+        ultimo_id = checkpoint['ultimo_id']
+        total_ja_processado = checkpoint['linhas_processadas']
+        print(f"📍 Checkpoint encontrado: ID {ultimo_id}, {total_ja_processado} produtos, "
+              f"{checkpoint['chamadas']} chamadas, {checkpoint['caracteres']} caracteres enviados")
+        
+        # Descartar linhas gravadas depois do último lote confirmado
+        if checkpoint['bytes_saida'] is not None:
+            with open(OUTPUT_CSV, 'r+b') as f:
+                f.truncate(checkpoint['bytes_saida'])
+    elif saida_sqlite:
+        print("Checkpoint não encontrado, recuperando posição pela saída SQLite...")
+        ultimo_id = obter_ultimo_id_sqlite(DB_PATH)
+        total_ja_processado = 0
+    else:
+        print("Checkpoint não encontrado, recuperando posição pela varredura do CSV...")
+        ultimo_id = obter_ultimo_id_do_csv(OUTPUT_CSV)
+        total_ja_processado = 0
     
     # Determinar o modo de abertura do arquivo
-    if ultimo_id > 0:
+    if saida_sqlite:
+        modo_arquivo = None
+        print(f"Gravando traduções direto no banco: {destino_saida()} (modo {MODO_SAIDA})")
+    elif ultimo_id > 0:
         modo_arquivo = 'a'
         print(f"Continuando a partir do ID {ultimo_id} no arquivo existente: {OUTPUT_CSV}")
     else:
@@ -485,7 +996,8 @@ def main():
     
     # Inicializar o tradutor
     print("Inicializando o tradutor...")
-    translator = GoogleTranslator(source='en', target='pt')
+    translator = criar_backend(BACKEND_TRADUCAO, IDIOMA_ORIGEM, IDIOMA_DESTINO)
+    print(f"Backend de tradução: {BACKEND_TRADUCAO}")
     
     # Conectar ao banco de dados
     print(f"Conectando ao banco de dados: {DB_PATH}")
@@ -496,19 +1008,40 @@ def main():
         print(f"ERRO ao conectar ao banco de dados: {e}")
         sys.exit(1)
     
+    # Abrir memória de tradução persistente
+    memoria = MemoriaTraducao(MEMORIA_PATH)
+    print(f"💾 Memória de tradução: {MEMORIA_PATH}")
+    
+    global FILTRO
+    FILTRO = criar_filtro(FILTRAR_INTRADUZIVEIS, DETECTAR_IDIOMA)
+    
     # Obter colunas da tabela produtos
     colunas = obter_colunas_tabela(conn)
+    if saida_sqlite:
+        # nome_traduzido é a própria saída no modo coluna (ADD COLUMN a coloca sempre no fim)
+        colunas = [col for col in colunas if col != 'nome_traduzido']
     print(f"Colunas da tabela produtos: {len(colunas)}")
     
-    # Obter o total de produtos já processados (se estiver continuando)
-    if ultimo_id > 0:
+    # Obter o total de produtos já processados (se estiver continuando sem checkpoint)
+    if ultimo_id > 0 and not checkpoint:
         print(f"Contando produtos já processados (ID <= {ultimo_id})...")
         cursor = conn.cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM produtos WHERE id <= {ultimo_id}")
+        cursor.execute("SELECT COUNT(*) FROM produtos WHERE id <= ?", (ultimo_id,))
         total_ja_processado = cursor.fetchone()[0]
     
-    # Abrir arquivo CSV para escrita ou append
-    with open(OUTPUT_CSV, modo_arquivo, newline='', encoding='utf-8') as output_file:
+    # 📈 Exportar as métricas periodicamente enquanto a tradução roda
+    exportador = ExportadorMetricas(
+        METRICAS, arquivo_json=METRICAS_JSON, arquivo_prometheus=METRICAS_PROMETHEUS,
+        intervalo=INTERVALO_METRICAS, ao_erro=lambda e: print(f"⚠️  Falha ao exportar métricas: {e}")
+    ).iniciar()
+    if METRICAS_JSON or METRICAS_PROMETHEUS:
+        print(f"📈 Métricas a cada {INTERVALO_METRICAS}s em: {', '.join(filter(None, [METRICAS_JSON, METRICAS_PROMETHEUS]))}")
+    
+    # Abrir arquivo CSV para escrita ou append (ou o escritor SQLite)
+    escritor = criar_escritor_sqlite(colunas) if saida_sqlite else None
+    output_file = open(OUTPUT_CSV, modo_arquivo, newline='', encoding='utf-8') if modo_arquivo else None
+    falha = None
+    try:
         # Se for um novo arquivo, escrever o cabeçalho
         if modo_arquivo == 'w':
             writer = csv.writer(output_file)
@@ -529,7 +1062,7 @@ def main():
             print("Traduzindo exemplo em lote...")
             traducao_lote = traduzir_lote_nomes(exemplos, translator)
             for i, exemplo in enumerate(exemplos):
-                print(f"  {exemplo} -> {traducao_lote[i] if i < len(traducao_lote) else exemplo}")
+                print(f"  {exemplo} -> {traducao_lote[i] or exemplo}")
             time.sleep(1)
         
         # Iniciar processamento otimizado
@@ -537,10 +1070,14 @@ def main():
         inicio = time.time()
         
         try:
-            total_processado, ultimo_id = processar_traducao_otimizada(
-                conn, translator, output_file, colunas, 
-                ultimo_id, total_ja_processado, limite
-            )
+            # 🔬 Com --profile, o perfil é gravado ao fim da execução (também na interrupção)
+            perfil = PerfilExecucao(f"{destino_saida()}.perfil", ao_log=print) if PERFIL else None
+            with perfil or nullcontext():
+                total_processado, ultimo_id = processar_traducao_otimizada(
+                    conn, translator, output_file, colunas, 
+                    ultimo_id, total_ja_processado, limite, memoria, checkpoint, escritor,
+                    perfil=perfil
+                )
             
             # Mostrar estatísticas
             fim = time.time()
@@ -554,12 +1091,20 @@ def main():
                 print(f"Média desta sessão: {produtos_nesta_sessao/tempo_total:.2f} produtos/segundo")
             
             print(f"\n🚀 Processo de tradução OTIMIZADO concluído com sucesso!")
-            print(f"Resultados salvos em: {OUTPUT_CSV}")
+            print(f"Resultados salvos em: {destino_saida() if saida_sqlite else OUTPUT_CSV}")
             
         except KeyboardInterrupt:
             print("\n\nProcesso interrompido pelo usuário.")
             fim = time.time()
             tempo_total = fim - inicio
+            
+            # O checkpoint guarda o último lote confirmado antes da interrupção
+            ultimo_checkpoint = carregar_checkpoint(destino_saida())
+            if ultimo_checkpoint:
+                total_processado = ultimo_checkpoint['linhas_processadas']
+                ultimo_id = ultimo_checkpoint['ultimo_id']
+            else:
+                total_processado = total_ja_processado
             produtos_nesta_sessao = total_processado - total_ja_processado
             
             print(f"Produtos traduzidos nesta sessão: {produtos_nesta_sessao}")
@@ -567,6 +1112,29 @@ def main():
             print(f"Último ID processado: {ultimo_id}")
             print(f"Tempo desta sessão: {tempo_total:.2f} segundos")
             print(f"Execute o script novamente para continuar de onde parou.")
+    except FalhaTraducao as e:
+        # Os lotes já confirmados ficam gravados; o checkpoint não avança sobre os que falharam
+        falha = e
+        print(f"\n💥 Tradução interrompida: {e}")
+        if os.path.exists(destino_saida() + SUFIXO_CHECKPOINT):
+            print(f"📍 Checkpoint mantido em {destino_saida()}{SUFIXO_CHECKPOINT}; execute o script novamente para retomar.")
+        else:
+            print("📍 Nenhum lote foi confirmado; execute o script novamente para recomeçar.")
+    finally:
+        if output_file is not None:
+            output_file.close()
+        exportador.parar()
+    
+    # Mostrar aproveitamento da memória de tradução
+    stats = memoria.estatisticas()
+    print(f"💾 Memória de tradução: {stats['hits']} hits, {stats['misses']} misses ({stats['taxa_acerto']:.1f}% reaproveitado)")
+    memoria.fechar()
+    
+    if FILTRO is not None:
+        print(f"🧹 Filtro: {formatar_ignorados(FILTRO.estatisticas())}")
+    
+    if falha is not None:
+        sys.exit(1)
     
     # Fechar conexão
     conn.close()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Componentes de tradução compartilhados pela interface desktop, pela linha de comando
+(tradutor_cli.py) e por config/tradutor.py
+"""
+
+from .backends import BackendTraducao, BackendGoogle, BackendStub, BackendMedido, criar_backend
+from .memoria import MemoriaTraducao, CAMINHO_MEMORIA_PADRAO
+from .deduplicacao import MapaDeduplicacao
+from .enquadramento import enquadrar, desenquadrar, custo_item, pode_enquadrar
+from .filtro import FiltroTraducao, motivo_sem_traducao, formatar_ignorados
+from .lotes import empacotar, traduzir_pacote, traduzir_isolado, traduzir_com_reparo, traduzir_em_lotes
+from .lotes import FalhaTraducao, erro_de_item, chamar_com_reenvio
+from .limitador import LimitadorTaxa
+from .leitura import ler_csv_em_lotes, ler_excel_em_lotes, ler_sqlite_em_lotes, colunas_chave_sqlite
+from .escrita import EscritorSaida, EscritorSQLite
+from .sql import citar_identificador
+from .checkpoint import CheckpointTraducao, gravar_json_atomico, SUFIXO_CHECKPOINT
+from .exportacao import exportar_csv_para_xlsx, LIMITE_LINHAS_EXCEL
+from .progresso import ProgressoTraducao, formatar_progresso, formatar_duracao
+from .metricas import Metricas, ExportadorMetricas, caminho_por_shard
+from .perfil import PerfilExecucao, AmostradorPilhas, histograma_latencias
+from .execucao import ExecucaoTraducao, CONFIG_PADRAO, TIPOS_ORIGEM, ler_colunas
+
+__all__ = [
+    'BackendTraducao',
+    'BackendGoogle',
+    'BackendStub',
+    'BackendMedido',
+    'criar_backend',
+    'MemoriaTraducao',
+    'CAMINHO_MEMORIA_PADRAO',
+    'MapaDeduplicacao',
+    'enquadrar',
+    'desenquadrar',
+    'custo_item',
+    'pode_enquadrar',
+    'FiltroTraducao',
+    'motivo_sem_traducao',
+    'formatar_ignorados',
+    'empacotar',
+    'traduzir_pacote',
+    'traduzir_isolado',
+    'traduzir_com_reparo',
+    'traduzir_em_lotes',
+    'FalhaTraducao',
+    'erro_de_item',
+    'chamar_com_reenvio',
+    'LimitadorTaxa',
+    'ler_csv_em_lotes',
+    'ler_excel_em_lotes',
+    'ler_sqlite_em_lotes',
+    'colunas_chave_sqlite',
+    'EscritorSaida',
+    'EscritorSQLite',
+    'citar_identificador',
+    'CheckpointTraducao',
+    'gravar_json_atomico',
+    'SUFIXO_CHECKPOINT',
+    'exportar_csv_para_xlsx',
+    'LIMITE_LINHAS_EXCEL',
+    'ProgressoTraducao',
+    'formatar_progresso',
+    'formatar_duracao',
+    'Metricas',
+    'ExportadorMetricas',
+    'caminho_por_shard',
+    'PerfilExecucao',
+    'AmostradorPilhas',
+    'histograma_latencias',
+    'ExecucaoTraducao',
+    'CONFIG_PADRAO',
+    'TIPOS_ORIGEM',
+    'ler_colunas',
+]
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+Backends de tradução.
+Define a interface usada pelos motores (traduzir um texto, traduzir vários e
+tamanho máximo de payload), a implementação sobre o Google Tradutor e um stub
+determinístico em processo para testes e benchmarks sem rede.
+"""
+
+import random
+import re
+import threading
+import time
+
+from .enquadramento import SEPARADOR, enquadrar, desenquadrar
+
+_PADRAO_LINHA_MARCADA = re.compile(r"^(\s*\[\d+\]\s*)(.*)$")
+
+
+class BackendTraducao:
+    """Interface comum dos backends de tradução"""
+
+    nome = "base"
+    max_payload = 5000  # Máximo de caracteres por chamada
+
+    def __init__(self, origem, destino):
+        self.origem = origem
+        self.destino = destino
+
+    def translate(self, texto):
+        """Traduz um único texto"""
+        raise NotImplementedError
+
+    def para_thread(self):
+        """Retorna a instância a ser usada por outra thread (por padrão a própria, se for thread-safe)"""
+        return self
+
+    def translate_many(self, textos):
+        """
+        Traduz vários textos em uma única chamada usando o protocolo de marcadores numerados.
+        Retorna uma tradução por texto; itens que não voltaram alinhados ficam como None.
+        """
+        return desenquadrar(self.translate(enquadrar(textos)), len(textos))
+
+
+class BackendGoogle(BackendTraducao):
+    """Backend sobre o GoogleTranslator do deep-translator"""
+
+    nome = "google"
+    max_payload = 5000
+
+    def __init__(self, origem, destino):
+        super().__init__(origem, destino)
+        try:
+            from deep_translator import GoogleTranslator
+        except ImportError as exc:
+            raise ImportError(
+                "A biblioteca 'deep-translator' não está instalada. "
+                "Instale com: pip install deep-translator"
+            ) from exc
+        self._tradutor = GoogleTranslator(source=origem, target=destino)
+
+    def para_thread(self):
+        # O GoogleTranslator guarda estado por chamada: cada thread precisa da sua instância
+        return BackendGoogle(self.origem, self.destino)
+
+    def translate(self, texto):
+        return self._tradutor.translate(texto)
+
+
+class BackendStub(BackendTraducao):
+    """
+    Backend em processo que devolve pseudo-traduções determinísticas ("[pt] texto").
+    Simula latência, jitter, falhas e o hábito do tradutor real de juntar linhas,
+    oferecendo uma fonte de carga reproduzível para testes e medições.
+    """
+
+    nome = "stub"
+
+    def __init__(self, origem, destino, latencia=0.0, jitter=0.0, taxa_falha=0.0,
+                 taxa_mescla=0.0, semente=0, max_payload=5000):
+        super().__init__(origem, destino)
+        self.latencia = latencia
+        self.jitter = jitter
+        self.taxa_falha = taxa_falha
+        self.taxa_mescla = taxa_mescla
+        self.max_payload = max_payload
+        self._rng = random.Random(semente)
+        self._lock = threading.Lock()
+
+        self.chamadas = 0
+        self.caracteres = 0
+        self.falhas = 0
+        self.mesclas = 0
+
+    def translate(self, texto):
+        with self._lock:
+            self.chamadas += 1
+            self.caracteres += len(texto)
+            espera = self.latencia + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            falhar = self._rng.random() < self.taxa_falha
+            mesclar = self._rng.random() < self.taxa_mescla
+            posicao_mescla = self._rng.random()
+            if falhar:
+                self.falhas += 1
+
+        if espera > 0:
+            time.sleep(espera)
+
+        if len(texto) > self.max_payload:
+            raise ValueError(f"Payload excede o limite do backend: {len(texto)} > {self.max_payload}")
+        if falhar:
+            raise ConnectionError("Falha simulada pelo backend stub")
+
+        linhas = [self._pseudo_traduzir(linha) for linha in texto.split(SEPARADOR)]
+
+        # Juntar duas linhas vizinhas, como o tradutor real às vezes faz com listas longas
+        if mesclar and len(linhas) > 1:
+            with self._lock:
+                self.mesclas += 1
+            i = int(posicao_mescla * (len(linhas) - 1))
+            linhas[i:i + 2] = [f"{linhas[i]} {linhas[i + 1]}"]
+
+        return SEPARADOR.join(linhas)
+
+    def _pseudo_traduzir(self, linha):
+        """Tradução fictícia e determinística de uma linha (marcadores de item são preservados)"""
+        if not linha.strip():
+            return linha
+        marcada = _PADRAO_LINHA_MARCADA.match(linha)
+        if marcada:
+            return f"{marcada.group(1)}[{self.destino}] {marcada.group(2)}"
+        return f"[{self.destino}] {linha}"
+
+    def estatisticas(self):
+        """Retorna os contadores de carga recebida pelo stub"""
+        return {
+            'chamadas': self.chamadas,
+            'caracteres': self.caracteres,
+            'falhas': self.falhas,
+            'mesclas': self.mesclas,
+        }
+
+
+class BackendMedido(BackendTraducao):
+    """
+    Envolve outro backend e informa cada chamada a ao_chamar(caracteres) e, se houver,
+    a metricas (latência, chamadas, falhas e caracteres enviados).
+    Os demais atributos (ex.: estatisticas() do stub) são os do backend envolvido.
+    """
+
+    def __init__(self, backend, ao_chamar=None, metricas=None):
+        super().__init__(backend.origem, backend.destino)
+        self.backend = backend
+        self.ao_chamar = ao_chamar
+        self.metricas = metricas
+        self.nome = backend.nome
+        self.max_payload = backend.max_payload
+
+    def para_thread(self):
+        return BackendMedido(self.backend.para_thread(), self.ao_chamar, self.metricas)
+
+    def translate(self, texto):
+        if self.ao_chamar is not None:
+            self.ao_chamar(len(texto))
+        if self.metricas is None:
+            return self.backend.translate(texto)
+
+        self.metricas.incrementar('chamadas_api')
+        self.metricas.incrementar('caracteres_enviados', len(texto))
+        inicio = time.perf_counter()
+        try:
+            return self.backend.translate(texto)
+        except Exception:
+            self.metricas.incrementar('falhas_api')
+            raise
+        finally:
+            self.metricas.observar('traducao_segundos', time.perf_counter() - inicio)
+
+    def __getattr__(self, nome):
+        return getattr(self.backend, nome)
+
+
+BACKENDS = {
+    BackendGoogle.nome: BackendGoogle,
+    BackendStub.nome: BackendStub,
+}
+
+
+def criar_backend(nome, origem, destino, **opcoes):
+    """Cria um backend de tradução pelo nome ('google' ou 'stub')"""
+    try:
+        classe = BACKENDS[nome]
+    except KeyError:
+        raise ValueError(f"Backend de tradução desconhecido: {nome}") from None
+    return classe(origem, destino, **opcoes)
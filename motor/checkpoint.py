@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoint de execuções de tradução.
+Um arquivo JSON ao lado do arquivo de saída registra de onde os dados vieram
+(caminho, mtime e tamanho da origem, colunas e idiomas) e até onde a saída já foi
+gravada com segurança, permitindo retomar a tradução sem reler o que já foi feito.
+"""
+
+import json
+import os
+
+SUFIXO_CHECKPOINT = ".checkpoint.json"
+VERSAO_CHECKPOINT = 1
+
+
+def gravar_json_atomico(caminho, dados):
+    """Grava um JSON de forma atômica: arquivo temporário + fsync + rename"""
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+class CheckpointTraducao:
+    """Checkpoint persistente de uma execução, gravado em <arquivo_saida>.checkpoint.json"""
+
+    def __init__(self, arquivo_saida):
+        """
+        arquivo_saida: arquivo CSV de saída ou, para saída direta em SQLite, um nome-base
+        que identifique o destino (ex.: "<banco>.<tabela>").
+        """
+        self.arquivo_saida = arquivo_saida
+        self.caminho = arquivo_saida + SUFIXO_CHECKPOINT
+
+    @staticmethod
+    def identificar(origem, tipo, colunas, idioma_origem, idioma_destino, tabela=None, verificar_alteracao=True):
+        """
+        Descreve a execução; um checkpoint só é retomado se esta descrição for idêntica.
+        Com verificar_alteracao=False o mtime/tamanho da origem ficam de fora (usado quando
+        a própria origem recebe as traduções, como na saída direta em SQLite).
+        """
+        info = os.stat(origem) if verificar_alteracao else None
+        return {
+            'origem': os.path.abspath(origem),
+            'mtime': info.st_mtime if info else None,
+            'tamanho': info.st_size if info else None,
+            'tipo': tipo,
+            'tabela': tabela,
+            'colunas': list(colunas),
+            'idioma_origem': idioma_origem,
+            'idioma_destino': idioma_destino,
+        }
+
+    def carregar(self):
+        """Retorna o conteúdo do checkpoint ou None se não existir ou estiver ilegível"""
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if dados.get('versao') != VERSAO_CHECKPOINT:
+            return None
+        return dados
+
+    def carregar_compativel(self, identificacao):
+        """
+        Retorna o checkpoint se ele pertencer à mesma execução (mesma origem inalterada,
+        colunas e idiomas) e o arquivo de saída ainda contiver tudo o que foi confirmado.
+        """
+        dados = self.carregar()
+        if dados is None or dados.get('execucao') != identificacao:
+            return None
+        if dados['bytes_saida'] is None:
+            return dados  # Saída em SQLite: a regravação do último lote é idempotente
+        try:
+            if os.path.getsize(self.arquivo_saida) < dados['bytes_saida']:
+                return None
+        except OSError:
+            return None
+        return dados
+
+    def salvar(self, identificacao, posicao, linhas_processadas, bytes_saida):
+        """
+        Registra o último lote confirmado. Deve ser chamado somente depois que o lote
+        estiver gravado em disco no arquivo de saída.
+        """
+        gravar_json_atomico(self.caminho, {
+            'versao': VERSAO_CHECKPOINT,
+            'execucao': identificacao,
+            'posicao': posicao,
+            'linhas_processadas': linhas_processadas,
+            'bytes_saida': bytes_saida,
+        })
+
+    def remover(self):
+        """Remove o checkpoint (execução concluída ou descartada)"""
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
+
+    def preparar_saida(self, dados):
+        """Descarta da saída qualquer gravação parcial posterior ao último lote confirmado"""
+        if dados['bytes_saida'] is None:
+            return
+        with open(self.arquivo_saida, 'r+b') as f:
+            f.truncate(dados['bytes_saida'])
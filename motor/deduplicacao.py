@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deduplicação de valores durante uma execução de tradução.
+Cada texto distinto é traduzido uma única vez; as repetições (muito comuns em
+colunas de baixa cardinalidade como categoria, status ou prioridade) são
+resolvidas por um mapa em memória limitado que atravessa todos os lotes.
+"""
+
+from collections import OrderedDict
+
+MAX_ITENS_PADRAO = 100000  # Máximo de traduções mantidas em memória durante a execução
+
+
+class MapaDeduplicacao:
+    """Mapa LRU limitado {texto: tradução} que só repassa adiante os textos ainda não vistos"""
+
+    def __init__(self, traduzir_unicos, max_itens=MAX_ITENS_PADRAO):
+        """
+        traduzir_unicos: função que recebe uma lista de textos distintos e
+        retorna um dicionário {texto: tradução}; traduções None indicam falha.
+        """
+        self.traduzir_unicos = traduzir_unicos
+        self.max_itens = max_itens
+        self._mapa = OrderedDict()
+        self.valores_recebidos = 0
+        self.valores_repetidos = 0
+        self.valores_enviados = 0
+        self.valores_falhos = 0
+
+    def traduzir(self, textos):
+        """Traduz uma sequência de textos (com repetições) e retorna {texto: tradução} para os distintos"""
+        textos = list(textos)
+        unicos = list(dict.fromkeys(textos))
+        self.valores_recebidos += len(textos)
+
+        resultado = {}
+        faltantes = []
+        for texto in unicos:
+            if texto in self._mapa:
+                self._mapa.move_to_end(texto)
+                resultado[texto] = self._mapa[texto]
+            else:
+                faltantes.append(texto)
+
+        self.valores_repetidos += len(textos) - len(faltantes)
+
+        if faltantes:
+            self.valores_enviados += len(faltantes)
+            novos = self.traduzir_unicos(faltantes)
+            for texto in faltantes:
+                traducao = novos.get(texto)
+                if traducao is None:
+                    # Falhou: manter o original nesta saída, mas tentar de novo se reaparecer
+                    self.valores_falhos += 1
+                    resultado[texto] = texto
+                    continue
+                resultado[texto] = traducao
+                self._memorizar(texto, traducao)
+
+        return resultado
+
+    def _memorizar(self, texto, traducao):
+        """Guarda a tradução e descarta as mais antigas quando o limite é atingido"""
+        self._mapa[texto] = traducao
+        self._mapa.move_to_end(texto)
+        while len(self._mapa) > self.max_itens:
+            self._mapa.popitem(last=False)
+
+    def estatisticas(self):
+        """Retorna os contadores de valores recebidos, repetidos, enviados adiante e sem tradução"""
+        return {
+            'recebidos': self.valores_recebidos,
+            'repetidos': self.valores_repetidos,
+            'enviados': self.valores_enviados,
+            'falhos': self.valores_falhos,
+            'em_memoria': len(self._mapa),
+        }
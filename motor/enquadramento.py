@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Protocolo de enquadramento de lotes.
+Cada texto enviado em uma chamada recebe um marcador numerado ("[3] texto") que
+sobrevive à tradução. A resposta é dividida pelos marcadores, e não por quebras
+de linha, de modo que linhas juntadas ou quebradas pelo tradutor não desalinham
+o lote: apenas os itens cujo marcador sumiu ou se repetiu precisam ser reenviados.
+"""
+
+import re
+
+SEPARADOR = '\n'  # Separador entre os itens enquadrados
+_PADRAO_MARCADOR = re.compile(r"\[\s*(\d+)\s*\]")
+
+
+def marcador(posicao):
+    """Marcador do item na posição informada (1, 2, 3...) incluindo o espaço seguinte"""
+    return f"[{posicao}] "
+
+
+def custo_item(texto, posicao):
+    """Caracteres que o item ocupa no payload: marcador + texto + separador"""
+    return len(marcador(posicao)) + len(texto) + len(SEPARADOR)
+
+
+def pode_enquadrar(texto):
+    """Textos com quebra de linha ou com algo parecido com um marcador precisam seguir sozinhos"""
+    return SEPARADOR not in texto and not _PADRAO_MARCADOR.search(texto)
+
+
+def enquadrar(textos):
+    """Monta o payload de uma chamada com um marcador numerado por texto"""
+    return SEPARADOR.join(f"{marcador(posicao)}{texto}" for posicao, texto in enumerate(textos, 1))
+
+
+def desenquadrar(resposta, quantidade):
+    """
+    Separa a resposta pelos marcadores e retorna uma lista com uma tradução por item.
+    Itens cujo marcador não voltou, voltou repetido ou veio vazio ficam como None.
+    """
+    if not resposta:
+        return [None] * quantidade
+
+    partes = _PADRAO_MARCADOR.split(resposta)
+
+    # Um único item sem marcador na resposta: a resposta inteira é a tradução
+    if quantidade == 1 and len(partes) == 1:
+        texto = resposta.strip()
+        return [texto or None]
+
+    encontrados = {}
+    repetidos = set()
+    for posicao, texto in zip(partes[1::2], partes[2::2]):
+        posicao = int(posicao)
+        if not 1 <= posicao <= quantidade:
+            continue
+        if posicao in encontrados:
+            repetidos.add(posicao)
+        encontrados[posicao] = texto.strip()
+
+    return [
+        None if posicao in repetidos or not encontrados.get(posicao) else encontrados[posicao]
+        for posicao in range(1, quantidade + 1)
+    ]
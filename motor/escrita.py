@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+"""
+Escrita da saída em uma thread dedicada com commit em grupo.
+Os lotes traduzidos entram em uma fila limitada e são gravados por um único
+escritor (CSV ou SQLite); a confirmação em disco (fsync ou COMMIT) acontece conforme
+a política de durabilidade (a cada N linhas, a cada T segundos e sempre no
+encerramento) em vez de a cada lote. Depois de cada confirmação o último marcador
+gravado é repassado a ao_sincronizar, de modo que um checkpoint nunca aponte além
+do que já está em disco.
+"""
+
+import csv
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .sql import citar_identificador
+
+TAMANHO_FILA_PADRAO = 8  # Lotes aguardando gravação antes de bloquear quem produz
+FSYNC_LINHAS_PADRAO = 5000  # fsync a cada N linhas (None = desativado)
+FSYNC_SEGUNDOS_PADRAO = 5.0  # fsync a cada T segundos (None = desativado)
+
+_FIM = object()
+
+
+class EscritorEmThread:
+    """
+    Base dos escritores: fila limitada, thread de escrita e política de confirmação.
+    Subclasses implementam _gravar(linhas), _confirmar() e _encerrar().
+    Com fsync_linhas e fsync_segundos desativados, a confirmação só acontece em fechar().
+    """
+
+    def __init__(self, fsync_linhas=FSYNC_LINHAS_PADRAO, fsync_segundos=FSYNC_SEGUNDOS_PADRAO,
+                 ao_sincronizar=None, tamanho_fila=TAMANHO_FILA_PADRAO, metricas=None):
+        """
+        ao_sincronizar(marcador, bytes_saida): chamado na thread de escrita após cada
+        confirmação com o marcador do último lote gravado e o tamanho da saída em disco
+        (None quando o destino não é um arquivo sequencial).
+        metricas: Metricas opcional (tempos de escrita e confirmação, linhas confirmadas).
+        """
+        self.fsync_linhas = fsync_linhas
+        self.fsync_segundos = fsync_segundos
+        self.ao_sincronizar = ao_sincronizar
+        self.metricas = metricas
+
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._erro = None
+        self._fechado = False
+
+        self.linhas_escritas = 0
+        self.sincronizacoes = 0
+        self.tempo_sincronizando = 0.0
+
+        self._thread = threading.Thread(target=self._executar, name="escritor-saida", daemon=True)
+        self._thread.start()
+
+    def escrever(self, linhas, marcador=None):
+        """
+        Enfileira um lote de linhas (bloqueia se a fila estiver cheia).
+        marcador identifica o lote para o checkpoint e é repassado a ao_sincronizar.
+        """
+        self._verificar_erro()
+        self._fila.put((linhas, marcador))
+
+    def fechar(self):
+        """Grava o que estiver na fila, faz a confirmação final e encerra a thread"""
+        if self._fechado:
+            return
+        self._fechado = True
+        self._fila.put(_FIM)
+        self._thread.join()
+        self._verificar_erro()
+
+    def estatisticas(self):
+        """Retorna linhas gravadas, número de confirmações e tempo total gasto nelas"""
+        return {
+            'linhas': self.linhas_escritas,
+            'sincronizacoes': self.sincronizacoes,
+            'tempo_sincronizando': self.tempo_sincronizando,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _verificar_erro(self):
+        if self._erro is not None:
+            raise self._erro
+
+    def _executar(self):
+        try:
+            self._laco_escrita()
+        finally:
+            self._encerrar()
+
+    def _laco_escrita(self):
+        linhas_pendentes = 0
+        marcador_pendente = None
+        ultimo_sync = time.monotonic()
+
+        while True:
+            # Acordar a tempo de cumprir a política por tempo mesmo sem novos lotes
+            espera = None
+            if linhas_pendentes and self.fsync_segundos is not None:
+                espera = max(0.0, self.fsync_segundos - (time.monotonic() - ultimo_sync))
+
+            try:
+                item = self._fila.get(timeout=espera)
+            except queue.Empty:
+                item = None
+
+            try:
+                if item is _FIM:
+                    if self._erro is None and (linhas_pendentes or marcador_pendente is not None):
+                        self._sincronizar(marcador_pendente, linhas_pendentes)
+                    return
+
+                if item is not None and self._erro is None:
+                    linhas, marcador = item
+                    inicio = time.perf_counter()
+                    self._gravar(linhas)
+                    if self.metricas is not None:
+                        self.metricas.observar('escrita_segundos', time.perf_counter() - inicio)
+                    self.linhas_escritas += len(linhas)
+                    linhas_pendentes += len(linhas)
+                    if marcador is not None:
+                        marcador_pendente = marcador
+
+                if not linhas_pendentes or self._erro is not None:
+                    continue
+
+                por_linhas = self.fsync_linhas is not None and linhas_pendentes >= self.fsync_linhas
+                por_tempo = self.fsync_segundos is not None and time.monotonic() - ultimo_sync >= self.fsync_segundos
+                if por_linhas or por_tempo:
+                    self._sincronizar(marcador_pendente, linhas_pendentes)
+                    linhas_pendentes = 0
+                    marcador_pendente = None
+                    ultimo_sync = time.monotonic()
+            except Exception as e:
+                # Guardar o erro para quem produz; continuar consumindo a fila para não travá-lo
+                self._erro = e
+                if item is _FIM:
+                    return
+
+    def _sincronizar(self, marcador, linhas_pendentes=0):
+        inicio = time.perf_counter()
+        bytes_saida = self._confirmar()
+        duracao = time.perf_counter() - inicio
+        self.tempo_sincronizando += duracao
+        self.sincronizacoes += 1
+        if self.metricas is not None:
+            self.metricas.observar('sincronizacao_segundos', duracao)
+            self.metricas.incrementar('linhas_confirmadas', linhas_pendentes)
+
+        if self.ao_sincronizar is not None and marcador is not None:
+            self.ao_sincronizar(marcador, bytes_saida)
+
+    def _gravar(self, linhas):
+        raise NotImplementedError
+
+    def _confirmar(self):
+        raise NotImplementedError
+
+    def _encerrar(self):
+        pass
+
+
+class EscritorSaida(EscritorEmThread):
+    """Escritor CSV assíncrono sobre um arquivo já aberto em modo texto (newline='')"""
+
+    def __init__(self, arquivo, **opcoes):
+        """
+        arquivo: arquivo de saída aberto pelo chamador, que continua responsável por fechá-lo.
+        opcoes: política de durabilidade e ao_sincronizar (ver EscritorEmThread).
+        """
+        self.arquivo = arquivo
+        self._writer = csv.writer(arquivo)
+        super().__init__(**opcoes)
+
+    def _gravar(self, linhas):
+        self._writer.writerows(linhas)
+
+    def _confirmar(self):
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        return os.fstat(self.arquivo.fileno()).st_size
+
+
+class EscritorSQLite(EscritorEmThread):
+    """
+    Grava os lotes traduzidos direto em um banco SQLite (modo WAL), com executemany
+    dentro de transações dimensionadas pela política de durabilidade.
+
+    Cada linha segue a ordem de `colunas`; `chave` indica quais delas identificam a linha.
+    - modo 'tabela': as linhas vão para uma tabela nova (criada se preciso) com índice
+      único na chave; INSERT OR REPLACE torna a regravação após uma queda idempotente.
+    - modo 'coluna': as colunas traduzidas (por padrão, as terminadas em '_traduzido')
+      são adicionadas à tabela existente e preenchidas com UPDATE ... WHERE chave.
+    """
+
+    def __init__(self, caminho, tabela, colunas, chave=None, modo='tabela', colunas_traduzidas=None, **opcoes):
+        if modo not in ('tabela', 'coluna'):
+            raise ValueError(f"Modo de saída SQLite desconhecido: {modo}")
+        if modo == 'coluna' and not chave:
+            raise ValueError("O modo 'coluna' exige a coluna-chave para localizar as linhas")
+
+        self.caminho = caminho
+        self.tabela = tabela
+        self.colunas = list(colunas)
+        self.chave = list(chave or [])
+        self.modo = modo
+        if colunas_traduzidas is None:
+            colunas_traduzidas = [col for col in self.colunas if str(col).endswith('_traduzido')]
+        self.colunas_traduzidas = list(dict.fromkeys(colunas_traduzidas))
+
+        # Conexão usada somente pela thread de escrita; o esquema é preparado aqui, de forma síncrona
+        self._conn = sqlite3.connect(caminho, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._preparar_esquema()
+        self._em_transacao = False
+        super().__init__(**opcoes)
+
+    def _preparar_esquema(self):
+        tabela = citar_identificador(self.tabela)
+        existentes = [linha[1] for linha in self._conn.execute(f"PRAGMA table_info({tabela})")]
+
+        if self.modo == 'tabela':
+            if not existentes:
+                self._conn.execute(f"CREATE TABLE {tabela} ({', '.join(citar_identificador(col) for col in self.colunas)})")
+            if self.chave:
+                self._conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {citar_identificador('idx_' + self.tabela + '_chave')} "
+                    f"ON {tabela} ({', '.join(citar_identificador(col) for col in self.chave)})"
+                )
+            marcadores = ", ".join("?" * len(self.colunas))
+            verbo = "INSERT OR REPLACE" if self.chave else "INSERT"
+            self._sql = f"{verbo} INTO {tabela} ({', '.join(citar_identificador(col) for col in self.colunas)}) VALUES ({marcadores})"
+            self._posicoes = list(range(len(self.colunas)))
+            return
+
+        if not existentes:
+            raise ValueError(f"Tabela '{self.tabela}' não encontrada em {self.caminho}")
+        for col in self.colunas_traduzidas:
+            if col not in existentes:
+                self._conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {citar_identificador(col)} TEXT")
+
+        # Indexar a chave se ela ainda não for o rowid nem a chave primária
+        chave_primaria = [linha[1] for linha in sorted(
+            (linha for linha in self._conn.execute(f"PRAGMA table_info({tabela})") if linha[5] > 0),
+            key=lambda linha: linha[5]
+        )]
+        if self.chave != ['rowid'] and self.chave != chave_primaria:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {citar_identificador('idx_' + self.tabela + '_chave')} "
+                f"ON {tabela} ({', '.join(citar_identificador(col) for col in self.chave)})"
+            )
+
+        atribuicoes = ", ".join(f"{citar_identificador(col)} = ?" for col in self.colunas_traduzidas)
+        condicao = " AND ".join(f"{citar_identificador(col)} = ?" for col in self.chave)
+        self._sql = f"UPDATE {tabela} SET {atribuicoes} WHERE {condicao}"
+        self._posicoes = [self.colunas.index(col) for col in self.colunas_traduzidas + self.chave]
+
+    def _gravar(self, linhas):
+        if not self._em_transacao:
+            self._conn.execute("BEGIN")
+            self._em_transacao = True
+        posicoes = self._posicoes
+        self._conn.executemany(self._sql, ([linha[i] for i in posicoes] for linha in linhas))
+
+    def _confirmar(self):
+        if self._em_transacao:
+            self._conn.execute("COMMIT")
+            self._em_transacao = False
+        return None
+
+    def _encerrar(self):
+        if self._em_transacao:
+            # Só chega aqui com transação aberta após um erro: descartar o lote incompleto
+            self._conn.execute("ROLLBACK")
+            self._em_transacao = False
+        self._conn.close()
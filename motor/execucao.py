@@ -0,0 +1,557 @@
+# -*- coding: utf-8 -*-
+
+"""
+Execução de uma tradução de dataset (CSV, Excel ou SQLite) sem dependência de interface.
+Lê a origem em lotes, traduz as colunas escolhidas com memória, deduplicação e
+limitador de taxa, grava a saída em thread dedicada e mantém o checkpoint de retomada.
+Mensagens e progresso são entregues por callbacks (ao_log, ao_progresso), o que permite
+usar o mesmo motor na interface desktop, na linha de comando e nos benchmarks.
+"""
+
+import csv
+import sqlite3
+import time
+from contextlib import nullcontext
+
+from .backends import BackendMedido, criar_backend
+from .checkpoint import CheckpointTraducao
+from .deduplicacao import MapaDeduplicacao
+from .escrita import EscritorSaida, EscritorSQLite
+from .filtro import FiltroTraducao, formatar_ignorados
+from .leitura import ler_csv_em_lotes, ler_excel_em_lotes, ler_sqlite_em_lotes, colunas_chave_sqlite
+from .limitador import LimitadorTaxa
+from .lotes import traduzir_em_lotes, FalhaTraducao
+from .memoria import MemoriaTraducao, CAMINHO_MEMORIA_PADRAO
+from .metricas import Metricas, ExportadorMetricas, INTERVALO_EXPORTACAO_PADRAO
+from .perfil import PerfilExecucao
+from .progresso import ProgressoTraducao, INTERVALO_PADRAO
+from .sql import citar_identificador
+
+TIPOS_ORIGEM = ("CSV", "Excel", "SQLite")
+MAX_LOTES_JANELA = 50  # Lotes lidos à frente, no máximo, para montar uma janela de tradução
+FALHAS_MINIMAS = 10  # Valores sem tradução tolerados antes de aplicar limite_falhas
+
+CONFIG_PADRAO = {
+    'idioma_origem': 'en',
+    'idioma_destino': 'pt',
+    'tamanho_lote': 200,  # Linhas lidas por lote (cada lote é empacotado em poucas chamadas à API)
+    'delay_traducao': 0.3,  # Intervalo mínimo entre chamadas, aplicado pelo limitador de taxa
+    'traducoes_simultaneas': 4,  # Chamadas à API em paralelo
+    'backend': 'google',  # 'google' ou 'stub' para testes sem rede
+    'opcoes_backend': {},  # Parâmetros extras do backend (ex.: latencia/taxa_falha do stub)
+    'arquivo_memoria': CAMINHO_MEMORIA_PADRAO,  # Banco da memória de tradução persistente
+    'fsync_linhas': 5000,  # Forçar gravação em disco a cada N linhas (None = só no final)
+    'fsync_segundos': 5.0,  # Forçar gravação em disco a cada T segundos (None = só no final)
+    'modo_saida_sqlite': 'coluna',  # Saída direta em SQLite: 'coluna' ou 'tabela'
+    'arquivo_metricas_json': None,  # Métricas por etapa exportadas periodicamente em JSON (None = desativado)
+    'arquivo_metricas_prometheus': None,  # Idem, no formato do textfile collector do Prometheus
+    'intervalo_metricas': INTERVALO_EXPORTACAO_PADRAO,  # Segundos entre exportações das métricas
+    'perfil': False,  # Perfil de desempenho (cProfile, pilhas para flamegraph e latência por lote)
+    'filtrar_intraduziveis': True,  # Repassar sem chamar a API números, datas, códigos, URLs e e-mails
+    'detectar_idioma': False,  # Também repassar textos já no idioma de destino (requer langdetect)
+    'tentativas_api': 4,  # Tentativas de uma chamada que falhou por rede, cota ou servidor
+    'espera_reenvio': 1.0,  # Espera antes da primeira repetição, dobrada a cada tentativa (s)
+    'limite_falhas': 0.05,  # Fração de valores sem tradução que interrompe a execução (None = nunca)
+}
+
+
+def ler_colunas(caminho, tipo, tabela=None):
+    """Retorna os nomes das colunas da origem, como aparecem na prévia da interface"""
+    import pandas as pd
+
+    if tipo == "CSV":
+        return list(pd.read_csv(caminho, nrows=0).columns)
+    if tipo == "Excel":
+        return list(pd.read_excel(caminho, nrows=0).columns)
+    if tipo == "SQLite":
+        conn = sqlite3.connect(caminho)
+        try:
+            return list(pd.read_sql_query(f"SELECT * FROM {citar_identificador(tabela)} LIMIT 0", conn).columns)
+        finally:
+            conn.close()
+    raise ValueError(f"Tipo de arquivo não suportado: {tipo}")
+
+
+class ExecucaoTraducao:
+    """
+    Uma execução de tradução de ponta a ponta.
+
+    saida_sqlite: None grava em arquivo_saida (CSV); 'coluna' ou 'tabela' grava direto no
+    banco SQLite de origem (ver EscritorSQLite).
+    ao_log(mensagem) e ao_progresso(instantaneo) podem ser chamados a partir das threads que
+    executam a tradução; instantaneo é o dicionário de ProgressoTraducao.instantaneo()
+    (linhas, percentual, linhas/s, chamadas/min, caracteres, ETA), entregue no máximo
+    a cada intervalo_progresso segundos.
+    """
+
+    def __init__(self, caminho, tipo, colunas, config=None, tabela=None, arquivo_saida=None,
+                 saida_sqlite=None, colunas_originais=None, ao_log=None, ao_progresso=None,
+                 intervalo_progresso=INTERVALO_PADRAO):
+        if tipo not in TIPOS_ORIGEM:
+            raise ValueError(f"Tipo de arquivo não suportado: {tipo}")
+        if tipo == "SQLite" and not tabela:
+            raise ValueError("Informe a tabela da origem SQLite")
+        if saida_sqlite and tipo != "SQLite":
+            raise ValueError("A saída direta em SQLite exige uma origem SQLite")
+        if not saida_sqlite and not arquivo_saida:
+            raise ValueError("Informe o arquivo de saída")
+
+        self.caminho = caminho
+        self.tipo = tipo
+        self.colunas = list(colunas)
+        self.config = dict(CONFIG_PADRAO)
+        self.config.update(config or {})
+        self.tabela = tabela
+        self.arquivo_saida = None if saida_sqlite else arquivo_saida
+        self.saida_sqlite = saida_sqlite
+        self.colunas_originais = list(colunas_originais) if colunas_originais else ler_colunas(caminho, tipo, tabela)
+        self._log = ao_log or (lambda mensagem: None)
+        self._ao_progresso = ao_progresso
+        self.intervalo_progresso = intervalo_progresso
+
+        self.ativa = True
+        self.tradutor = None
+        self.progresso = None
+        self.metricas = None
+        self.perfil = None
+        self._inicio_lote = None
+        self.exportador_metricas = None
+        self.memoria = None
+        self.deduplicador = None
+        self.filtro = None
+        self.limitador = None
+        self.escritor = None
+        self.arquivo_escrita = None
+        self.checkpoint = None
+
+    def parar(self):
+        """Pede a interrupção: o lote em andamento não é gravado e o checkpoint fica no último confirmado"""
+        self.ativa = False
+
+    def tabela_saida_sqlite(self):
+        """Tabela que recebe as traduções na saída direta em SQLite"""
+        if self.saida_sqlite == 'tabela':
+            return f"{self.tabela}_traduzida"
+        return self.tabela
+
+    def base_checkpoint(self):
+        """Nome-base do checkpoint: o CSV de saída ou o banco + tabela de destino"""
+        if self.saida_sqlite:
+            return f"{self.caminho}.{self.tabela_saida_sqlite()}"
+        return self.arquivo_saida
+
+    def identificar(self):
+        """Descreve a execução para validar checkpoints (origem, colunas e idiomas)"""
+        return CheckpointTraducao.identificar(
+            self.caminho, self.tipo, self.colunas,
+            self.config['idioma_origem'], self.config['idioma_destino'],
+            tabela=self.tabela if self.tipo == "SQLite" else None,
+            verificar_alteracao=not self.saida_sqlite  # Na saída direta o próprio banco de origem muda
+        )
+
+    def procurar_retomada(self):
+        """Retorna o checkpoint de uma execução idêntica interrompida, ou None"""
+        return CheckpointTraducao(self.base_checkpoint()).carregar_compativel(self.identificar())
+
+    def executar(self, retomada=None):
+        """
+        Executa a tradução (retomando do checkpoint `retomada`, se informado).
+        Retorna True se a origem foi percorrida até o fim e False se parar() foi chamado.
+        Erros são propagados depois que a saída pendente foi gravada.
+        """
+        try:
+            idioma_origem = self.config['idioma_origem']
+            idioma_destino = self.config['idioma_destino']
+            # Métricas por etapa, exportadas periodicamente se houver arquivo configurado
+            self.metricas = Metricas()
+            self.exportador_metricas = ExportadorMetricas(
+                self.metricas,
+                arquivo_json=self.config['arquivo_metricas_json'],
+                arquivo_prometheus=self.config['arquivo_metricas_prometheus'],
+                intervalo=self.config['intervalo_metricas'],
+                ao_erro=lambda e: self._log(f"AVISO: falha ao exportar métricas: {e}")
+            ).iniciar()
+
+            # Toda chamada ao backend passa pelo progresso (chamadas/min e caracteres enviados)
+            self.progresso = ProgressoTraducao(
+                linhas_iniciais=retomada['linhas_processadas'] if retomada else 0,
+                ao_atualizar=self._ao_progresso,
+                intervalo=self.intervalo_progresso
+            )
+            backend = criar_backend(self.config['backend'], idioma_origem, idioma_destino, **self.config['opcoes_backend'])
+            self.tradutor = BackendMedido(backend, self.progresso.registrar_chamada, self.metricas)
+
+            # Memória de tradução compartilhada com config/tradutor.py
+            self.memoria = MemoriaTraducao(self.config['arquivo_memoria'])
+
+            # Valores que dispensam tradução nunca chegam à memória nem à API
+            if self.config['filtrar_intraduziveis']:
+                self.filtro = FiltroTraducao(idioma_destino, self.config['detectar_idioma'], ao_log=self._log)
+
+            # Deduplicar valores repetidos ao longo de toda a execução
+            self.deduplicador = MapaDeduplicacao(self._traduzir_unicos)
+            self._log(f"Chamadas simultâneas à API: {self.config['traducoes_simultaneas']}")
+
+            # O delay é o intervalo mínimo entre chamadas, aplicado por um token bucket (delay <= 0: sem limite)
+            if self.config['delay_traducao'] and self.config['delay_traducao'] > 0:
+                self.limitador = LimitadorTaxa(60.0 / self.config['delay_traducao'], rajada=self.config['traducoes_simultaneas'],
+                                               metricas=self.metricas)
+                self._log(f"Limite de taxa: {self.limitador.chamadas_por_minuto:.0f} chamadas/min")
+            else:
+                self._log("Limite de taxa: desativado (delay 0)")
+
+            # Checkpoint ao lado da saída, atualizado a cada confirmação em disco
+            self.checkpoint = CheckpointTraducao(self.base_checkpoint())
+            self.identificacao = self.identificar()
+            if retomada:
+                # Descartar linhas gravadas depois do último lote confirmado
+                self.checkpoint.preparar_saida(retomada)
+            self._abrir_escritor(retomada)
+
+            if not self.ativa:
+                return False
+
+            # Perfil opcional: arquivos <saída>.perfil.pstats/.folded/.txt ao fim dos lotes
+            if self.config['perfil']:
+                self.perfil = PerfilExecucao(f"{self.base_checkpoint()}.perfil", ao_log=self._log)
+            with self.perfil or nullcontext():
+                if self.tipo == "CSV":
+                    concluida = self._traduzir_csv_lotes(retomada)
+                elif self.tipo == "Excel":
+                    concluida = self._traduzir_excel_lotes(retomada)
+                else:
+                    concluida = self._traduzir_sqlite_lotes(retomada)
+
+            # Garantir que tudo esteja em disco antes de descartar o checkpoint
+            self._fechar_escritor()
+            self.progresso.concluir()
+
+            # Execução completa: o checkpoint não é mais necessário
+            if concluida:
+                self.checkpoint.remover()
+            return concluida
+        finally:
+            # Em parada ou erro, gravar o que já foi traduzido e avançar o checkpoint até ali
+            try:
+                self._fechar_escritor()
+            finally:
+                self._encerrar()
+
+    def _encerrar(self):
+        """Registra as estatísticas da execução e libera memória, deduplicação e limitador"""
+        if self.exportador_metricas is not None:
+            self.exportador_metricas.parar()
+            self.exportador_metricas = None
+
+        if self.deduplicador is not None:
+            stats = self.deduplicador.estatisticas()
+            self._log(
+                f"Deduplicação: {stats['recebidos']} valores, {stats['repetidos']} repetidos, "
+                f"{stats['enviados']} distintos traduzidos"
+            )
+            if stats['falhos']:
+                self._log(f"AVISO: {stats['falhos']} valores não puderam ser traduzidos e foram mantidos no original")
+            self.deduplicador = None
+
+        if self.filtro is not None:
+            self._log(f"Filtro: {formatar_ignorados(self.filtro.estatisticas())}")
+            self.filtro = None
+
+        if self.limitador is not None:
+            stats = self.limitador.estatisticas()
+            self._log(f"Limitador: {stats['chamadas']} chamadas, {stats['tempo_espera_total']:.1f}s aguardando cota")
+            self.limitador = None
+
+        if self.memoria is not None:
+            stats = self.memoria.estatisticas()
+            self._log(
+                f"Memória de tradução: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['taxa_acerto']:.1f}% reaproveitado)"
+            )
+            self.memoria.fechar()
+            self.memoria = None
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def _registrar_checkpoint(self, marcador, bytes_saida):
+        """Registra o último lote já gravado em disco para permitir retomar a tradução"""
+        posicao, linhas_processadas = marcador
+        self.checkpoint.salvar(self.identificacao, posicao, linhas_processadas, bytes_saida)
+
+    def _abrir_escritor(self, retomada=None):
+        """Abre a saída uma única vez e inicia a thread de escrita"""
+        self.colunas_saida = []
+        for col in self.colunas_originais:
+            self.colunas_saida.append(col)
+            if col in self.colunas:
+                self.colunas_saida.append(f"{col}_traduzido")
+        self.colunas_saida = list(dict.fromkeys(self.colunas_saida))  # A origem pode já ter <col>_traduzido
+
+        if self.saida_sqlite:
+            self._abrir_escritor_sqlite()
+            return
+
+        self.arquivo_escrita = open(self.arquivo_saida, 'a' if retomada else 'w', newline='', encoding='utf-8')
+        if not retomada:
+            csv.writer(self.arquivo_escrita).writerow(self.colunas_saida)
+            self._log(f"Arquivo de saída criado: {self.arquivo_saida}")
+
+        # O checkpoint só avança depois de cada fsync, nunca à frente do que está em disco
+        self.escritor = EscritorSaida(
+            self.arquivo_escrita,
+            fsync_linhas=self.config['fsync_linhas'],
+            fsync_segundos=self.config['fsync_segundos'],
+            ao_sincronizar=self._registrar_checkpoint,
+            metricas=self.metricas
+        )
+
+    def _abrir_escritor_sqlite(self):
+        """Inicia a escrita direta no banco de origem (transações do tamanho de fsync_linhas)"""
+        conn = sqlite3.connect(self.caminho)
+        try:
+            chave = colunas_chave_sqlite(conn, self.tabela)
+        finally:
+            conn.close()
+
+        # As linhas levam a chave da origem para que cada tradução volte à mesma linha
+        self.colunas_saida = [col for col in chave if col not in self.colunas_saida] + self.colunas_saida
+        colunas_destino = list(self.colunas_saida)
+        if self.saida_sqlite == 'tabela':
+            # Em uma tabela nova o rowid da origem vira uma coluna comum
+            colunas_destino = ['rowid_origem' if col == 'rowid' else col for col in colunas_destino]
+            chave = ['rowid_origem' if col == 'rowid' else col for col in chave]
+
+        self.arquivo_escrita = None
+        self.escritor = EscritorSQLite(
+            self.caminho, self.tabela_saida_sqlite(), colunas_destino, chave,
+            modo=self.saida_sqlite,
+            fsync_linhas=self.config['fsync_linhas'],
+            fsync_segundos=self.config['fsync_segundos'],
+            ao_sincronizar=self._registrar_checkpoint,
+            metricas=self.metricas
+        )
+        self._log(f"Gravando traduções em {self.tabela_saida_sqlite()} (modo {self.saida_sqlite})")
+
+    def _fechar_escritor(self):
+        """Grava os lotes pendentes, faz a confirmação final e fecha a saída"""
+        if self.escritor is None:
+            return
+        escritor = self.escritor
+        self.escritor = None
+        try:
+            escritor.fechar()
+        finally:
+            if self.arquivo_escrita is not None:
+                self.arquivo_escrita.close()
+                self.arquivo_escrita = None
+
+        stats = escritor.estatisticas()
+        self._log(
+            f"Escrita: {stats['linhas']} linhas, {stats['sincronizacoes']} fsyncs "
+            f"({stats['tempo_sincronizando']:.1f}s em disco)"
+        )
+
+    def _salvar_lote(self, df_lote, marcador=None):
+        """Envia um lote traduzido ao escritor (original seguida da traduzida, na ordem da saída)"""
+        linhas = list(df_lote[self.colunas_saida].itertuples(index=False, name=None))
+        self.escritor.escrever(linhas, marcador)
+
+    # ------------------------------------------------------------------
+    # Tradução
+    # ------------------------------------------------------------------
+
+    def _concluir_lote(self, linhas, percentual=None):
+        """Registra um lote concluído no progresso, nas métricas e no perfil"""
+        agora = time.perf_counter()
+        duracao = agora - self._inicio_lote
+        self._inicio_lote = agora
+        self.metricas.observar('lote_segundos', duracao)
+        if self.perfil is not None:
+            self.perfil.registrar_lote(duracao)
+        self.progresso.avancar(linhas, percentual)
+
+    def _traduzir_em_janelas(self, lotes):
+        """
+        Agrupa lotes lidos em sequência até somarem texto suficiente para ocupar todas as
+        chamadas simultâneas, traduz os valores distintos da janela de uma vez (os pacotes
+        seguem em paralelo pelo pool) e devolve os itens dos lotes, já traduzidos, na ordem
+        de leitura. Cada lote continua sendo gravado e confirmado no checkpoint sozinho.
+        """
+        alvo = self.tradutor.max_payload * max(1, self.config['traducoes_simultaneas'])
+        janela = []
+        caracteres = 0
+        for item in lotes:
+            df_lote = item[0]
+            if self.tipo == "CSV":
+                df_lote.columns = self.colunas_originais
+            textos_por_coluna = self._textos_lote(df_lote)
+            janela.append((item, textos_por_coluna))
+            caracteres += sum(len(texto) for textos in textos_por_coluna.values() for texto in textos.unique())
+            if caracteres >= alvo or len(janela) >= MAX_LOTES_JANELA:
+                yield from self._traduzir_janela(janela)
+                janela = []
+                caracteres = 0
+
+        if janela:
+            yield from self._traduzir_janela(janela)
+
+    def _traduzir_janela(self, janela):
+        """Traduz os lotes de uma janela enviando cada valor distinto uma única vez"""
+        # Depois de um pedido de parada os lotes voltam sem tradução; o laço os descarta
+        if self.ativa:
+            # Todas as ocorrências vão ao mapa, que envia cada valor uma vez e conta as repetições
+            todos_textos = [texto for _, textos_por_coluna in janela
+                            for textos in textos_por_coluna.values() for texto in textos]
+            mapa = self.deduplicador.traduzir(todos_textos)
+            self._verificar_falhas()
+            for item, textos_por_coluna in janela:
+                self._aplicar_traducoes(item[0], textos_por_coluna, mapa)
+
+        for item, _ in janela:
+            yield item
+
+    def _verificar_falhas(self):
+        """
+        Interrompe a execução se valores demais ficaram sem tradução: os lotes da janela
+        não são gravados e o checkpoint fica no último lote confirmado, para que uma
+        nova execução os traduza em vez de gravá-los no original.
+        """
+        limite = self.config['limite_falhas']
+        stats = self.deduplicador.estatisticas()
+        if limite is None or stats['falhos'] < FALHAS_MINIMAS:
+            return
+        if stats['falhos'] > limite * stats['enviados']:
+            raise FalhaTraducao(
+                f"{stats['falhos']} de {stats['enviados']} valores não puderam ser traduzidos "
+                f"(limite de {limite:.0%}); execute novamente para retomar do último lote confirmado"
+            )
+
+    def _textos_lote(self, df_lote):
+        """Valores não nulos (como texto) de cada coluna a traduzir do lote"""
+        self.metricas.incrementar('linhas_lidas', len(df_lote))
+        return {col: df_lote[col].dropna().astype(str) for col in self.colunas if col in df_lote.columns}
+
+    def _aplicar_traducoes(self, df_lote, textos_por_coluna, mapa):
+        """Mapeia as traduções de volta de forma vetorizada (nulos permanecem como estão)"""
+        for col, textos in textos_por_coluna.items():
+            df_lote[f"{col}_traduzido"] = df_lote[col].astype(object)
+            if not textos.empty:
+                df_lote.loc[textos.index, f"{col}_traduzido"] = textos.map(mapa)
+
+    def _traduzir_unicos(self, textos):
+        """Traduz textos distintos consultando antes o filtro e a memória de tradução"""
+        origem = self.config['idioma_origem']
+        destino = self.config['idioma_destino']
+
+        if self.filtro is not None:
+            textos, ignorados = self.filtro.separar(textos)
+        else:
+            # Sem filtro, só os valores em branco são repassados (nunca contam como falha)
+            ignorados = [texto for texto in textos if not texto.strip()]
+            textos = [texto for texto in textos if texto.strip()]
+        self.metricas.incrementar('valores_ignorados', len(ignorados))
+
+        traducoes = self.memoria.obter_muitos(origem, destino, textos)
+        pendentes = [texto for texto in textos if texto not in traducoes]
+        self.metricas.incrementar('memoria_hits', len(traducoes))
+        self.metricas.incrementar('memoria_misses', len(textos) - len(traducoes))
+
+        # Empacotar os pendentes em poucas chamadas e memorizar cada pacote assim que concluído
+        traduzidos = traduzir_em_lotes(
+            pendentes, self.tradutor,
+            ao_traduzir_pacote=lambda itens, resultado: self.memoria.salvar_muitos(
+                origem, destino, zip(itens, resultado)
+            ),
+            max_workers=self.config['traducoes_simultaneas'],
+            max_chars=self.tradutor.max_payload,
+            fabrica_tradutor=self.tradutor.para_thread,
+            limitador=self.limitador,
+            metricas=self.metricas,
+            tentativas_api=self.config['tentativas_api'],
+            espera_inicial=self.config['espera_reenvio']
+        )
+        traducoes.update(zip(pendentes, traduzidos))
+        traducoes.update((texto, texto) for texto in ignorados)
+        return traducoes
+
+    def _traduzir_csv_lotes(self, retomada=None):
+        """Traduz CSV em lotes lendo o arquivo em uma única passada"""
+        linhas_processadas = retomada['linhas_processadas'] if retomada else 0
+        posicao_inicial = retomada['posicao'] if retomada else None
+
+        # Um único leitor sequencial (retomada com seek direto)
+        self._inicio_lote = time.perf_counter()
+        lotes = ler_csv_em_lotes(self.caminho, self.config['tamanho_lote'], posicao_inicial=posicao_inicial)
+        lotes = self._traduzir_em_janelas(self.metricas.medir_iteracao(lotes, 'leitura_segundos'))
+        for df_lote, bytes_lidos, bytes_total in lotes:
+            # Não gravar lotes depois de um pedido de parada
+            if not self.ativa:
+                self._log("Tradução interrompida pelo usuário")
+                return False
+
+            # O checkpoint guarda a posição exata em bytes na origem
+            self._salvar_lote(df_lote, (bytes_lidos, linhas_processadas + len(df_lote)))
+
+            # Progresso pela posição no arquivo, sem contagem prévia de linhas
+            progresso = min(100, bytes_lidos / bytes_total * 100) if bytes_total else 100
+            self._concluir_lote(len(df_lote), progresso)
+            self._log(f"Lote processado e salvo: linhas {linhas_processadas + 1}-{linhas_processadas + len(df_lote)} ({progresso:.1f}% do arquivo)")
+            linhas_processadas += len(df_lote)
+
+        return True
+
+    def _traduzir_excel_lotes(self, retomada=None):
+        """Traduz Excel em lotes com leitura sequencial"""
+        linhas_processadas = retomada['posicao'] if retomada else 0
+
+        # Uma única passada por iter_rows (retomada pela linha da planilha)
+        self._inicio_lote = time.perf_counter()
+        lotes = ler_excel_em_lotes(self.caminho, self.config['tamanho_lote'], self.colunas_originais, linhas_processadas)
+        lotes = self._traduzir_em_janelas(self.metricas.medir_iteracao(lotes, 'leitura_segundos'))
+        for df_lote, linhas_lidas, total_linhas in lotes:
+            if not self.ativa:
+                self._log("Tradução interrompida pelo usuário")
+                return False
+
+            # O checkpoint guarda a linha da planilha
+            self._salvar_lote(df_lote, (linhas_lidas, linhas_lidas))
+            linhas_processadas = linhas_lidas
+
+            if total_linhas and self.progresso.total is None:
+                self.progresso.definir_total(total_linhas)
+            self._concluir_lote(len(df_lote))
+            self._log(f"Lote processado e salvo: {linhas_processadas - len(df_lote) + 1}-{linhas_processadas} de {total_linhas or '?'} linhas")
+
+        return True
+
+    def _traduzir_sqlite_lotes(self, retomada=None):
+        """Traduz SQLite em lotes paginando pela chave (rowid ou chave primária), sem OFFSET"""
+        conn = sqlite3.connect(self.caminho)
+        try:
+            total_linhas = conn.execute(f"SELECT COUNT(*) FROM {citar_identificador(self.tabela)}").fetchone()[0]
+            self.progresso.definir_total(total_linhas)
+
+            linhas_processadas = retomada['linhas_processadas'] if retomada else 0
+            chave_inicial = tuple(retomada['posicao']) if retomada else None
+
+            self._inicio_lote = time.perf_counter()
+            lotes = ler_sqlite_em_lotes(conn, self.tabela, self.config['tamanho_lote'], chave_inicial,
+                                        incluir_chave=bool(self.saida_sqlite))
+            lotes = self._traduzir_em_janelas(self.metricas.medir_iteracao(lotes, 'leitura_segundos'))
+            for df_lote, ultima_chave in lotes:
+                if not self.ativa:
+                    self._log("Tradução interrompida pelo usuário")
+                    return False
+
+                # O checkpoint guarda a chave da última linha
+                linhas_processadas += len(df_lote)
+                self._salvar_lote(df_lote, (list(ultima_chave), linhas_processadas))
+
+                self._concluir_lote(len(df_lote))
+                self._log(f"Lote processado e salvo: {linhas_processadas - len(df_lote) + 1}-{linhas_processadas} de {total_linhas} linhas")
+
+            return True
+        finally:
+            conn.close()
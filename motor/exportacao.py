@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exportação em fluxo do CSV traduzido para outros formatos.
+O CSV é lido em lotes e gravado incrementalmente, com memória constante
+independentemente do tamanho do resultado.
+"""
+
+import csv
+import math
+
+from .leitura import ler_csv_em_lotes
+
+LIMITE_LINHAS_EXCEL = 1048576  # Linhas por planilha no formato .xlsx (incluindo o cabeçalho)
+TAMANHO_LOTE_EXPORTACAO = 10000
+
+
+def _valor_celula(valor, caracteres_ilegais):
+    """Converte um valor do pandas em algo que o openpyxl grave sem erro"""
+    if valor is None:
+        return None
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if isinstance(valor, str):
+        # Caracteres de controle tornam o XML da planilha inválido
+        return caracteres_ilegais.sub("", valor)
+    return valor
+
+
+def exportar_csv_para_xlsx(caminho_csv, caminho_xlsx, tamanho_lote=TAMANHO_LOTE_EXPORTACAO,
+                           limite_linhas=LIMITE_LINHAS_EXCEL, ao_progresso=None, encoding='utf-8'):
+    """
+    Converte um CSV em .xlsx usando o modo write-only do openpyxl, lote a lote.
+    Ao atingir limite_linhas, as linhas seguintes continuam em uma nova planilha
+    (Resultado, Resultado_2, ...) com o mesmo cabeçalho.
+    ao_progresso(percentual): chamado após cada lote com o percentual de bytes lidos.
+    Retorna (linhas_exportadas, planilhas).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    linhas_por_planilha = limite_linhas - 1  # -1 para o cabeçalho
+    wb = Workbook(write_only=True)
+    ws = None
+    planilhas = 0
+    linhas_na_planilha = 0
+    linhas_exportadas = 0
+    cabecalho = None
+
+    for df_lote, posicao, bytes_total in ler_csv_em_lotes(caminho_csv, tamanho_lote, encoding=encoding):
+        if cabecalho is None:
+            cabecalho = [str(col) for col in df_lote.columns]
+
+        for linha in df_lote.itertuples(index=False, name=None):
+            if ws is None or linhas_na_planilha >= linhas_por_planilha:
+                planilhas += 1
+                ws = wb.create_sheet("Resultado" if planilhas == 1 else f"Resultado_{planilhas}")
+                ws.append(cabecalho)
+                linhas_na_planilha = 0
+            ws.append([_valor_celula(valor, ILLEGAL_CHARACTERS_RE) for valor in linha])
+            linhas_na_planilha += 1
+
+        linhas_exportadas += len(df_lote)
+        if ao_progresso is not None and bytes_total:
+            ao_progresso(min(posicao / bytes_total * 100, 100.0))
+
+    if ws is None:
+        # CSV sem linhas de dados: manter ao menos uma planilha válida
+        planilhas = 1
+        ws = wb.create_sheet("Resultado")
+        with open(caminho_csv, 'r', newline='', encoding=encoding) as f:
+            cabecalho = next(csv.reader(f), None)
+        if cabecalho:
+            ws.append(cabecalho)
+
+    wb.save(caminho_xlsx)
+    return linhas_exportadas, planilhas
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+Filtro de valores que não precisam de tradução.
+Números, preços, datas, códigos (SKU-1234), URLs e e-mails são repassados sem
+chamar a API; com detectar_idioma, textos que já estão no idioma de destino
+também (requer a biblioteca opcional langdetect).
+"""
+
+import re
+import threading
+from collections import Counter
+
+MIN_LETRAS_IDIOMA = 20  # Textos mais curtos não têm letras suficientes para detectar o idioma
+CONFIANCA_IDIOMA = 0.95  # Probabilidade mínima para considerar o texto já no idioma de destino
+
+_PADRAO_MOEDA = re.compile(r"(?:R|US|A|C|NZ|HK)\$", re.IGNORECASE)
+_PADRAO_DATA = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?$"
+)
+_PADRAO_URL = re.compile(
+    r"^(?:(?:https?|ftp)://|www\.)\S+$"
+    r"|^(?:[a-z0-9-]+\.)+(?:com|net|org|edu|gov|io|br|pt|es|fr|de|it|uk|co|info|biz)(?:[/?#]\S*)?$",
+    re.IGNORECASE
+)
+_PADRAO_EMAIL = re.compile(r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$")
+_PADRAO_CODIGO = re.compile(r"^[A-Za-z0-9_\-./#:]+$")
+
+
+def motivo_sem_traducao(texto):
+    """
+    Retorna por que o texto dispensa tradução ('vazio', 'numero', 'simbolos', 'data',
+    'url', 'email' ou 'codigo'), ou None se ele deve ir para a API.
+    """
+    texto = texto.strip()
+    if not texto:
+        return 'vazio'
+
+    # Sem letras (fora símbolos de moeda): números, preços, datas numéricas, pontuação
+    if not any(caractere.isalpha() for caractere in _PADRAO_MOEDA.sub("", texto)):
+        return 'numero' if any(caractere.isdigit() for caractere in texto) else 'simbolos'
+
+    if _PADRAO_DATA.match(texto):
+        return 'data'
+    if _PADRAO_EMAIL.match(texto):
+        return 'email'
+    if _PADRAO_URL.match(texto):
+        return 'url'
+
+    # Um único token misturando letras com dígitos ou sublinhados: SKU-1234, AB12CD, id_produto
+    if _PADRAO_CODIGO.match(texto) and any(caractere.isdigit() or caractere == '_' for caractere in texto):
+        return 'codigo'
+
+    return None
+
+
+class FiltroTraducao:
+    """
+    Separa os textos que precisam de tradução dos que podem ser repassados sem mudança,
+    contando os ignorados por motivo (seguro entre threads).
+    detectar_idioma: também ignora textos já no idioma_destino (via langdetect, se instalada;
+    sem ela, a detecção é desativada com um aviso em ao_log).
+    """
+
+    def __init__(self, idioma_destino=None, detectar_idioma=False, ao_log=None):
+        self.idioma_destino = (idioma_destino or '').split('-')[0].lower()
+        self._detectar = None
+        self._lock = threading.Lock()
+        self.analisados = 0
+        self.ignorados = Counter()
+
+        if detectar_idioma and self.idioma_destino:
+            try:
+                from langdetect import DetectorFactory, detect_langs
+            except ImportError:
+                if ao_log is not None:
+                    ao_log("AVISO: detecção de idioma desativada (instale com: pip install langdetect)")
+            else:
+                DetectorFactory.seed = 0  # Resultados determinísticos
+                self._detectar = detect_langs
+
+    def classificar(self, texto):
+        """Motivo para não traduzir o texto, ou None se ele deve ir para a API"""
+        motivo = motivo_sem_traducao(texto)
+        if motivo is None and self._detectar is not None and self._no_idioma_destino(texto):
+            motivo = 'idioma_destino'
+        return motivo
+
+    def separar(self, textos):
+        """Retorna (a_traduzir, ignorados) preservando a ordem dos textos"""
+        a_traduzir = []
+        ignorados = []
+        motivos = Counter()
+        for texto in textos:
+            motivo = self.classificar(texto)
+            if motivo is None:
+                a_traduzir.append(texto)
+            else:
+                ignorados.append(texto)
+                motivos[motivo] += 1
+
+        with self._lock:
+            self.analisados += len(a_traduzir) + len(ignorados)
+            self.ignorados.update(motivos)
+        return a_traduzir, ignorados
+
+    def estatisticas(self):
+        """Valores analisados e ignorados (total e por motivo)"""
+        with self._lock:
+            return {
+                'analisados': self.analisados,
+                'ignorados': sum(self.ignorados.values()),
+                'por_motivo': dict(self.ignorados),
+            }
+
+    def _no_idioma_destino(self, texto):
+        if sum(caractere.isalpha() for caractere in texto) < MIN_LETRAS_IDIOMA:
+            return False
+        try:
+            candidatos = self._detectar(texto)
+        except Exception:
+            return False
+        melhor = candidatos[0] if candidatos else None
+        return (melhor is not None and melhor.prob >= CONFIANCA_IDIOMA
+                and melhor.lang.split('-')[0].lower() == self.idioma_destino)
+
+
+def formatar_ignorados(estatisticas):
+    """Resumo de uma linha dos valores ignorados pelo filtro"""
+    detalhes = ", ".join(f"{quantidade} {motivo}" for motivo, quantidade in
+                         sorted(estatisticas['por_motivo'].items(), key=lambda item: -item[1]))
+    resumo = f"{estatisticas['ignorados']} de {estatisticas['analisados']} valores não precisavam de tradução"
+    return f"{resumo} ({detalhes})" if detalhes else resumo
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+Leitura em fluxo dos datasets de entrada.
+O arquivo é aberto uma única vez e os lotes saem de um iterador, com custo
+constante por lote independentemente da posição no arquivo.
+"""
+
+import io
+import os
+
+from .sql import citar_identificador
+
+
+def _registros_csv(arquivo, delimitador=b','):
+    """
+    Percorre um CSV aberto em modo binário produzindo (bytes_do_registro, posicao_final).
+    Um registro só continua na linha seguinte se ela terminar dentro de um campo entre
+    aspas, o que mantém inteiros os campos com quebras de linha e dá a posição exata de
+    cada fronteira. Como no parser do pandas, aspas só abrem um campo no início dele:
+    uma aspa solta no meio de um campo sem aspas (ex.: 32") não altera as fronteiras.
+    """
+    posicao = arquivo.tell()
+    partes = []
+    dentro_aspas = False
+    for linha in arquivo:
+        posicao += len(linha)
+        partes.append(linha)
+        if dentro_aspas or b'"' in linha:
+            dentro_aspas = _termina_entre_aspas(linha, dentro_aspas, delimitador)
+        if not dentro_aspas:
+            yield b"".join(partes), posicao
+            partes = []
+    if partes:
+        yield b"".join(partes), posicao
+
+
+def _termina_entre_aspas(linha, dentro_aspas, delimitador):
+    """Indica se a linha termina dentro de um campo entre aspas (dentro_aspas: estado no início dela)"""
+    i = 0
+    inicio_campo = True
+    while i < len(linha):
+        if dentro_aspas:
+            fim = linha.find(b'"', i)
+            if fim < 0:
+                return True
+            if linha[fim + 1:fim + 2] == b'"':
+                i = fim + 2  # Aspas duplicadas: aspa literal dentro do campo
+                continue
+            dentro_aspas = False
+            inicio_campo = False
+            i = fim + 1
+        elif linha[i:i + 1] == b'"' and inicio_campo:
+            dentro_aspas = True
+            i += 1
+        elif linha[i:i + 1] == delimitador:
+            inicio_campo = True
+            i += 1
+        else:
+            # Campo sem aspas (ou resto após o fecho): aspas aqui são literais até o próximo delimitador
+            inicio_campo = False
+            i = linha.find(delimitador, i)
+            if i < 0:
+                return False
+    return dentro_aspas
+
+
+def ler_csv_em_lotes(caminho, tamanho_lote, encoding='utf-8', posicao_inicial=None):
+    """
+    Lê um CSV em uma única passada e produz tuplas (df_lote, posicao, bytes_total).
+    posicao é o byte exato em que o lote termina; passada como posicao_inicial, a
+    leitura recomeça logo após esse lote com um seek, sem reler o início do arquivo.
+    Campos entre aspas com quebras de linha são tratados pelo parser do pandas.
+    """
+    import pandas as pd
+
+    bytes_total = os.path.getsize(caminho)
+
+    with open(caminho, 'rb') as arquivo:
+        registros = _registros_csv(arquivo)
+        cabecalho, _ = next(registros, (b"", 0))
+        if not cabecalho:
+            return
+
+        if posicao_inicial is not None and posicao_inicial > arquivo.tell():
+            arquivo.seek(posicao_inicial)
+            registros = _registros_csv(arquivo)
+
+        dados_lote = []
+        posicao = arquivo.tell()
+        for registro, posicao in registros:
+            dados_lote.append(registro)
+            if len(dados_lote) >= tamanho_lote:
+                yield _csv_para_dataframe(pd, cabecalho, dados_lote, encoding), posicao, bytes_total
+                dados_lote = []
+
+        if dados_lote:
+            yield _csv_para_dataframe(pd, cabecalho, dados_lote, encoding), posicao, bytes_total
+
+
+def _csv_para_dataframe(pd, cabecalho, registros, encoding):
+    """Monta o DataFrame de um lote com o parser do pandas (mesma inferência de tipos por lote)"""
+    if not cabecalho.endswith(b"\n"):
+        cabecalho += b"\n"
+    return pd.read_csv(io.BytesIO(cabecalho + b"".join(registros)), encoding=encoding)
+
+
+def ler_excel_em_lotes(caminho, tamanho_lote, colunas=None, linhas_ignoradas=0):
+    """
+    Lê a planilha ativa de um arquivo Excel em uma única passada sequencial (iter_rows)
+    e produz tuplas (df_lote, linhas_lidas, total_linhas). linhas_lidas conta as linhas
+    de dados percorridas na planilha (incluindo as vazias, que são ignoradas) e pode ser
+    passada como linhas_ignoradas para retomar logo após o lote. total_linhas pode ser
+    None quando a planilha não informa suas dimensões.
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        total_linhas = ws.max_row - 1 if ws.max_row else None  # -1 para header
+
+        cabecalho = next(ws.iter_rows(max_row=1, values_only=True), None)
+        if cabecalho is None:
+            return
+        if colunas is None:
+            colunas = list(cabecalho)
+        largura = len(colunas)
+
+        # O modo read_only ainda percorre o XML das linhas puladas, mas sem montar DataFrames
+        linhas = ws.iter_rows(min_row=2 + linhas_ignoradas, values_only=True)
+        linhas_lidas = linhas_ignoradas
+        dados_lote = []
+        for linha in linhas:
+            linhas_lidas += 1
+            # Ignorar linhas totalmente vazias e ajustar a largura ao cabeçalho
+            if all(valor is None for valor in linha):
+                continue
+            dados_lote.append((tuple(linha) + (None,) * largura)[:largura])
+
+            if len(dados_lote) >= tamanho_lote:
+                yield pd.DataFrame(dados_lote, columns=colunas), linhas_lidas, total_linhas
+                dados_lote = []
+
+        if dados_lote:
+            yield pd.DataFrame(dados_lote, columns=colunas), linhas_lidas, total_linhas
+    finally:
+        wb.close()
+
+
+def colunas_chave_sqlite(conn, tabela):
+    """
+    Retorna as colunas usadas na paginação por chave: ['rowid'] para tabelas comuns
+    ou as colunas da chave primária para tabelas WITHOUT ROWID.
+    """
+    import sqlite3
+
+    try:
+        conn.execute(f"SELECT rowid FROM {citar_identificador(tabela)} LIMIT 1")
+        return ['rowid']
+    except sqlite3.OperationalError:
+        info = conn.execute(f"PRAGMA table_info({citar_identificador(tabela)})").fetchall()
+        chave = sorted((coluna[5], coluna[1]) for coluna in info if coluna[5] > 0)
+        if not chave:
+            # Tabela inexistente ou sem chave: propagar o erro original
+            raise
+        return [nome for _, nome in chave]
+
+
+def ler_sqlite_em_lotes(conn, tabela, tamanho_lote, ultima_chave=None, incluir_chave=False):
+    """
+    Lê uma tabela SQLite em lotes paginando pela chave (WHERE chave > ? ORDER BY chave LIMIT ?),
+    com custo constante por lote. Produz tuplas (df_lote, ultima_chave), onde ultima_chave é a
+    tupla de valores da chave da última linha do lote e pode ser usada para retomar a leitura.
+    Com incluir_chave=True o lote também traz as colunas da chave (ex.: 'rowid'), permitindo
+    gravar as traduções de volta na mesma linha.
+    """
+    import pandas as pd
+
+    chave = colunas_chave_sqlite(conn, tabela)
+    aliases = [f"__chave_{i}" for i in range(len(chave))]
+    selecao_chave = ", ".join(f"{citar_identificador(col)} AS {alias}" for col, alias in zip(chave, aliases))
+    ordem = ", ".join(citar_identificador(col) for col in chave)
+    tupla_chave = f"({ordem})" if len(chave) > 1 else ordem
+    marcadores = ", ".join("?" * len(chave))
+    tupla_marcadores = f"({marcadores})" if len(chave) > 1 else marcadores
+
+    while True:
+        if ultima_chave is None:
+            query = f"SELECT {selecao_chave}, * FROM {citar_identificador(tabela)} ORDER BY {ordem} LIMIT ?"
+            parametros = [tamanho_lote]
+        else:
+            query = (
+                f"SELECT {selecao_chave}, * FROM {citar_identificador(tabela)} "
+                f"WHERE {tupla_chave} > {tupla_marcadores} ORDER BY {ordem} LIMIT ?"
+            )
+            parametros = list(ultima_chave) + [tamanho_lote]
+
+        df_lote = pd.read_sql_query(query, conn, params=parametros)
+        if df_lote.empty:
+            return
+
+        # Converter escalares numpy em tipos nativos para que o sqlite3 aceite os parâmetros
+        ultima_chave = tuple(
+            valor.item() if hasattr(valor, 'item') else valor
+            for valor in df_lote[aliases].iloc[-1]
+        )
+        if incluir_chave:
+            # Colunas da chave primária já vêm no SELECT *; só o rowid precisa ser exposto
+            extras = {alias: col for alias, col in zip(aliases, chave) if col not in df_lote.columns}
+            df_lote = df_lote.drop(columns=[alias for alias in aliases if alias not in extras])
+            df_lote = df_lote.rename(columns=extras)
+        else:
+            df_lote = df_lote.drop(columns=aliases)
+
+        yield df_lote, ultima_chave
+
+        if len(df_lote) < tamanho_lote:
+            return
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Limitador de taxa de chamadas à API (token bucket).
+Substitui pausas fixas por uma cota contínua: cada chamada consome um token e os
+tokens são repostos à taxa permitida, de modo que o processo roda exatamente no
+limite configurado, sem ultrapassá-lo e sem ficar ocioso abaixo dele.
+"""
+
+import threading
+import time
+from collections import deque
+
+JANELA_TAXA = 60.0  # Janela (segundos) usada para medir a taxa atual
+
+
+class LimitadorTaxa:
+    """Token bucket seguro para várias threads, com métricas de taxa e espera"""
+
+    def __init__(self, chamadas_por_minuto, rajada=1, metricas=None):
+        if chamadas_por_minuto <= 0:
+            raise ValueError("chamadas_por_minuto deve ser maior que zero")
+        self.chamadas_por_minuto = chamadas_por_minuto
+        self.rajada = max(1, int(rajada))
+        self._taxa_por_segundo = chamadas_por_minuto / 60.0
+        self._tokens = float(self.rajada)
+        self._ultima_reposicao = time.monotonic()
+        self._lock = threading.Lock()
+        self._instantes = deque()
+        self.metricas = metricas  # Metricas opcional: cada espera entra em 'espera_segundos'
+
+        self.chamadas = 0
+        self.tempo_espera_total = 0.0
+        self.ultima_espera = 0.0
+
+    def aguardar(self):
+        """Bloqueia até que uma chamada seja permitida e retorna o tempo esperado (segundos)"""
+        with self._lock:
+            agora = time.monotonic()
+            self._tokens = min(
+                self.rajada,
+                self._tokens + (agora - self._ultima_reposicao) * self._taxa_por_segundo
+            )
+            self._ultima_reposicao = agora
+
+            # Reservar o token agora (o saldo pode ficar negativo) e esperar fora do lock
+            self._tokens -= 1
+            espera = -self._tokens / self._taxa_por_segundo if self._tokens < 0 else 0.0
+
+            self.chamadas += 1
+            self.tempo_espera_total += espera
+            self.ultima_espera = espera
+            self._instantes.append(agora + espera)
+
+        if self.metricas is not None:
+            self.metricas.observar('espera_segundos', espera)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def taxa_atual(self):
+        """Chamadas por minuto efetivamente liberadas na última janela"""
+        with self._lock:
+            limite = time.monotonic() - JANELA_TAXA
+            while self._instantes and self._instantes[0] < limite:
+                self._instantes.popleft()
+            return len(self._instantes) * (60.0 / JANELA_TAXA)
+
+    def estatisticas(self):
+        """Retorna as métricas do limitador"""
+        return {
+            'limite_por_minuto': self.chamadas_por_minuto,
+            'taxa_atual': self.taxa_atual(),
+            'chamadas': self.chamadas,
+            'tempo_espera_total': self.tempo_espera_total,
+            'ultima_espera': self.ultima_espera,
+        }
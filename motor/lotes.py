@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+"""
+Motor de empacotamento de lotes para tradução.
+Agrupa vários textos em uma única chamada à API respeitando um orçamento de
+caracteres, envia os pacotes por um pool de chamadas simultâneas e remonta as
+traduções na posição original de cada texto.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .enquadramento import custo_item, desenquadrar, enquadrar, pode_enquadrar
+
+MAX_CHARS_PER_CALL = 5000  # Máximo de caracteres por chamada à API
+SAFETY_MARGIN = 100  # Margem de segurança para não cortar textos
+MAX_WORKERS_PADRAO = 1  # Chamadas simultâneas à API (1 = sequencial)
+TENTATIVAS_ITEM = 2  # Tentativas para um texto isolado antes de desistir dele
+JANELA_EMPACOTAMENTO = 2000  # Textos ordenados juntos pelo empacotamento (first-fit decreasing)
+TENTATIVAS_API = 4  # Tentativas de uma chamada que falhou por rede, cota ou servidor
+ESPERA_INICIAL = 1.0  # Espera antes da primeira repetição (dobra a cada tentativa)
+ESPERA_MAXIMA = 30.0  # Teto da espera entre tentativas (s)
+
+# Erros do deep-translator causados pelo texto enviado (dividir o pacote ajuda)
+ERROS_DE_ITEM = ('NotValidPayload', 'NotValidLength', 'TranslationNotFound')
+# Erros de configuração: repetir não adianta
+ERROS_FATAIS = ('InvalidSourceOrTargetLanguage', 'LanguageNotSupportedException',
+                'ApiKeyException', 'AuthorizationException')
+
+
+def empacotar(textos, max_chars=MAX_CHARS_PER_CALL, safety_margin=SAFETY_MARGIN, janela=JANELA_EMPACOTAMENTO):
+    """
+    Agrupa os índices dos textos em pacotes cujo payload enquadrado não excede
+    max_chars - safety_margin, usando o mínimo de pacotes que conseguir.
+    Cada texto custa exatamente o que ocupa no payload (marcador + texto + separador).
+    Dentro de cada janela de textos, os maiores são encaixados primeiro no primeiro
+    pacote com espaço (first-fit decreasing); pacotes com sobra continuam abertos
+    para as janelas seguintes. Textos vazios são ignorados e textos que não podem
+    ser enquadrados com segurança seguem sozinhos.
+    Retorna uma lista de listas de índices; os índices de cada pacote e os pacotes
+    (pelo primeiro índice) ficam na ordem de entrada.
+    """
+    limite = max_chars - safety_margin
+    sozinhos = []
+    abertos = []  # [índices, caracteres] de cada pacote ainda aceitando textos
+    fechados = []
+
+    candidatos = []
+    for indice, texto in enumerate(textos):
+        if not texto:
+            continue
+        if not pode_enquadrar(texto):
+            sozinhos.append([indice])
+            continue
+        candidatos.append(indice)
+
+    for inicio in range(0, len(candidatos), janela):
+        ordenados = sorted(candidatos[inicio:inicio + janela], key=lambda indice: len(textos[indice]), reverse=True)
+        for indice in ordenados:
+            texto = textos[indice]
+            for pacote in abertos:
+                # O texto entra no fim do pacote, com o próximo marcador
+                tamanho = custo_item(texto, len(pacote[0]) + 1)
+                if pacote[1] + tamanho <= limite:
+                    pacote[0].append(indice)
+                    pacote[1] += tamanho
+                    break
+            else:
+                abertos.append([[indice], custo_item(texto, 1)])
+
+        # Pacotes que não cabem nem o menor texto possível saem da busca
+        ainda_abertos = []
+        for pacote in abertos:
+            if pacote[1] + custo_item('x', len(pacote[0]) + 1) > limite:
+                fechados.append(pacote)
+            else:
+                ainda_abertos.append(pacote)
+        abertos = ainda_abertos
+
+    # A soma dos marcadores só depende da quantidade de itens: reordenar não muda o tamanho
+    pacotes = [sorted(pacote[0]) for pacote in fechados + abertos] + sozinhos
+    pacotes.sort(key=lambda pacote: pacote[0])
+    return pacotes
+
+
+class FalhaTraducao(Exception):
+    """A API continuou falhando após as retentativas (ou falhas demais para seguir com a execução)"""
+
+
+def erro_de_item(erro):
+    """
+    Indica se o erro foi causado pelo conteúdo enviado (um texto inválido, longo demais ou
+    sem tradução), caso em que dividir o pacote ajuda; erros de rede, cota ou servidor não.
+    """
+    return isinstance(erro, (ValueError, TypeError)) or type(erro).__name__ in ERROS_DE_ITEM
+
+
+def chamar_com_reenvio(chamada, tentativas=TENTATIVAS_API, espera_inicial=ESPERA_INICIAL, metricas=None):
+    """
+    Executa chamada() repetindo, com backoff exponencial, os erros de rede, cota ou servidor.
+    Erros de item são repassados na hora; esgotadas as tentativas (ou diante de um erro de
+    configuração, como idioma inválido), levanta FalhaTraducao.
+    """
+    for tentativa in range(tentativas):
+        try:
+            return chamada()
+        except Exception as erro:
+            if erro_de_item(erro):
+                raise
+            if type(erro).__name__ in ERROS_FATAIS or tentativa == tentativas - 1:
+                raise FalhaTraducao(f"API indisponível após {tentativa + 1} tentativa(s): {erro}") from erro
+            espera = min(espera_inicial * 2 ** tentativa, ESPERA_MAXIMA)
+            if metricas is not None:
+                metricas.observar('espera_segundos', espera)
+                metricas.incrementar('reenvios')
+            time.sleep(espera)
+
+
+def traduzir_pacote(textos, translator, limitador=None, tentativas_api=TENTATIVAS_API,
+                    espera_inicial=ESPERA_INICIAL, metricas=None):
+    """
+    Traduz vários textos em uma única chamada usando marcadores numerados.
+    Retorna uma tradução por texto; itens que não voltaram alinhados ficam como None.
+    Falhas de rede, cota ou servidor são repetidas com backoff (ver chamar_com_reenvio).
+    """
+    def chamada():
+        if limitador is not None:
+            limitador.aguardar()
+        # Backends próprios sabem enquadrar; tradutores simples recebem o payload montado aqui
+        if hasattr(translator, 'translate_many'):
+            return translator.translate_many(textos)
+        return desenquadrar(translator.translate(enquadrar(textos)), len(textos))
+
+    return chamar_com_reenvio(chamada, tentativas_api, espera_inicial, metricas)
+
+
+def traduzir_isolado(texto, translator, limitador=None, tentativas=TENTATIVAS_ITEM, metricas=None,
+                     tentativas_api=TENTATIVAS_API, espera_inicial=ESPERA_INICIAL):
+    """
+    Traduz um único texto, tentando novamente se a resposta vier vazia.
+    Retorna None se o texto não puder ser traduzido (erro de item ou respostas vazias);
+    falhas de rede, cota ou servidor são repetidas com backoff e, persistindo, levantam
+    FalhaTraducao.
+    """
+    def chamada():
+        if limitador is not None:
+            limitador.aguardar()
+        return translator.translate(texto)
+
+    for tentativa in range(tentativas):
+        if tentativa and metricas is not None:
+            metricas.incrementar('reenvios')
+        try:
+            traducao = chamar_com_reenvio(chamada, tentativas_api, espera_inicial, metricas)
+        except FalhaTraducao:
+            raise
+        except Exception:
+            return None  # Erro causado pelo próprio texto: repetir não adianta
+        if traducao:
+            return traducao
+    return None
+
+
+def traduzir_com_reparo(textos, translator, limitador=None, tentativas=TENTATIVAS_ITEM, metricas=None,
+                        tentativas_api=TENTATIVAS_API, espera_inicial=ESPERA_INICIAL):
+    """
+    Traduz um pacote e recupera os itens que falharam por bisseção.
+    Itens que voltaram alinhados são mantidos; se apenas parte do pacote se perdeu,
+    só os faltantes são reenviados. Se o pacote inteiro falhar por causa do conteúdo
+    (erro de item ou nenhum marcador válido), ele é dividido ao meio recursivamente
+    até isolar os itens problemáticos, que seguem sozinhos. Itens sem tradução ficam
+    como None. Falhas de rede, cota ou servidor não dividem o pacote: são repetidas
+    com backoff e, persistindo, levantam FalhaTraducao.
+    Com metricas, cada reenvio (faltantes, metades da bisseção, retentativas) é contado.
+    """
+    if not textos:
+        return []
+
+    opcoes = {'tentativas_api': tentativas_api, 'espera_inicial': espera_inicial}
+    if len(textos) == 1:
+        return [traduzir_isolado(textos[0], translator, limitador, tentativas, metricas, **opcoes)]
+
+    try:
+        resultado = traduzir_pacote(textos, translator, limitador, metricas=metricas, **opcoes)
+    except FalhaTraducao:
+        raise
+    except Exception:
+        resultado = [None] * len(textos)  # Erro de item: isolar o texto problemático
+
+    faltantes = [posicao for posicao, traducao in enumerate(resultado) if traducao is None]
+    if not faltantes:
+        return resultado
+
+    if len(faltantes) == len(textos):
+        # Nada aproveitável: dividir ao meio para isolar o item problemático
+        meio = len(textos) // 2
+        if metricas is not None:
+            metricas.incrementar('reenvios', 2)
+        return (traduzir_com_reparo(textos[:meio], translator, limitador, tentativas, metricas, **opcoes)
+                + traduzir_com_reparo(textos[meio:], translator, limitador, tentativas, metricas, **opcoes))
+
+    if metricas is not None:
+        metricas.incrementar('reenvios')
+    reparados = traduzir_com_reparo([textos[posicao] for posicao in faltantes], translator, limitador,
+                                    tentativas, metricas, **opcoes)
+    for posicao, traducao in zip(faltantes, reparados):
+        resultado[posicao] = traducao
+    return resultado
+
+
+def traduzir_em_lotes(textos, translator, max_chars=MAX_CHARS_PER_CALL, safety_margin=SAFETY_MARGIN,
+                      ao_traduzir_pacote=None, max_workers=MAX_WORKERS_PADRAO, fabrica_tradutor=None,
+                      limitador=None, metricas=None, tentativas_api=TENTATIVAS_API, espera_inicial=ESPERA_INICIAL):
+    """
+    Traduz uma lista de textos empacotando-os em poucas chamadas à API.
+    Com max_workers > 1 os pacotes são enviados por um pool de threads; como o
+    GoogleTranslator guarda estado por chamada, cada thread usa sua própria instância
+    criada por fabrica_tradutor (ou compartilha translator se nenhuma fábrica for dada).
+    translator pode ser um BackendTraducao ou qualquer objeto com translate(texto).
+    Itens que voltam desalinhados são reenviados sem repetir o pacote inteiro e
+    pacotes que falham são divididos ao meio até isolar os textos problemáticos;
+    textos que não puderem ser traduzidos voltam como None.
+    Falhas de rede, cota ou servidor são repetidas até tentativas_api vezes com backoff
+    exponencial a partir de espera_inicial; persistindo, FalhaTraducao interrompe a tradução.
+    Se um limitador (LimitadorTaxa) for informado, toda chamada à API passa por ele.
+    metricas (Metricas) recebe o tempo de empacotamento e a contagem de reenvios.
+    ao_traduzir_pacote(textos, traducoes) é chamado na thread de origem, na ordem dos pacotes.
+    Retorna as traduções na mesma ordem dos textos recebidos.
+    """
+    traducoes = list(textos)
+    inicio = time.perf_counter()
+    pacotes = empacotar(textos, max_chars, safety_margin)
+    if metricas is not None:
+        metricas.observar('empacotamento_segundos', time.perf_counter() - inicio)
+    locais = threading.local()
+
+    def obter_tradutor():
+        if fabrica_tradutor is None:
+            return translator
+        if not hasattr(locais, 'tradutor'):
+            locais.tradutor = fabrica_tradutor()
+        return locais.tradutor
+
+    def processar(pacote):
+        itens = [textos[indice] for indice in pacote]
+        return itens, traduzir_com_reparo(itens, obter_tradutor(), limitador, metricas=metricas,
+                                          tentativas_api=tentativas_api, espera_inicial=espera_inicial)
+
+    executor = None
+    if max_workers > 1 and len(pacotes) > 1:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="traducao")
+        resultados = executor.map(processar, pacotes)  # map devolve na ordem de submissão
+    else:
+        resultados = map(processar, pacotes)
+
+    try:
+        for pacote, (itens, resultado) in zip(pacotes, resultados):
+            for indice, traducao in zip(pacote, resultado):
+                traducoes[indice] = traducao
+
+            if ao_traduzir_pacote is not None:
+                ao_traduzir_pacote(itens, resultado)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return traducoes
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memória de tradução persistente em SQLite.
+Guarda cada tradução já feita, chaveada por (origem, destino, texto), para que
+reexecuções e novos datasets com valores repetidos não paguem a API novamente.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+CAMINHO_MEMORIA_PADRAO = os.path.join(os.path.expanduser("~"), ".tradutor_dados", "memoria_traducao.db")
+
+# Limite seguro de parâmetros por consulta (SQLite antigo aceita no máximo 999)
+MAX_PARAMETROS_CONSULTA = 500
+
+
+class MemoriaTraducao:
+    """Cache em disco de traduções com contadores de acertos (hits) e faltas (misses)"""
+
+    def __init__(self, caminho=CAMINHO_MEMORIA_PADRAO):
+        self.caminho = caminho
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        # timeout: a mesma memória pode ser usada por vários processos (ex.: shards do tradutor.py)
+        self._conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS traducoes (
+                origem TEXT NOT NULL,
+                destino TEXT NOT NULL,
+                texto TEXT NOT NULL,
+                traducao TEXT NOT NULL,
+                criado_em TEXT NOT NULL,
+                PRIMARY KEY (origem, destino, texto)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def obter(self, origem, destino, texto):
+        """Retorna a tradução memorizada de um texto ou None se ainda não existir"""
+        return self.obter_muitos(origem, destino, [texto]).get(texto)
+
+    def obter_muitos(self, origem, destino, textos):
+        """Consulta vários textos de uma vez e retorna um dicionário {texto: tradução} só com os encontrados"""
+        unicos = list(dict.fromkeys(textos))
+        encontrados = {}
+
+        with self._lock:
+            for inicio in range(0, len(unicos), MAX_PARAMETROS_CONSULTA):
+                parte = unicos[inicio:inicio + MAX_PARAMETROS_CONSULTA]
+                marcadores = ",".join("?" * len(parte))
+                cursor = self._conn.execute(
+                    f"SELECT texto, traducao FROM traducoes "
+                    f"WHERE origem = ? AND destino = ? AND texto IN ({marcadores})",
+                    [origem, destino] + parte
+                )
+                encontrados.update(cursor.fetchall())
+
+            self.hits += len(encontrados)
+            self.misses += len(unicos) - len(encontrados)
+
+        return encontrados
+
+    def salvar(self, origem, destino, texto, traducao):
+        """Memoriza uma tradução"""
+        self.salvar_muitos(origem, destino, [(texto, traducao)])
+
+    def salvar_muitos(self, origem, destino, pares):
+        """Memoriza vários pares (texto, tradução) em uma única transação"""
+        agora = datetime.now().isoformat(timespec="seconds")
+        linhas = [(origem, destino, texto, traducao, agora) for texto, traducao in pares if texto and traducao]
+        if not linhas:
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO traducoes (origem, destino, texto, traducao, criado_em) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    linhas
+                )
+
+    def estatisticas(self):
+        """Retorna os contadores de acertos e faltas da execução atual"""
+        consultas = self.hits + self.misses
+        taxa = (self.hits / consultas) * 100 if consultas else 0.0
+        return {'hits': self.hits, 'misses': self.misses, 'taxa_acerto': taxa}
+
+    def fechar(self):
+        """Fecha a conexão com o banco da memória"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.fechar()
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+"""
+Métricas por etapa de uma tradução (leitura, empacotamento, chamadas à API, esperas,
+escrita e memória de tradução).
+Contadores e histogramas ficam em memória e são exportados periodicamente para um
+arquivo JSON e para um arquivo .prom no formato do textfile collector do node exporter,
+permitindo saber se uma execução longa está presa em E/S, na API ou aguardando cota.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .checkpoint import gravar_json_atomico
+
+PREFIXO_PROMETHEUS = "tradutor_"
+INTERVALO_EXPORTACAO_PADRAO = 15.0  # Segundos entre duas exportações
+
+# Limites superiores (segundos) dos buckets dos histogramas de tempo
+BUCKETS_PADRAO = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+DESCRICOES = {
+    'lote_segundos': "Tempo total de cada lote (leitura, tradução e envio à escrita)",
+    'leitura_segundos': "Tempo lendo cada lote da origem",
+    'empacotamento_segundos': "Tempo empacotando os textos de um lote em chamadas",
+    'traducao_segundos': "Latência de cada chamada à API de tradução",
+    'espera_segundos': "Tempo dormindo antes de uma chamada (limitador de taxa e backoff)",
+    'escrita_segundos': "Tempo gravando cada lote na saída",
+    'sincronizacao_segundos': "Tempo de cada confirmação em disco (fsync ou COMMIT)",
+    'chamadas_api': "Chamadas feitas à API de tradução",
+    'falhas_api': "Chamadas à API que terminaram em erro",
+    'reenvios': "Textos ou pacotes reenviados (retentativa, itens desalinhados ou bisseção)",
+    'caracteres_enviados': "Caracteres enviados à API",
+    'valores_ignorados': "Valores repassados sem tradução (números, datas, códigos, URLs, e-mails)",
+    'memoria_hits': "Textos encontrados na memória de tradução",
+    'memoria_misses': "Textos ausentes da memória de tradução",
+    'linhas_lidas': "Linhas lidas da origem",
+    'linhas_confirmadas': "Linhas gravadas e confirmadas em disco",
+}
+
+
+class Metricas:
+    """
+    Registro de contadores e histogramas (seguro entre threads).
+    rotulos: rótulos fixos acrescentados a todas as séries do Prometheus (ex.: {'shard': '2'}).
+    """
+
+    def __init__(self, rotulos=None, buckets=BUCKETS_PADRAO):
+        self.rotulos = dict(rotulos or {})
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+        self.inicio = time.time()
+
+    def incrementar(self, nome, valor=1):
+        """Soma valor ao contador nome"""
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + valor
+
+    def observar(self, nome, valor):
+        """Registra uma observação (em segundos) no histograma nome"""
+        with self._lock:
+            histograma = self._histogramas.get(nome)
+            if histograma is None:
+                histograma = self._histogramas[nome] = {
+                    'contagem': 0, 'soma': 0.0, 'buckets': [0] * len(self.buckets)
+                }
+            histograma['contagem'] += 1
+            histograma['soma'] += valor
+            posicao = bisect.bisect_left(self.buckets, valor)
+            if posicao < len(self.buckets):
+                histograma['buckets'][posicao] += 1
+
+    @contextmanager
+    def medir(self, nome):
+        """Mede a duração do bloco e a registra no histograma nome"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio)
+
+    def medir_iteracao(self, iteravel, nome):
+        """Repassa os itens de iteravel registrando em nome o tempo para obter cada um"""
+        iterador = iter(iteravel)
+        while True:
+            inicio = time.perf_counter()
+            try:
+                item = next(iterador)
+            except StopIteration:
+                return
+            self.observar(nome, time.perf_counter() - inicio)
+            yield item
+
+    def instantaneo(self):
+        """Retorna contadores e histogramas (buckets cumulativos, como no Prometheus)"""
+        with self._lock:
+            histogramas = {}
+            for nome, histograma in self._histogramas.items():
+                acumulado = 0
+                buckets = {}
+                for limite, quantidade in zip(self.buckets, histograma['buckets']):
+                    acumulado += quantidade
+                    buckets[str(limite)] = acumulado
+                buckets['+Inf'] = histograma['contagem']
+                histogramas[nome] = {
+                    'contagem': histograma['contagem'],
+                    'soma': histograma['soma'],
+                    'buckets': buckets,
+                }
+            return {
+                'rotulos': dict(self.rotulos),
+                'inicio': self.inicio,
+                'atualizado_em': time.time(),
+                'contadores': dict(self._contadores),
+                'histogramas': histogramas,
+            }
+
+    def exportar_json(self, caminho):
+        """Grava o instantâneo em JSON (de forma atômica)"""
+        gravar_json_atomico(caminho, self.instantaneo())
+
+    def exportar_prometheus(self, caminho):
+        """
+        Grava as métricas no formato texto do Prometheus, de forma atômica (o textfile
+        collector nunca lê um arquivo pela metade).
+        """
+        dados = self.instantaneo()
+        linhas = []
+
+        for nome, valor in sorted(dados['contadores'].items()):
+            serie = f"{PREFIXO_PROMETHEUS}{nome}_total"
+            linhas.append(f"# HELP {serie} {DESCRICOES.get(nome, nome)}")
+            linhas.append(f"# TYPE {serie} counter")
+            linhas.append(f"{serie}{_formatar_rotulos(self.rotulos)} {valor}")
+
+        for nome, histograma in sorted(dados['histogramas'].items()):
+            serie = f"{PREFIXO_PROMETHEUS}{nome}"
+            linhas.append(f"# HELP {serie} {DESCRICOES.get(nome, nome)}")
+            linhas.append(f"# TYPE {serie} histogram")
+            for limite, acumulado in histograma['buckets'].items():
+                rotulos = _formatar_rotulos(dict(self.rotulos, le=limite))
+                linhas.append(f"{serie}_bucket{rotulos} {acumulado}")
+            linhas.append(f"{serie}_sum{_formatar_rotulos(self.rotulos)} {histograma['soma']}")
+            linhas.append(f"{serie}_count{_formatar_rotulos(self.rotulos)} {histograma['contagem']}")
+
+        serie = f"{PREFIXO_PROMETHEUS}ultima_exportacao_segundos"
+        linhas.append(f"# HELP {serie} Instante (epoch) da última exportação das métricas")
+        linhas.append(f"# TYPE {serie} gauge")
+        linhas.append(f"{serie}{_formatar_rotulos(self.rotulos)} {dados['atualizado_em']}")
+
+        temporario = caminho + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write("\n".join(linhas) + "\n")
+        os.replace(temporario, caminho)
+
+
+def _formatar_rotulos(rotulos):
+    """Formata rótulos como {a="1",b="2"} (vazio se não houver rótulos)"""
+    if not rotulos:
+        return ""
+    pares = []
+    for chave, valor in rotulos.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pares.append(f'{chave}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+def caminho_por_shard(caminho, indice):
+    """Caminho das métricas de um shard: metricas.prom -> metricas.shard2.prom"""
+    raiz, extensao = os.path.splitext(caminho)
+    return f"{raiz}.shard{indice}{extensao}"
+
+
+class ExportadorMetricas:
+    """
+    Thread que exporta as métricas a cada `intervalo` segundos para arquivo_json e/ou
+    arquivo_prometheus, e uma última vez em parar().
+    """
+
+    def __init__(self, metricas, arquivo_json=None, arquivo_prometheus=None,
+                 intervalo=INTERVALO_EXPORTACAO_PADRAO, ao_erro=None):
+        self.metricas = metricas
+        self.arquivo_json = arquivo_json
+        self.arquivo_prometheus = arquivo_prometheus
+        self.intervalo = intervalo
+        self.ao_erro = ao_erro
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        """Inicia a exportação periódica (sem efeito se nenhum arquivo foi configurado)"""
+        if not (self.arquivo_json or self.arquivo_prometheus):
+            return self
+        self._thread = threading.Thread(target=self._executar, name="exportador-metricas", daemon=True)
+        self._thread.start()
+        return self
+
+    def exportar(self):
+        """Grava as métricas agora; erros são repassados a ao_erro sem interromper a tradução"""
+        try:
+            if self.arquivo_json:
+                self.metricas.exportar_json(self.arquivo_json)
+            if self.arquivo_prometheus:
+                self.metricas.exportar_prometheus(self.arquivo_prometheus)
+        except OSError as e:
+            if self.ao_erro is not None:
+                self.ao_erro(e)
+
+    def parar(self):
+        """Encerra a thread e faz a exportação final"""
+        if self._thread is None:
+            return
+        self._parar.set()
+        self._thread.join()
+        self._thread = None
+        self.exportar()
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self.exportar()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Modo de perfil de desempenho de uma execução.
+Combina o cProfile na thread que conduz os lotes (estatísticas exatas por função,
+gravadas em .pstats), um amostrador de pilhas de todas as threads (arquivo .folded
+no formato "collapsed stacks", pronto para flamegraph.pl ou speedscope) e um
+histograma da latência de cada lote, resumidos em um relatório .txt.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from .metricas import BUCKETS_PADRAO
+
+INTERVALO_AMOSTRAGEM = 0.005  # Segundos entre duas amostras das pilhas
+FUNCOES_RELATORIO = 25  # Funções listadas no relatório (por tempo próprio)
+LARGURA_HISTOGRAMA = 40
+
+
+class AmostradorPilhas:
+    """Amostra periodicamente as pilhas de todas as threads e conta as pilhas iguais"""
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM):
+        self.intervalo = intervalo
+        self.contagens = Counter()
+        self.amostras = 0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._executar, name="amostrador-perfil", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        if self._thread is None:
+            return
+        self._parar.set()
+        self._thread.join()
+        self._thread = None
+
+    def gravar(self, caminho):
+        """Grava uma pilha por linha ("raiz;...;folha contagem"), da mais frequente para a menos"""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, contagem in self.contagens.most_common():
+                f.write(f"{pilha} {contagem}\n")
+
+    def _executar(self):
+        proprio = threading.get_ident()
+        while not self._parar.wait(self.intervalo):
+            # Threads de pool (traducao_0, traducao_1, ...) viram uma única raiz no flamegraph
+            nomes = {thread.ident: re.sub(r"([_-]\d+)+$", "", thread.name) for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == proprio:
+                    continue
+                pilha = []
+                while frame is not None:
+                    codigo = frame.f_code
+                    pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+                    frame = frame.f_back
+                pilha.append(nomes.get(ident, str(ident)))
+                self.contagens[";".join(reversed(pilha))] += 1
+            self.amostras += 1
+
+
+def _percentil(valores_ordenados, fracao):
+    indice = min(len(valores_ordenados) - 1, int(round(fracao * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+def histograma_latencias(duracoes, buckets=BUCKETS_PADRAO, largura=LARGURA_HISTOGRAMA):
+    """Retorna as linhas de texto do histograma das durações (segundos) com média e percentis"""
+    if not duracoes:
+        return ["Latência por lote: nenhum lote concluído"]
+
+    ordenadas = sorted(duracoes)
+    linhas = [
+        f"Latência por lote ({len(ordenadas)} lotes): média {sum(ordenadas) / len(ordenadas):.3f}s | "
+        f"p50 {_percentil(ordenadas, 0.5):.3f}s | p90 {_percentil(ordenadas, 0.9):.3f}s | "
+        f"p99 {_percentil(ordenadas, 0.99):.3f}s | máx {ordenadas[-1]:.3f}s"
+    ]
+
+    contagens = [0] * (len(buckets) + 1)
+    for duracao in ordenadas:
+        posicao = next((i for i, limite in enumerate(buckets) if duracao <= limite), len(buckets))
+        contagens[posicao] += 1
+
+    # Mostrar só a faixa de buckets ocupada
+    ocupados = [i for i, contagem in enumerate(contagens) if contagem]
+    maior = max(contagens)
+    for i in range(ocupados[0], ocupados[-1] + 1):
+        rotulo = f"<= {buckets[i]}s" if i < len(buckets) else f">  {buckets[-1]}s"
+        barra = "#" * max(1 if contagens[i] else 0, round(contagens[i] / maior * largura))
+        linhas.append(f"  {rotulo:>10} | {barra:<{largura}} {contagens[i]}")
+    return linhas
+
+
+class PerfilExecucao:
+    """
+    Perfil de uma execução, usado como gerenciador de contexto na thread que conduz os lotes.
+    Ao sair, grava <base>.pstats, <base>.folded e <base>.txt e entrega o resumo a ao_log.
+    """
+
+    def __init__(self, base, ao_log=None, intervalo_amostragem=INTERVALO_AMOSTRAGEM):
+        self.base = base
+        self.ao_log = ao_log or (lambda mensagem: None)
+        self.perfilador = cProfile.Profile()
+        self.amostrador = AmostradorPilhas(intervalo_amostragem)
+        self.duracoes_lotes = []
+        self._lock = threading.Lock()
+        self.inicio = None
+
+    def registrar_lote(self, segundos):
+        """Registra a latência de um lote (leitura, tradução e envio à escrita)"""
+        with self._lock:
+            self.duracoes_lotes.append(segundos)
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        self.amostrador.iniciar()
+        self.perfilador.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.perfilador.disable()
+        self.amostrador.parar()
+        self.gravar(time.perf_counter() - self.inicio)
+
+    def gravar(self, duracao_total):
+        """Grava os arquivos do perfil e registra o resumo"""
+        caminho_pstats = f"{self.base}.pstats"
+        caminho_pilhas = f"{self.base}.folded"
+        caminho_relatorio = f"{self.base}.txt"
+
+        self.perfilador.dump_stats(caminho_pstats)
+        self.amostrador.gravar(caminho_pilhas)
+
+        saida = io.StringIO()
+        estatisticas = pstats.Stats(self.perfilador, stream=saida)
+        estatisticas.sort_stats(pstats.SortKey.TIME).print_stats(FUNCOES_RELATORIO)
+
+        histograma = histograma_latencias(self.duracoes_lotes)
+        with open(caminho_relatorio, 'w', encoding='utf-8') as f:
+            f.write(f"Duração total: {duracao_total:.2f}s | {self.amostrador.amostras} amostras de pilha\n\n")
+            f.write("\n".join(histograma) + "\n\n")
+            f.write(f"Funções com mais tempo próprio (thread dos lotes):\n{saida.getvalue()}")
+
+        for linha in histograma:
+            self.ao_log(linha)
+        self.ao_log(f"Perfil gravado: {caminho_pstats}, {caminho_pilhas} (flamegraph) e {caminho_relatorio}")
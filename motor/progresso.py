@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+Acompanhamento do progresso de uma tradução.
+Reúne linhas concluídas, vazão (média móvel exponencial), chamadas à API por minuto,
+caracteres enviados e estimativa de término em um único instantâneo, entregue a quem
+assina no máximo a cada `intervalo` segundos para não sobrecarregar quem desenha.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+INTERVALO_PADRAO = 0.25  # Intervalo mínimo entre duas notificações (s)
+CONSTANTE_TEMPO_EWMA = 10.0  # Horizonte da média móvel de linhas/s (s)
+JANELA_CHAMADAS = 60.0  # Janela usada no cálculo de chamadas/min (s)
+
+
+class ProgressoTraducao:
+    """
+    Canal único de progresso de uma execução (seguro entre threads).
+    ao_atualizar(instantaneo) recebe o dicionário de instantaneo(); é chamado na
+    thread que registrou o avanço ou a chamada, e nunca mais de uma vez por intervalo
+    (exceto em concluir(), que sempre notifica).
+    """
+
+    def __init__(self, total=None, linhas_iniciais=0, ao_atualizar=None, intervalo=INTERVALO_PADRAO,
+                 constante_tempo=CONSTANTE_TEMPO_EWMA):
+        self.total = total
+        self.linhas = linhas_iniciais
+        self.intervalo = intervalo
+        self.constante_tempo = constante_tempo
+        self._ao_atualizar = ao_atualizar
+        self._lock = threading.Lock()
+
+        self.inicio = time.monotonic()
+        self._ultimo_avanco = self.inicio
+        self._ultima_notificacao = None
+        self.linhas_por_segundo = None
+
+        # Percentual informado pela origem quando o total de linhas é desconhecido (ex.: bytes do CSV)
+        self.percentual = None
+        self._referencia_percentual = None  # (instante, percentual) da primeira medição
+
+        self.chamadas = 0
+        self.caracteres = 0
+        self._instantes_chamadas = deque()
+
+    def definir_total(self, total):
+        """Informa o total de linhas da execução, se só for conhecido depois de iniciada"""
+        with self._lock:
+            self.total = total
+
+    def registrar_chamada(self, caracteres):
+        """Contabiliza uma chamada à API e os caracteres enviados nela"""
+        with self._lock:
+            agora = time.monotonic()
+            self.chamadas += 1
+            self.caracteres += caracteres
+            self._instantes_chamadas.append(agora)
+        self._notificar()
+
+    def avancar(self, linhas, percentual=None):
+        """Registra linhas concluídas (e, opcionalmente, o percentual medido pela origem)"""
+        with self._lock:
+            agora = time.monotonic()
+            decorrido = agora - self._ultimo_avanco
+            self._ultimo_avanco = agora
+            self.linhas += linhas
+
+            if decorrido > 0:
+                # Média exponencial ponderada pelo tempo: lotes lentos e rápidos pesam o que duraram
+                taxa = linhas / decorrido
+                if self.linhas_por_segundo is None:
+                    self.linhas_por_segundo = taxa
+                else:
+                    peso = 1.0 - math.exp(-decorrido / self.constante_tempo)
+                    self.linhas_por_segundo += peso * (taxa - self.linhas_por_segundo)
+
+            if percentual is not None:
+                self.percentual = min(100.0, percentual)
+                if self._referencia_percentual is None:
+                    self._referencia_percentual = (agora, self.percentual)
+        self._notificar()
+
+    def concluir(self):
+        """Entrega o instantâneo final, independentemente do intervalo"""
+        self._notificar(forcar=True)
+
+    def instantaneo(self):
+        """Retorna o estado atual: linhas, total, percentual, vazão, chamadas/min, caracteres e ETA"""
+        with self._lock:
+            agora = time.monotonic()
+            decorrido = agora - self.inicio
+
+            limite = agora - JANELA_CHAMADAS
+            while self._instantes_chamadas and self._instantes_chamadas[0] < limite:
+                self._instantes_chamadas.popleft()
+            janela = min(JANELA_CHAMADAS, max(decorrido, 1.0))  # Sem extrapolar a partir de frações de segundo
+            chamadas_por_minuto = len(self._instantes_chamadas) * 60.0 / janela
+
+            percentual = self.percentual
+            if self.total:
+                percentual = min(100.0, self.linhas / self.total * 100)
+
+            eta = None
+            if self.total and self.linhas_por_segundo:
+                eta = max(0, self.total - self.linhas) / self.linhas_por_segundo
+            elif percentual is not None and self._referencia_percentual is not None:
+                # Sem total de linhas: projetar pelo ritmo do percentual desde a primeira medição
+                instante_referencia, percentual_referencia = self._referencia_percentual
+                avanco = percentual - percentual_referencia
+                if avanco > 0:
+                    eta = (agora - instante_referencia) * (100.0 - percentual) / avanco
+
+            return {
+                'linhas': self.linhas,
+                'total': self.total,
+                'percentual': percentual,
+                'linhas_por_segundo': self.linhas_por_segundo or 0.0,
+                'chamadas': self.chamadas,
+                'chamadas_por_minuto': chamadas_por_minuto,
+                'caracteres': self.caracteres,
+                'eta_segundos': eta,
+                'decorrido': decorrido,
+            }
+
+    def _notificar(self, forcar=False):
+        """Chama ao_atualizar se o intervalo desde a última notificação já passou"""
+        if self._ao_atualizar is None:
+            return
+        with self._lock:
+            agora = time.monotonic()
+            if not forcar and self._ultima_notificacao is not None and agora - self._ultima_notificacao < self.intervalo:
+                return
+            self._ultima_notificacao = agora
+        self._ao_atualizar(self.instantaneo())
+
+
+def formatar_duracao(segundos):
+    """Formata segundos como H:MM:SS (ou '?' se desconhecido)"""
+    if segundos is None:
+        return "?"
+    segundos = int(segundos)
+    return f"{segundos // 3600}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+
+
+def formatar_progresso(instantaneo):
+    """Resumo de uma linha do instantâneo, usado na barra de status e no tqdm"""
+    return (
+        f"{instantaneo['linhas_por_segundo']:.1f} linhas/s | "
+        f"{instantaneo['chamadas_por_minuto']:.0f} chamadas/min | "
+        f"{instantaneo['caracteres']:,} caracteres | "
+        f"ETA {formatar_duracao(instantaneo['eta_segundos'])}"
+    )
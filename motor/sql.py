@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+"""
+Utilitários de SQL compartilhados pela leitura, pela escrita e pela execução.
+Nomes de tabelas e colunas vêm do usuário ou do próprio banco e não podem ser
+passados como parâmetros (?); por isso são sempre citados antes de entrar na consulta.
+"""
+
+
+def citar_identificador(identificador):
+    """Cita um identificador SQL (tabela ou coluna) com aspas duplas, duplicando as aspas internas"""
+    return '"' + str(identificador).replace('"', '""') + '"'
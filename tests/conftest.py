@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""Fixtures compartilhadas pelos testes"""
+
+import importlib.util
+import os
+import time
+
+import pytest
+
+from motor import LimitadorTaxa
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def script_tradutor():
+    """config/tradutor.py carregado como módulo novo, com limitador sem espera"""
+    spec = importlib.util.spec_from_file_location("tradutor_script", os.path.join(RAIZ, "config", "tradutor.py"))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    modulo.LIMITADOR = LimitadorTaxa(60000, rajada=1000)
+    return modulo
+
+
+class RelogioFalso:
+    """Relógio monotônico controlado pelo teste; sleep() apenas avança o tempo"""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Substitui time.monotonic e time.sleep por um RelogioFalso"""
+    relogio = RelogioFalso()
+    monkeypatch.setattr(time, 'monotonic', relogio.monotonic)
+    monkeypatch.setattr(time, 'sleep', relogio.sleep)
+    return relogio
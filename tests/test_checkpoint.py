@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""Testes do checkpoint de execuções (motor.checkpoint)"""
+
+import json
+import os
+
+from motor.checkpoint import SUFIXO_CHECKPOINT, CheckpointTraducao
+
+
+def _preparar(tmp_path):
+    origem = tmp_path / "entrada.csv"
+    origem.write_text("texto\nolá\n", encoding='utf-8')
+    saida = tmp_path / "saida.csv"
+    saida.write_bytes(b"texto\nhello\n")
+    identificacao = CheckpointTraducao.identificar(str(origem), 'csv', ['texto'], 'pt', 'en')
+    return origem, saida, identificacao
+
+
+def test_salvar_e_carregar(tmp_path):
+    _, saida, identificacao = _preparar(tmp_path)
+    checkpoint = CheckpointTraducao(str(saida))
+
+    checkpoint.salvar(identificacao, posicao=11, linhas_processadas=1, bytes_saida=12)
+
+    assert checkpoint.caminho == str(saida) + SUFIXO_CHECKPOINT
+    dados = checkpoint.carregar_compativel(identificacao)
+    assert (dados['posicao'], dados['linhas_processadas'], dados['bytes_saida']) == (11, 1, 12)
+    assert not os.path.exists(checkpoint.caminho + ".tmp")
+
+
+def test_outra_execucao_ou_origem_alterada_nao_retoma(tmp_path):
+    origem, saida, identificacao = _preparar(tmp_path)
+    checkpoint = CheckpointTraducao(str(saida))
+    checkpoint.salvar(identificacao, 11, 1, 12)
+
+    outra = CheckpointTraducao.identificar(str(origem), 'csv', ['texto'], 'pt', 'es')
+    assert checkpoint.carregar_compativel(outra) is None
+
+    origem.write_text("texto\nolá\nmundo\n", encoding='utf-8')
+    alterada = CheckpointTraducao.identificar(str(origem), 'csv', ['texto'], 'pt', 'en')
+    assert checkpoint.carregar_compativel(alterada) is None
+
+
+def test_saida_menor_que_a_confirmada_nao_retoma(tmp_path):
+    _, saida, identificacao = _preparar(tmp_path)
+    checkpoint = CheckpointTraducao(str(saida))
+    checkpoint.salvar(identificacao, 11, 1, 12)
+
+    saida.write_bytes(b"texto\n")
+
+    assert checkpoint.carregar_compativel(identificacao) is None
+
+
+def test_checkpoint_ilegivel_ou_de_outra_versao_e_ignorado(tmp_path):
+    _, saida, identificacao = _preparar(tmp_path)
+    checkpoint = CheckpointTraducao(str(saida))
+
+    with open(checkpoint.caminho, 'w', encoding='utf-8') as f:
+        f.write("{corrompido")
+    assert checkpoint.carregar() is None
+
+    with open(checkpoint.caminho, 'w', encoding='utf-8') as f:
+        json.dump({'versao': 0, 'execucao': identificacao}, f)
+    assert checkpoint.carregar() is None
+
+
+def test_preparar_saida_descarta_gravacao_parcial_e_remover(tmp_path):
+    _, saida, identificacao = _preparar(tmp_path)
+    checkpoint = CheckpointTraducao(str(saida))
+    checkpoint.salvar(identificacao, 11, 1, 12)
+    with open(saida, 'ab') as f:
+        f.write(b"parcial sem confirma")
+
+    checkpoint.preparar_saida(checkpoint.carregar_compativel(identificacao))
+
+    assert saida.read_bytes() == b"texto\nhello\n"
+    checkpoint.remover()
+    checkpoint.remover()  # Remover de novo não é erro
+    assert checkpoint.carregar() is None
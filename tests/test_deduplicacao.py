@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""Testes da deduplicação de valores (motor.deduplicacao e a janela de ExecucaoTraducao)"""
+
+import csv
+
+from motor import ExecucaoTraducao, MapaDeduplicacao
+
+
+def test_mapa_envia_cada_valor_uma_vez_e_conta_repeticoes():
+    enviados = []
+
+    def traduzir_unicos(textos):
+        enviados.append(list(textos))
+        return {texto: texto.upper() for texto in textos}
+    mapa = MapaDeduplicacao(traduzir_unicos)
+
+    assert mapa.traduzir(["a", "b", "a", "a"]) == {"a": "A", "b": "B"}
+    assert mapa.traduzir(["b", "c"]) == {"b": "B", "c": "C"}
+
+    assert enviados == [["a", "b"], ["c"]]
+    stats = mapa.estatisticas()
+    assert (stats['recebidos'], stats['repetidos'], stats['enviados']) == (6, 3, 3)
+
+
+def test_falhas_ficam_no_original_e_sao_tentadas_de_novo():
+    chamadas = []
+
+    def traduzir_unicos(textos):
+        chamadas.append(list(textos))
+        return {texto: None for texto in textos}
+    mapa = MapaDeduplicacao(traduzir_unicos)
+
+    assert mapa.traduzir(["x"]) == {"x": "x"}
+    mapa.traduzir(["x"])
+
+    assert chamadas == [["x"], ["x"]]
+    assert mapa.estatisticas()['falhos'] == 2
+
+
+def test_execucao_conta_repeticoes_dentro_do_lote(tmp_path):
+    entrada = tmp_path / "entrada.csv"
+    with open(entrada, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["id", "status"])
+        escritor.writerows((i, "Active" if i % 3 else "Inactive") for i in range(30))
+    logs = []
+
+    execucao = ExecucaoTraducao(
+        str(entrada), "CSV", ["status"], ao_log=logs.append, arquivo_saida=str(tmp_path / "saida.csv"),
+        config={'backend': 'stub', 'delay_traducao': 0, 'arquivo_memoria': str(tmp_path / "memoria.db")}
+    )
+
+    assert execucao.executar()
+    assert "Deduplicação: 30 valores, 28 repetidos, 2 distintos traduzidos" in logs
+    with open(tmp_path / "saida.csv", newline='', encoding='utf-8') as f:
+        linhas = list(csv.DictReader(f))
+    assert {linha['status_traduzido'] for linha in linhas} == {"[pt] Active", "[pt] Inactive"}
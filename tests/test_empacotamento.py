@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Testes do empacotamento first-fit decreasing (motor.lotes.empacotar)"""
+
+import random
+
+from motor.enquadramento import custo_item
+from motor.lotes import empacotar
+
+
+def _payload(textos, pacote):
+    """Caracteres do payload enquadrado de um pacote"""
+    return sum(custo_item(textos[indice], posicao) for posicao, indice in enumerate(pacote, 1))
+
+
+def test_cobre_cada_texto_exatamente_uma_vez():
+    rng = random.Random(1)
+    textos = ["x" * rng.randint(1, 300) for _ in range(500)]
+
+    pacotes = empacotar(textos, max_chars=2000, safety_margin=100)
+
+    indices = [indice for pacote in pacotes for indice in pacote]
+    assert sorted(indices) == list(range(len(textos)))
+
+
+def test_respeita_o_limite_do_payload():
+    rng = random.Random(2)
+    textos = ["y" * rng.randint(1, 900) for _ in range(300)]
+
+    pacotes = empacotar(textos, max_chars=1000, safety_margin=50)
+
+    assert all(_payload(textos, pacote) <= 950 for pacote in pacotes)
+
+
+def test_mantem_a_ordem_dos_indices_e_dos_pacotes():
+    rng = random.Random(3)
+    textos = ["z" * rng.randint(1, 400) for _ in range(200)]
+
+    pacotes = empacotar(textos, max_chars=1500, safety_margin=0)
+
+    assert all(pacote == sorted(pacote) for pacote in pacotes)
+    assert [pacote[0] for pacote in pacotes] == sorted(pacote[0] for pacote in pacotes)
+
+
+def test_encaixa_os_maiores_primeiro():
+    # Em ordem de chegada (first-fit) seriam 3 pacotes; ordenando pelos maiores, 2
+    textos = ["p" * 4, "q" * 4, "a" * 11, "b" * 10]
+    limite = custo_item(textos[2], 1) + custo_item(textos[0], 2)
+
+    pacotes = empacotar(textos, max_chars=limite, safety_margin=0)
+
+    assert pacotes == [[0, 2], [1, 3]]
+
+
+def test_ignora_vazios_e_isola_textos_que_nao_podem_ser_enquadrados():
+    textos = ["um", "", "duas\nlinhas", "tem [2] marcador", "três"]
+
+    pacotes = empacotar(textos)
+
+    assert all(1 not in pacote for pacote in pacotes)
+    assert [2] in pacotes
+    assert [3] in pacotes
+    assert [0, 4] in pacotes
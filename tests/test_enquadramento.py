@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""Testes dos marcadores "[n] " e da recuperação de itens (motor.enquadramento, motor.lotes)"""
+
+import pytest
+
+from motor.backends import BackendStub
+from motor.enquadramento import desenquadrar, enquadrar
+from motor.lotes import FalhaTraducao, traduzir_com_reparo, traduzir_em_lotes
+
+
+class TradutorFalso:
+    """Tradutor que responde com uma função e registra os payloads recebidos"""
+
+    def __init__(self, responder):
+        self.responder = responder
+        self.payloads = []
+
+    def translate(self, texto):
+        self.payloads.append(texto)
+        return self.responder(texto)
+
+
+def _maiusculas(payload):
+    return payload.upper()
+
+
+def test_enquadrar_e_desenquadrar_ida_e_volta():
+    textos = ["olá", "mundo", "três palavras aqui"]
+
+    payload = enquadrar(textos)
+
+    assert payload == "[1] olá\n[2] mundo\n[3] três palavras aqui"
+    assert desenquadrar(payload, len(textos)) == textos
+
+
+def test_desenquadrar_ignora_linhas_juntadas_ou_quebradas():
+    resposta = "[1] hello [2] world\n[3] three\nwords here"
+
+    assert desenquadrar(resposta, 3) == ["hello", "world", "three\nwords here"]
+
+
+def test_desenquadrar_marca_itens_perdidos_repetidos_ou_vazios():
+    resposta = "[1] a\n[2] b\n[2] b de novo\n[4]  \n[9] fora do intervalo"
+
+    assert desenquadrar(resposta, 4) == ["a", None, None, None]
+
+
+def test_desenquadrar_item_unico_sem_marcador():
+    assert desenquadrar("hello", 1) == ["hello"]
+    assert desenquadrar("", 3) == [None, None, None]
+
+
+def test_reparo_reenvia_so_os_itens_perdidos():
+    def perder_o_segundo(payload):
+        if payload.count("[") == 3:
+            return payload.upper().replace("\n[2] B", "")
+        return payload.upper()
+    tradutor = TradutorFalso(perder_o_segundo)
+
+    resultado = traduzir_com_reparo(["a", "b", "c"], tradutor, espera_inicial=0)
+
+    assert resultado == ["A", "B", "C"]
+    assert tradutor.payloads == ["[1] a\n[2] b\n[3] c", "b"]
+
+
+def test_reparo_divide_o_pacote_ate_isolar_o_item_invalido():
+    def recusar_ruim(payload):
+        if "ruim" in payload:
+            raise ValueError("texto inválido")
+        return payload.upper()
+    tradutor = TradutorFalso(recusar_ruim)
+
+    resultado = traduzir_com_reparo(["a", "b", "ruim", "d"], tradutor, espera_inicial=0)
+
+    assert resultado == ["A", "B", None, "D"]
+    assert tradutor.payloads == ["[1] a\n[2] b\n[3] ruim\n[4] d", "[1] a\n[2] b", "[1] ruim\n[2] d", "ruim", "d"]
+
+
+def test_reparo_repete_erros_de_rede_sem_dividir_o_pacote():
+    falhas = iter([ConnectionError("rede caiu")] * 2)
+
+    def oscilar(payload):
+        erro = next(falhas, None)
+        if erro is not None:
+            raise erro
+        return payload.upper()
+    tradutor = TradutorFalso(oscilar)
+
+    resultado = traduzir_com_reparo(["a", "b", "c"], tradutor, espera_inicial=0)
+
+    assert resultado == ["A", "B", "C"]
+    assert tradutor.payloads == ["[1] a\n[2] b\n[3] c"] * 3
+
+
+def test_falha_persistente_levanta_falha_traducao():
+    def fora_do_ar(payload):
+        raise ConnectionError("rede caiu")
+    tradutor = TradutorFalso(fora_do_ar)
+
+    with pytest.raises(FalhaTraducao):
+        traduzir_com_reparo(["a", "b", "c", "d"], tradutor, tentativas_api=3, espera_inicial=0)
+
+    assert len(tradutor.payloads) == 3
+
+
+def test_traduzir_em_lotes_com_stub_que_junta_linhas():
+    textos = [f"item {i}" for i in range(200)]
+    stub = BackendStub("en", "pt", taxa_mescla=0.5, semente=7, max_payload=500)
+
+    traducoes = traduzir_em_lotes(textos, stub, max_chars=500, safety_margin=0, espera_inicial=0)
+
+    assert traducoes == [f"[pt] {texto}" for texto in textos]
+    assert stub.mesclas > 0
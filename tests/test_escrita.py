@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""Testes dos escritores com commit em grupo (motor.escrita)"""
+
+import csv
+import sqlite3
+
+import pytest
+
+from motor.escrita import EscritorSaida, EscritorSQLite
+
+
+def _ler_csv(caminho):
+    with open(caminho, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_csv_grava_na_ordem_e_confirma_a_cada_n_linhas(tmp_path):
+    caminho = tmp_path / "saida.csv"
+    confirmacoes = []
+
+    def ao_sincronizar(marcador, bytes_saida):
+        # O checkpoint nunca pode apontar além do que já está no arquivo
+        confirmacoes.append((marcador, bytes_saida, len(_ler_csv(caminho))))
+
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        with EscritorSaida(arquivo, fsync_linhas=4, fsync_segundos=None, ao_sincronizar=ao_sincronizar) as escritor:
+            for lote in range(5):
+                escritor.escrever([[lote, j] for j in range(2)], marcador=lote)
+
+    assert _ler_csv(caminho) == [[str(lote), str(j)] for lote in range(5) for j in range(2)]
+    assert [(marcador, linhas) for marcador, _, linhas in confirmacoes] == [(1, 4), (3, 8), (4, 10)]
+    assert [bytes_saida for _, bytes_saida, _ in confirmacoes][-1] == caminho.stat().st_size
+    assert escritor.estatisticas()['sincronizacoes'] == 3
+
+
+def test_sem_politica_confirma_so_ao_fechar(tmp_path):
+    confirmacoes = []
+
+    with open(tmp_path / "saida.csv", 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = EscritorSaida(arquivo, fsync_linhas=None, fsync_segundos=None,
+                                 ao_sincronizar=lambda marcador, bytes_saida: confirmacoes.append(marcador))
+        for lote in range(3):
+            escritor.escrever([["x"]] * 1000, marcador=lote)
+        escritor.fechar()
+        escritor.fechar()  # Fechar de novo não é erro
+
+    assert confirmacoes == [2]
+
+
+def test_erro_de_gravacao_chega_a_quem_produz(tmp_path):
+    with open(tmp_path / "saida.csv", 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = EscritorSaida(arquivo, fsync_linhas=1, fsync_segundos=None)
+        arquivo.close()  # A gravação falha na thread de escrita
+        escritor.escrever([["a"]], marcador=1)
+
+        with pytest.raises(ValueError):
+            escritor.fechar()
+
+
+def test_sqlite_tabela_regrava_pela_chave(tmp_path):
+    caminho = str(tmp_path / "saida.db")
+    confirmacoes = []
+    colunas = ['id', 'nome', 'nome_traduzido']
+
+    with EscritorSQLite(caminho, "itens traduzidos", colunas, chave=['id'], fsync_linhas=2, fsync_segundos=None,
+                        ao_sincronizar=lambda marcador, bytes_saida: confirmacoes.append((marcador, bytes_saida))) as escritor:
+        escritor.escrever([(1, "red", "vermelho"), (2, "blue", "azul")], marcador=1)
+    # Retomada: o último lote é regravado sem duplicar linhas
+    with EscritorSQLite(caminho, "itens traduzidos", colunas, chave=['id']) as escritor:
+        escritor.escrever([(2, "blue", "azul claro"), (3, "green", "verde")], marcador=2)
+
+    conn = sqlite3.connect(caminho)
+    linhas = conn.execute('SELECT id, nome, nome_traduzido FROM "itens traduzidos" ORDER BY id').fetchall()
+    assert linhas == [(1, "red", "vermelho"), (2, "blue", "azul claro"), (3, "green", "verde")]
+    assert confirmacoes == [(1, None)]
+
+
+def test_sqlite_coluna_atualiza_as_linhas_pela_chave(tmp_path):
+    caminho = str(tmp_path / "origem.db")
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE produtos (codigo TEXT, nome TEXT)")
+    conn.executemany("INSERT INTO produtos VALUES (?, ?)", [("a", "red"), ("b", "blue"), ("c", "green")])
+    conn.commit()
+
+    with EscritorSQLite(caminho, "produtos", ['codigo', 'nome', 'nome_traduzido'], chave=['codigo'],
+                        modo='coluna') as escritor:
+        escritor.escrever([("c", "green", "verde"), ("a", "red", "vermelho")])
+
+    linhas = conn.execute("SELECT codigo, nome, nome_traduzido FROM produtos ORDER BY codigo").fetchall()
+    assert linhas == [("a", "red", "vermelho"), ("b", "blue", None), ("c", "green", "verde")]
+
+
+def test_sqlite_modo_coluna_exige_chave(tmp_path):
+    with pytest.raises(ValueError):
+        EscritorSQLite(str(tmp_path / "origem.db"), "produtos", ['nome', 'nome_traduzido'], modo='coluna')
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Testes da exportação em fluxo de CSV para XLSX (motor.exportacao)"""
+
+import csv
+
+from openpyxl import load_workbook
+
+from motor.exportacao import exportar_csv_para_xlsx
+
+
+def _escrever_csv(caminho, linhas):
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["id", "nome", "nome_traduzido"])
+        escritor.writerows(linhas)
+
+
+def _planilhas(caminho):
+    wb = load_workbook(caminho, read_only=True)
+    try:
+        return {ws.title: [list(linha) for linha in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def test_nova_planilha_ao_atingir_o_limite_de_linhas(tmp_path):
+    linhas = [(i, f"item {i}", f"[pt] item {i}") for i in range(1, 11)]
+    _escrever_csv(tmp_path / "saida.csv", linhas)
+    percentuais = []
+
+    exportadas, planilhas = exportar_csv_para_xlsx(
+        str(tmp_path / "saida.csv"), str(tmp_path / "saida.xlsx"),
+        tamanho_lote=3, limite_linhas=5, ao_progresso=percentuais.append
+    )
+
+    assert (exportadas, planilhas) == (10, 3)
+    conteudo = _planilhas(tmp_path / "saida.xlsx")
+    assert list(conteudo) == ["Resultado", "Resultado_2", "Resultado_3"]
+    cabecalho = ["id", "nome", "nome_traduzido"]
+    assert all(linhas_planilha[0] == cabecalho for linhas_planilha in conteudo.values())
+    assert [len(linhas_planilha) for linhas_planilha in conteudo.values()] == [5, 5, 3]
+    dados = [tuple(linha) for linhas_planilha in conteudo.values() for linha in linhas_planilha[1:]]
+    assert dados == linhas
+    assert percentuais == sorted(percentuais) and percentuais[-1] == 100.0
+
+
+def test_vazios_e_caracteres_de_controle(tmp_path):
+    _escrever_csv(tmp_path / "saida.csv", [(1, "", "bell\x07"), (2, "ok", "ok")])
+
+    exportar_csv_para_xlsx(str(tmp_path / "saida.csv"), str(tmp_path / "saida.xlsx"))
+
+    assert _planilhas(tmp_path / "saida.xlsx")["Resultado"][1:] == [[1, None, "bell"], [2, "ok", "ok"]]
+
+
+def test_csv_so_com_cabecalho(tmp_path):
+    _escrever_csv(tmp_path / "saida.csv", [])
+
+    assert exportar_csv_para_xlsx(str(tmp_path / "saida.csv"), str(tmp_path / "saida.xlsx")) == (0, 1)
+    assert _planilhas(tmp_path / "saida.xlsx") == {"Resultado": [["id", "nome", "nome_traduzido"]]}
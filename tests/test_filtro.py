@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Testes do filtro de valores que não precisam de tradução (motor.filtro)"""
+
+import pytest
+
+from motor.filtro import FiltroTraducao, formatar_ignorados, motivo_sem_traducao
+
+
+@pytest.mark.parametrize("texto, motivo", [
+    ("SKU-1234", 'codigo'),
+    ("AB12CD", 'codigo'),
+    ("id_produto", 'codigo'),
+    ("https://example.com/produtos?id=1", 'url'),
+    ("www.loja.com.br", 'url'),
+    ("loja.com.br/ofertas", 'url'),
+    ("joao.silva@example.com", 'email'),
+    ("2024-05-01T10:20:30Z", 'data'),
+    ("2024-05-01", 'numero'),
+    ("R$ 19,90", 'numero'),
+    ("US$ 5.00", 'numero'),
+    ("12,5%", 'numero'),
+    ("42", 'numero'),
+    ("3.14", 'numero'),
+    ("---", 'simbolos'),
+    ("   ", 'vazio'),
+])
+def test_valores_repassados_sem_traducao(texto, motivo):
+    assert motivo_sem_traducao(texto) == motivo
+
+
+@pytest.mark.parametrize("texto", [
+    "Chocolate Chip Cookies",
+    "Café",
+    "Size 2 Diapers",
+    "Vitamin B12",
+    "iPhone 15",
+    "4K TV",
+    "Dr.",
+    "U.S.A.",
+    "well-known brand",
+    "Pack of 12",
+])
+def test_palavras_continuam_indo_para_a_api(texto):
+    assert motivo_sem_traducao(texto) is None
+
+
+def test_separar_preserva_a_ordem_e_conta_por_motivo():
+    filtro = FiltroTraducao('pt')
+
+    a_traduzir, ignorados = filtro.separar(["Apple", "SKU-1", "42", "Green Tea", "7"])
+
+    assert a_traduzir == ["Apple", "Green Tea"]
+    assert ignorados == ["SKU-1", "42", "7"]
+    stats = filtro.estatisticas()
+    assert stats == {'analisados': 5, 'ignorados': 3, 'por_motivo': {'codigo': 1, 'numero': 2}}
+    assert formatar_ignorados(stats) == "3 de 5 valores não precisavam de tradução (2 numero, 1 codigo)"
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""Testes da leitura em lotes com retomada (motor.leitura)"""
+
+import sqlite3
+
+from motor.leitura import ler_csv_em_lotes, ler_sqlite_em_lotes
+
+CSV = (
+    'id,nome,descricao\n'
+    '1,Cadeira,"Madeira, sem braços"\n'
+    '2,Monitor,"Tela de 32"" com\nquebra de linha"\n'
+    '3,TV 32",Aspa solta no meio do campo\n'
+    '4,Mesa,"Várias\nlinhas\naqui"\n'
+    '5,Lâmpada,Simples\n'
+)
+
+
+def _linhas(lotes):
+    return [linha for df, *_ in lotes for linha in df.astype(str).values.tolist()]
+
+
+def test_csv_preserva_campos_com_aspas_e_quebras_de_linha(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_bytes(CSV.encode('utf-8'))
+
+    linhas = _linhas(ler_csv_em_lotes(str(caminho), tamanho_lote=2))
+
+    assert [linha[0] for linha in linhas] == ['1', '2', '3', '4', '5']
+    assert linhas[1][2] == 'Tela de 32" com\nquebra de linha'
+    assert linhas[2][1] == 'TV 32"'
+    assert linhas[3][2] == 'Várias\nlinhas\naqui'
+
+
+def test_csv_retoma_pela_posicao_em_bytes_de_cada_lote(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_bytes(CSV.encode('utf-8'))
+    completo = _linhas(ler_csv_em_lotes(str(caminho), tamanho_lote=10))
+
+    lotes = list(ler_csv_em_lotes(str(caminho), tamanho_lote=1))
+    assert lotes[-1][1] == lotes[-1][2] == len(CSV.encode('utf-8'))
+
+    for i, (_, posicao, _) in enumerate(lotes):
+        retomado = _linhas(ler_csv_em_lotes(str(caminho), tamanho_lote=2, posicao_inicial=posicao))
+        assert retomado == completo[i + 1:]
+
+
+def _criar_tabela(conn, sql, linhas):
+    conn.execute(sql)
+    conn.executemany("INSERT INTO \"meus itens\" VALUES (?, ?)", linhas)
+    conn.commit()
+
+
+def test_sqlite_pagina_pelo_rowid_e_retoma_pela_ultima_chave():
+    conn = sqlite3.connect(":memory:")
+    _criar_tabela(conn, 'CREATE TABLE "meus itens" (nome TEXT, valor INTEGER)',
+                  [(f"item {i}", i) for i in range(25)])
+    conn.execute('DELETE FROM "meus itens" WHERE valor IN (3, 4, 10)')  # Buracos no rowid
+
+    lotes = list(ler_sqlite_em_lotes(conn, "meus itens", tamanho_lote=5))
+    valores = [valor for df, _ in lotes for valor in df['valor']]
+    assert valores == [i for i in range(25) if i not in (3, 4, 10)]
+    assert list(lotes[0][0].columns) == ['nome', 'valor']
+
+    _, chave = lotes[1]
+    retomado = [valor for df, _ in ler_sqlite_em_lotes(conn, "meus itens", 5, ultima_chave=chave)
+                for valor in df['valor']]
+    assert retomado == valores[10:]
+
+
+def test_sqlite_sem_rowid_pagina_pela_chave_primaria_composta():
+    conn = sqlite3.connect(":memory:")
+    _criar_tabela(conn, 'CREATE TABLE "meus itens" (grupo TEXT, id INTEGER, PRIMARY KEY (grupo, id)) WITHOUT ROWID',
+                  [(grupo, i) for grupo in "ba" for i in range(4)])
+
+    lotes = list(ler_sqlite_em_lotes(conn, "meus itens", tamanho_lote=3, incluir_chave=True))
+    linhas = [tuple(linha) for df, _ in lotes for linha in df.values.tolist()]
+    assert linhas == sorted(linhas) and len(linhas) == 8
+    assert lotes[0][1] == ('a', 2)
+
+    retomado = [tuple(linha) for df, _ in ler_sqlite_em_lotes(conn, "meus itens", 3, ultima_chave=lotes[0][1])
+                for linha in df.values.tolist()]
+    assert retomado == linhas[3:]
+
+
+def test_sqlite_inclui_o_rowid_quando_pedido():
+    conn = sqlite3.connect(":memory:")
+    _criar_tabela(conn, 'CREATE TABLE "meus itens" (nome TEXT, valor INTEGER)', [("a", 1), ("b", 2)])
+
+    df, chave = next(ler_sqlite_em_lotes(conn, "meus itens", tamanho_lote=10, incluir_chave=True))
+
+    assert list(df.columns) == ['rowid', 'nome', 'valor']
+    assert chave == (2,)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""Testes do limitador de taxa token bucket (motor.limitador)"""
+
+import threading
+import time
+
+import pytest
+
+from motor.limitador import LimitadorTaxa
+from motor.metricas import Metricas
+
+
+def test_rajada_sai_sem_espera_e_depois_segue_a_taxa(relogio):
+    limitador = LimitadorTaxa(60, rajada=3)  # 1 chamada por segundo
+
+    esperas = [limitador.aguardar() for _ in range(5)]
+
+    assert esperas == [0.0, 0.0, 0.0, pytest.approx(1.0), pytest.approx(1.0)]
+    assert limitador.tempo_espera_total == pytest.approx(2.0)
+
+
+def test_tokens_repostos_com_o_tempo_ate_o_limite_da_rajada(relogio):
+    limitador = LimitadorTaxa(120, rajada=2)  # 2 chamadas por segundo
+    limitador.aguardar()
+    limitador.aguardar()
+
+    relogio.agora += 0.5  # Um token reposto
+    assert limitador.aguardar() == 0.0
+    assert limitador.aguardar() == pytest.approx(0.5)
+
+    relogio.agora += 3600  # Ocioso: o saldo não passa da rajada
+    assert [limitador.aguardar() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.5)]
+
+
+def test_esperas_vao_para_as_metricas_e_taxa_atual(relogio):
+    metricas = Metricas()
+    limitador = LimitadorTaxa(60, metricas=metricas)
+
+    for _ in range(3):
+        limitador.aguardar()
+
+    histograma = metricas.instantaneo()['histogramas']['espera_segundos']
+    assert histograma['contagem'] == 3
+    assert histograma['soma'] == pytest.approx(2.0)
+    assert limitador.estatisticas()['taxa_atual'] == 3
+
+
+def test_taxa_invalida():
+    with pytest.raises(ValueError):
+        LimitadorTaxa(0)
+
+
+def test_threads_bloqueiam_ate_a_sua_vez():
+    limitador = LimitadorTaxa(1200)  # Uma chamada a cada 50 ms, sem rajada
+    liberadas = []
+    lock = threading.Lock()
+
+    def chamar():
+        for _ in range(2):
+            limitador.aguardar()
+            with lock:
+                liberadas.append(time.monotonic())
+
+    inicio = time.monotonic()
+    threads = [threading.Thread(target=chamar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(liberadas) == 8
+    assert time.monotonic() - inicio >= 7 * 0.05 - 0.01
+    intervalos = [b - a for a, b in zip(sorted(liberadas), sorted(liberadas)[1:])]
+    assert sum(intervalos) / len(intervalos) >= 0.04
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Testes da memória de tradução persistente (motor.memoria)"""
+
+import pytest
+
+from motor.memoria import MAX_PARAMETROS_CONSULTA, MemoriaTraducao
+
+
+def test_obter_e_salvar(tmp_path):
+    with MemoriaTraducao(str(tmp_path / "memoria.db")) as memoria:
+        assert memoria.obter('en', 'pt', "apple") is None
+
+        memoria.salvar('en', 'pt', "apple", "maçã")
+        memoria.salvar('en', 'pt', "apple", "maçã verde")  # Substitui a anterior
+
+        assert memoria.obter('en', 'pt', "apple") == "maçã verde"
+        assert memoria.obter('en', 'es', "apple") is None  # Outro par de idiomas
+        stats = memoria.estatisticas()
+        assert (stats['hits'], stats['misses']) == (1, 2)
+        assert stats['taxa_acerto'] == pytest.approx(100 / 3)
+
+
+def test_persiste_entre_conexoes(tmp_path):
+    caminho = str(tmp_path / "pasta" / "memoria.db")  # A pasta é criada se não existir
+    with MemoriaTraducao(caminho) as memoria:
+        memoria.salvar_muitos('en', 'pt', [("red", "vermelho"), ("blue", "azul")])
+
+    with MemoriaTraducao(caminho) as memoria:
+        assert memoria.obter_muitos('en', 'pt', ["red", "green", "blue", "red"]) == {"red": "vermelho", "blue": "azul"}
+        assert (memoria.hits, memoria.misses) == (2, 1)
+
+
+def test_nao_memoriza_traducoes_vazias(tmp_path):
+    with MemoriaTraducao(str(tmp_path / "memoria.db")) as memoria:
+        memoria.salvar_muitos('en', 'pt', [("a", None), ("b", ""), ("", "c"), ("d", "D")])
+
+        assert memoria.obter_muitos('en', 'pt', ["a", "b", "", "d"]) == {"d": "D"}
+
+
+def test_consulta_maior_que_o_limite_de_parametros(tmp_path):
+    textos = [f"item {i}" for i in range(MAX_PARAMETROS_CONSULTA * 2 + 7)]
+    with MemoriaTraducao(str(tmp_path / "memoria.db")) as memoria:
+        memoria.salvar_muitos('en', 'pt', ((texto, texto.upper()) for texto in textos))
+
+        encontrados = memoria.obter_muitos('en', 'pt', textos)
+
+    assert encontrados == {texto: texto.upper() for texto in textos}
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Testes do canal de progresso com vazão e ETA (motor.progresso)"""
+
+import math
+
+import pytest
+
+from motor.progresso import ProgressoTraducao, formatar_duracao, formatar_progresso
+
+
+def test_vazao_por_media_movel_ponderada_pelo_tempo(relogio):
+    progresso = ProgressoTraducao(total=1000, constante_tempo=10.0)
+
+    relogio.agora += 2
+    progresso.avancar(200)  # 100 linhas/s
+    assert progresso.linhas_por_segundo == pytest.approx(100.0)
+
+    relogio.agora += 5
+    progresso.avancar(100)  # 20 linhas/s, pesando o tempo que o lote durou
+    peso = 1 - math.exp(-5 / 10.0)
+    assert progresso.linhas_por_segundo == pytest.approx(100 + peso * (20 - 100))
+
+
+def test_eta_pelo_total_de_linhas(relogio):
+    progresso = ProgressoTraducao(total=1000, linhas_iniciais=100)
+
+    relogio.agora += 4
+    progresso.avancar(200)  # 50 linhas/s
+
+    instantaneo = progresso.instantaneo()
+    assert (instantaneo['linhas'], instantaneo['percentual']) == (300, 30.0)
+    assert instantaneo['eta_segundos'] == pytest.approx(700 / 50)
+
+
+def test_eta_pelo_percentual_quando_o_total_e_desconhecido(relogio):
+    progresso = ProgressoTraducao()
+
+    relogio.agora += 1
+    progresso.avancar(10, percentual=20.0)
+    assert progresso.instantaneo()['eta_segundos'] is None  # Uma medição só não dá ritmo
+
+    relogio.agora += 6
+    progresso.avancar(10, percentual=50.0)  # 30 pontos em 6 s
+    assert progresso.instantaneo()['eta_segundos'] == pytest.approx(10.0)
+
+
+def test_chamadas_por_minuto_na_janela(relogio):
+    progresso = ProgressoTraducao()
+    for _ in range(3):
+        progresso.registrar_chamada(100)
+        relogio.agora += 10
+
+    instantaneo = progresso.instantaneo()
+    assert (instantaneo['chamadas'], instantaneo['caracteres']) == (3, 300)
+    assert instantaneo['chamadas_por_minuto'] == pytest.approx(3 * 60 / 30)
+
+    relogio.agora += 120  # Chamadas antigas saem da janela
+    assert progresso.instantaneo()['chamadas_por_minuto'] == 0
+
+
+def test_notificacoes_limitadas_pelo_intervalo(relogio):
+    recebidos = []
+    progresso = ProgressoTraducao(total=100, ao_atualizar=recebidos.append, intervalo=1.0)
+
+    for _ in range(5):
+        relogio.agora += 0.1
+        progresso.avancar(1)
+    assert len(recebidos) == 1
+
+    relogio.agora += 1.0
+    progresso.registrar_chamada(50)
+    assert len(recebidos) == 2
+
+    progresso.concluir()  # Sempre notifica
+    assert len(recebidos) == 3 and recebidos[-1]['linhas'] == 5
+
+
+def test_formatacao():
+    assert formatar_duracao(None) == "?"
+    assert formatar_duracao(3725.9) == "1:02:05"
+    resumo = formatar_progresso({'linhas_por_segundo': 12.34, 'chamadas_por_minuto': 29.6,
+                                 'caracteres': 12345, 'eta_segundos': 61})
+    assert resumo == "12.3 linhas/s | 30 chamadas/min | 12,345 caracteres | ETA 0:01:01"
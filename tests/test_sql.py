@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+"""Testes da citação de identificadores SQL (motor.sql) nos leitores e escritores"""
+
+import sqlite3
+
+from motor import EscritorSQLite, citar_identificador, ler_colunas, ler_sqlite_em_lotes
+
+
+def test_citar_identificador():
+    assert citar_identificador("produtos") == '"produtos"'
+    assert citar_identificador('meus "itens"') == '"meus ""itens"""'
+    assert citar_identificador('x"; DROP TABLE produtos; --') == '"x""; DROP TABLE produtos; --"'
+
+
+def test_tabela_e_colunas_com_aspas_e_espacos(tmp_path):
+    caminho = str(tmp_path / "dados.db")
+    tabela = 'itens "especiais"'
+    colunas = ['código', 'nome do item', 'nome do item_traduzido']
+
+    with EscritorSQLite(caminho, tabela, colunas, chave=['código']) as escritor:
+        escritor.escrever([(1, "red", "vermelho"), (2, "blue", "azul")])
+
+    assert ler_colunas(caminho, "SQLite", tabela) == colunas
+    conn = sqlite3.connect(caminho)
+    (df, chave), = ler_sqlite_em_lotes(conn, tabela, tamanho_lote=10)
+    assert df.values.tolist() == [[1, "red", "vermelho"], [2, "blue", "azul"]]
+    assert chave == (2,)
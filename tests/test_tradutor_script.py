@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""Testes das funções de tradução de config/tradutor.py"""
+
+import sqlite3
+
+import pytest
+
+from motor import BackendStub
+
+
+def test_nome_com_marcador_segue_sem_enquadramento(script_tradutor):
+    stub = BackendStub("en", "pt")
+
+    assert script_tradutor.traduzir_lote_nomes(["Size [2] Diapers"], stub) == ["[pt] Size [2] Diapers"]
+
+
+def test_nome_que_nao_pode_ser_enquadrado_e_separado_do_lote(script_tradutor):
+    stub = BackendStub("en", "pt")
+    nomes = ["Chair", "Size [2] Diapers", "Two\nlines", "Table"]
+
+    traducoes = script_tradutor.traduzir_lote_nomes(nomes, stub)
+
+    assert traducoes == [stub.translate(nome) for nome in nomes]
+
+
+def test_chamadas_e_reenvios_entram_nos_contadores(script_tradutor):
+    stub = BackendStub("en", "pt", max_payload=40)  # Lote grande demais: dividido por bisseção
+    nomes = [f"Product {i}" for i in range(6)]
+
+    traducoes = script_tradutor.traduzir_lote_nomes(nomes, stub)
+
+    assert traducoes == [f"[pt] {nome}" for nome in nomes]
+    assert script_tradutor.CONTADORES_API['chamadas'] == stub.chamadas > 1
+    assert script_tradutor.METRICAS.instantaneo()['contadores']['chamadas_api'] == stub.chamadas
+
+
+def test_api_fora_do_ar_levanta_falha_traducao(script_tradutor, monkeypatch):
+    import motor.lotes
+    monkeypatch.setattr(motor.lotes.time, 'sleep', lambda segundos: None)
+    stub = BackendStub("en", "pt", taxa_falha=1.0)
+
+    with pytest.raises(script_tradutor.FalhaTraducao):
+        script_tradutor.traduzir_lote_nomes(["Chair", "Table", "Lamp"], stub)
+
+    assert stub.chamadas == motor.lotes.TENTATIVAS_API
+
+
+def _banco_produtos(caminho, quantidade=50):
+    conn = sqlite3.connect(str(caminho))
+    conn.execute("CREATE TABLE produtos (id INTEGER PRIMARY KEY, nome TEXT)")
+    conn.executemany("INSERT INTO produtos VALUES (?, ?)", [(i, f"Product {i}") for i in range(1, quantidade + 1)])
+    conn.commit()
+    return conn
+
+
+def test_pool_e_tradutores_das_threads_atravessam_os_lotes(script_tradutor, tmp_path):
+    conn = _banco_produtos(tmp_path / "produtos.db")
+    script_tradutor.BATCH_SIZE = 10
+    script_tradutor.TRADUCOES_SIMULTANEAS = 2
+
+    instancias = []
+
+    class StubContado(BackendStub):
+        def para_thread(self):
+            instancias.append(self)
+            return self
+
+    with open(tmp_path / "saida.csv", 'w', newline='', encoding='utf-8') as saida:
+        total, ultimo_id = script_tradutor.processar_traducao_otimizada(
+            conn, StubContado("en", "pt"), saida, ['id', 'nome'])
+
+    assert (total, ultimo_id) == (50, 50)
+    assert len(instancias) <= script_tradutor.TRADUCOES_SIMULTANEAS
+    linhas = (tmp_path / "saida.csv").read_text(encoding='utf-8').splitlines()
+    assert linhas[0] == "1,Product 1,[pt] Product 1" and len(linhas) == 50
+
+
+def test_contagem_usa_parametros_e_respeita_o_limite(script_tradutor, tmp_path):
+    conn = _banco_produtos(tmp_path / "produtos.db")
+
+    assert script_tradutor.obter_total_produtos(conn, 10) == 40
+    assert script_tradutor.obter_total_produtos(conn, 10, limite=15) == 15
+    assert script_tradutor.obter_total_produtos(conn, 10, id_final=30) == 20
+
+    # Um ID adulterado no checkpoint é comparado como valor, nunca executado como SQL
+    assert script_tradutor.obter_total_produtos(conn, "0; DROP TABLE produtos") == 0
+    assert conn.execute("SELECT COUNT(*) FROM produtos").fetchone()[0] == 50
+
+
+def test_retomada_le_somente_a_faixa_de_ids(script_tradutor, tmp_path):
+    conn = _banco_produtos(tmp_path / "produtos.db")
+    script_tradutor.BATCH_SIZE = 4
+
+    with open(tmp_path / "saida.csv", 'w', newline='', encoding='utf-8') as saida:
+        total, ultimo_id = script_tradutor.processar_traducao_otimizada(
+            conn, BackendStub("en", "pt"), saida, ['id', 'nome'], ultimo_id=20, id_final=30)
+
+    assert (total, ultimo_id) == (10, 30)
+    ids = [linha.split(',')[0] for linha in (tmp_path / "saida.csv").read_text(encoding='utf-8').splitlines()]
+    assert ids == [str(i) for i in range(21, 31)]
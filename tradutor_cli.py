@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Linha de comando do Tradutor de Dados Universal.
+Executa o mesmo motor da interface desktop (motor.ExecucaoTraducao) sem janela,
+para rodar traduções grandes em máquinas sem interface gráfica.
+
+Exemplos:
+    python tradutor_cli.py dados.csv --colunas nome,descricao --origem en --destino pt
+    python tradutor_cli.py dados.db --tabela produtos --colunas nome --saida-sqlite coluna
+    python tradutor_cli.py dados.xlsx --colunas nome --saida /tmp/dados_traduzido.csv --simultaneas 8
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from motor import ExecucaoTraducao, CONFIG_PADRAO, SUFIXO_CHECKPOINT, ler_colunas
+
+EXTENSOES = {
+    '.csv': 'CSV',
+    '.xlsx': 'Excel',
+    '.xls': 'Excel',
+    '.db': 'SQLite',
+    '.sqlite': 'SQLite',
+    '.sqlite3': 'SQLite',
+}
+
+
+def detectar_tipo(caminho):
+    """Deduz o tipo da origem pela extensão do arquivo"""
+    return EXTENSOES.get(os.path.splitext(caminho)[1].lower())
+
+
+def carregar_config(caminho):
+    """Lê um settings.json da interface, mantendo apenas as chaves conhecidas pelo motor"""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        salvas = json.load(f)
+    return {chave: valor for chave, valor in salvas.items() if chave in CONFIG_PADRAO}
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Tradutor de Dados Universal (linha de comando)")
+    parser.add_argument('entrada', help="Arquivo de origem (CSV, Excel ou SQLite)")
+    parser.add_argument('--tipo', choices=['CSV', 'Excel', 'SQLite'], help="Tipo da origem (padrão: pela extensão)")
+    parser.add_argument('--tabela', help="Tabela da origem SQLite")
+    parser.add_argument('--colunas', required=True, help="Colunas a traduzir, separadas por vírgula")
+    parser.add_argument('--origem', help="Idioma de origem (ex.: en)")
+    parser.add_argument('--destino', help="Idioma de destino (ex.: pt)")
+    parser.add_argument('--saida', help="CSV de saída (padrão: <entrada>_traduzido.csv ao lado da origem)")
+    parser.add_argument('--saida-sqlite', choices=['coluna', 'tabela'],
+                        help="Gravar direto no banco de origem: colunas <col>_traduzido ou tabela <tabela>_traduzida")
+    parser.add_argument('--tamanho-lote', type=int, help="Linhas lidas por lote")
+    parser.add_argument('--simultaneas', type=int, help="Chamadas simultâneas à API")
+    parser.add_argument('--delay', type=float, help="Intervalo mínimo entre chamadas à API (s; 0 desativa o limite)")
+    parser.add_argument('--backend', choices=['google', 'stub'], help="Backend de tradução")
+    parser.add_argument('--memoria', help="Banco da memória de tradução")
+    parser.add_argument('--metricas-json', help="Exportar métricas por etapa periodicamente neste JSON")
+    parser.add_argument('--metricas-prom', help="Exportar métricas no formato do textfile collector do Prometheus (.prom)")
+    parser.add_argument('--intervalo-metricas', type=float, help="Segundos entre exportações das métricas")
+    parser.add_argument('--sem-filtro', action='store_true',
+                        help="Enviar à API também números, datas, códigos, URLs e e-mails")
+    parser.add_argument('--detectar-idioma', action='store_true',
+                        help="Não enviar textos já no idioma de destino (requer langdetect)")
+    parser.add_argument('--config', help="settings.json com valores padrão (os argumentos têm prioridade)")
+    parser.add_argument('--recomecar', action='store_true', help="Ignorar checkpoint e traduzir desde o início")
+    parser.add_argument('--silencioso', action='store_true', help="Não mostrar o log de cada lote")
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    tipo = args.tipo or detectar_tipo(args.entrada)
+    if tipo is None:
+        parser.error("Não foi possível deduzir o tipo da origem; use --tipo")
+    if not os.path.exists(args.entrada):
+        parser.error(f"Arquivo não encontrado: {args.entrada}")
+    if tipo == 'SQLite' and not args.tabela:
+        parser.error("Informe --tabela para origens SQLite")
+    if args.saida_sqlite and tipo != 'SQLite':
+        parser.error("--saida-sqlite exige uma origem SQLite")
+
+    config = carregar_config(args.config) if args.config else {}
+    sobrescritas = {
+        'idioma_origem': args.origem,
+        'idioma_destino': args.destino,
+        'tamanho_lote': args.tamanho_lote,
+        'traducoes_simultaneas': args.simultaneas,
+        'delay_traducao': args.delay,
+        'backend': args.backend,
+        'arquivo_memoria': args.memoria,
+        'arquivo_metricas_json': args.metricas_json,
+        'arquivo_metricas_prometheus': args.metricas_prom,
+        'intervalo_metricas': args.intervalo_metricas,
+        'filtrar_intraduziveis': False if args.sem_filtro else None,
+        'detectar_idioma': True if args.detectar_idioma else None,
+    }
+    config.update({chave: valor for chave, valor in sobrescritas.items() if valor is not None})
+
+    # Validar as colunas antes de abrir memória, escritor e backend
+    colunas_originais = ler_colunas(args.entrada, tipo, args.tabela)
+    colunas = [col.strip() for col in args.colunas.split(",") if col.strip()]
+    desconhecidas = [col for col in colunas if col not in colunas_originais]
+    if desconhecidas:
+        parser.error(f"Colunas inexistentes na origem: {', '.join(desconhecidas)}")
+
+    arquivo_saida = None
+    if not args.saida_sqlite:
+        nome_original = os.path.splitext(os.path.basename(args.entrada))[0]
+        arquivo_saida = args.saida or os.path.join(os.path.dirname(os.path.abspath(args.entrada)), f"{nome_original}_traduzido.csv")
+
+    def log(mensagem):
+        if not args.silencioso or not mensagem.startswith("Lote processado"):
+            print(mensagem, flush=True)
+
+    execucao = ExecucaoTraducao(
+        args.entrada, tipo, colunas,
+        config=config,
+        tabela=args.tabela,
+        arquivo_saida=arquivo_saida,
+        saida_sqlite=args.saida_sqlite,
+        colunas_originais=colunas_originais,
+        ao_log=log
+    )
+
+    retomada = None if args.recomecar else execucao.procurar_retomada()
+    if retomada:
+        print(f"Retomando tradução após {retomada['linhas_processadas']:,} linhas (checkpoint em {execucao.base_checkpoint()}{SUFIXO_CHECKPOINT})")
+
+    try:
+        execucao.executar(retomada)
+    except KeyboardInterrupt:
+        print("\nTradução interrompida. Execute o mesmo comando novamente para retomar de onde parou.")
+        return 130
+    except Exception as e:
+        print(f"ERRO na tradução: {e}", file=sys.stderr)
+        return 1
+
+    destino = f"{args.entrada} ({execucao.tabela_saida_sqlite()})" if args.saida_sqlite else arquivo_saida
+    print(f"Tradução concluída: {destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())